@@ -10,6 +10,12 @@ OUTPUT_FOLDER = "Output\\"
 
 PROMPT_FILE = "prompt.yml"
 
+# Extraction worker pool (see Include/ExtractionPool.py)
+EXTRACTION_WORKERS = 4
+EXTRACTION_TIMEOUT = 180  # seconds per file, OCR included
+EXTRACTION_MAX_MEMORY_MB = 1536  # RSS limit per worker (needs psutil or /proc; 0 disables)
+EXTRACTION_MAX_JOBS_PER_WORKER = 50
+
 
 
 
@@ -6,7 +6,7 @@ import requests
 from datetime import datetime
 
 from Include import Config
-import Include.Filestream as fs
+from Include.ExtractionPool import Extract_Isolated
 
 # Configurations and constants
 OUTPUT_FILE = Config.OUTPUT_FOLDER + "tokens.json"
@@ -133,7 +133,7 @@ def send_cv_to_resume_parser(file_path: str, file_name: str) -> bool:
             print(f"🔄 Converting .doc to .docx for resume parser: {file_name}")
             
             # Convert DOC to DOCX using QueryMind's Spire.doc
-            docx_content = fs.Convert_DOC_to_DOCX(file_path)
+            docx_content = Extract_Isolated("Convert_DOC_to_DOCX", file_path, default=None)
             
             if not docx_content:
                 print(f"⚠️ Failed to convert {file_name} to DOCX format")
@@ -271,20 +271,21 @@ def process_file(FileLocation: str) -> Tuple[str, str, str]:
 
     data = ""
     used_ocr = False
+    # Extractors run in the worker pool so a malformed file cannot hang the batch
     if file_lower.endswith(".pdf"):
-        data = fs.Extract_Text_From_pdf(FileLocation)
+        data = Extract_Isolated("Extract_Text_From_pdf", FileLocation)
         if len(data.strip()) < 50:
             print(f"Standard PDF extraction produced little text for {file}, trying OCR fallback...")
-            data = fs.Extract_Text_From_PDF_OCR(FileLocation)
+            data = Extract_Isolated("Extract_Text_From_PDF_OCR", FileLocation)
             used_ocr = True
     elif file_lower.endswith(".docx"):
-        data = fs.Extract_Text_From_DOCX(FileLocation)
+        data = Extract_Isolated("Extract_Text_From_DOCX", FileLocation)
     elif file_lower.endswith(".doc"):
-        data = fs.Extract_Text_From_DOC(FileLocation)
+        data = Extract_Isolated("Extract_Text_From_DOC", FileLocation)
     elif file_lower.endswith(".rtf"):
-        data = fs.Extract_Text_From_RTF(FileLocation)
+        data = Extract_Isolated("Extract_Text_From_RTF", FileLocation)
     elif file_lower.endswith(".txt"):
-        data = fs.Extract_Text_From_TXT(FileLocation)
+        data = Extract_Isolated("Extract_Text_From_TXT", FileLocation)
 
     tokenized_data = Tokenize_Data(data)
     is_resume = IsResume_With_Confidence(tokenized_data, ocr=used_ocr)
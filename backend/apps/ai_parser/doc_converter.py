@@ -1,57 +1,414 @@
 """
 DOC to DOCX Converter Service
 Converts legacy .doc files to modern .docx format for consistent processing
+
+Conversions run on a small pool of warm LibreOffice instances, each with its
+own user profile. When `unoserver` is installed every instance is a long-lived
+listener and a conversion is a single XML-RPC call; otherwise each conversion
+still gets a dedicated profile, a timeout and a killable process group.
+Converted files are cached by the SHA-256 of the source document, so the same
+.doc is only converted once; the least recently used files are evicted once
+the cache outgrows DOC_CONVERSION_CACHE_MAX_MB.
 """
 import os
+import time
+import queue
+import shutil
+import socket
+import atexit
+import hashlib
 import logging
-import subprocess
 import tempfile
+import threading
+import subprocess
+import xmlrpc.client
+from functools import lru_cache
 from pathlib import Path
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
 from django.conf import settings
 
+from .extraction_pool import popen_group_kwargs, kill_process_tree
+
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=None)
+def _find_libreoffice():
+    """
+    Find LibreOffice executable on the system (looked up once per process)
+
+    Returns:
+        str: Path to LibreOffice executable or None if not found
+    """
+    configured = getattr(settings, 'LIBREOFFICE_PATH', '')
+    if configured:
+        return configured
+
+    for name in ('soffice', 'libreoffice'):
+        path = shutil.which(name)
+        if path:
+            logger.info(f"Found LibreOffice at: {path}")
+            return path
+
+    possible_paths = [
+        '/usr/bin/libreoffice',  # Linux
+        '/Applications/LibreOffice.app/Contents/MacOS/soffice',  # macOS
+        r'C:\Program Files\LibreOffice\program\soffice.exe',  # Windows
+        r'C:\Program Files (x86)\LibreOffice\program\soffice.exe',  # Windows 32-bit
+    ]
+    for path in possible_paths:
+        if os.path.exists(path):
+            logger.info(f"Found LibreOffice at: {path}")
+            return path
+
+    return None
+
+
+def _free_port():
+    """Ask the OS for a free local TCP port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class _TimeoutTransport(xmlrpc.client.Transport):
+    """XML-RPC transport with a socket timeout, so a hung listener cannot block forever"""
+
+    def __init__(self, timeout):
+        super().__init__()
+        self.timeout = timeout
+
+    def make_connection(self, host):
+        connection = super().make_connection(host)
+        connection.timeout = self.timeout
+        return connection
+
+
+class LibreOfficeWorker:
+    """
+    One LibreOffice instance with its own user profile.
+
+    In listener mode the instance is a `unoserver` process kept warm between
+    conversions; in subprocess mode a headless soffice is started per
+    conversion. Either way a conversion that exceeds the timeout kills the
+    instance, and the next conversion starts a fresh one.
+    """
+
+    def __init__(self, index: int, libreoffice_cmd: str, unoserver_cmd: str = None,
+                 timeout: int = 60, startup_timeout: int = 30):
+        self.index = index
+        self.libreoffice_cmd = libreoffice_cmd
+        self.unoserver_cmd = unoserver_cmd
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.profile_dir = tempfile.mkdtemp(prefix=f'cv-libreoffice-{index}-')
+        self.process = None
+        self.port = None
+        self.conversions = 0
+        self.restarts = 0
+
+    @property
+    def mode(self) -> str:
+        return 'listener' if self.unoserver_cmd else 'subprocess'
+
+    @property
+    def profile_url(self) -> str:
+        return Path(self.profile_dir).as_uri()
+
+    def is_running(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        """Start the listener and wait until it accepts connections"""
+        self.port = _free_port()
+        cmd = [
+            self.unoserver_cmd,
+            '--interface', '127.0.0.1',
+            '--port', str(self.port),
+            '--uno-port', str(_free_port()),
+            '--executable', self.libreoffice_cmd,
+            '--user-installation', self.profile_url,
+        ]
+        logger.info(f"Starting LibreOffice listener {self.index} on port {self.port}")
+        self.process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            **popen_group_kwargs()
+        )
+
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise Exception(f"LibreOffice listener exited during startup (code {self.process.returncode})")
+            try:
+                with socket.create_connection(('127.0.0.1', self.port), timeout=1):
+                    return
+            except OSError:
+                time.sleep(0.25)
+
+        self.stop()
+        raise Exception("LibreOffice listener did not start in time")
+
+    def stop(self):
+        kill_process_tree(self.process)
+        self.process = None
+
+    def restart(self):
+        logger.warning(f"Restarting LibreOffice instance {self.index}")
+        self.restarts += 1
+        self.stop()
+        # A killed instance can leave a stale lock file in its profile
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+        os.makedirs(self.profile_dir, exist_ok=True)
+
+    def close(self):
+        self.stop()
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+    def convert(self, source_path: str, output_dir: str) -> str:
+        """
+        Convert a document to DOCX
+
+        Args:
+            source_path: Absolute path to the source document
+            output_dir: Directory the DOCX is written to
+
+        Returns:
+            str: Path to the converted DOCX file
+
+        Raises:
+            Exception: If conversion fails or times out
+        """
+        output_path = os.path.join(output_dir, f"{Path(source_path).stem}.docx")
+        if self.mode == 'listener':
+            self._convert_with_listener(source_path, output_path)
+        else:
+            self._convert_with_subprocess(source_path, output_dir)
+
+        if not os.path.exists(output_path):
+            raise Exception(f"DOCX file was not created: {output_path}")
+        self.conversions += 1
+        return output_path
+
+    def _convert_with_listener(self, source_path: str, output_path: str):
+        if not self.is_running():
+            if self.process is not None:
+                self.restart()
+            self.start()
+
+        proxy = xmlrpc.client.ServerProxy(
+            f'http://127.0.0.1:{self.port}',
+            allow_none=True,
+            transport=_TimeoutTransport(self.timeout)
+        )
+        try:
+            # unoserver: convert(inpath, indata, outpath, convert_to, filtername,
+            #                    filter_options, update_index, infiltername)
+            proxy.convert(source_path, None, output_path, 'docx', None, [], True, None)
+        except (socket.timeout, TimeoutError):
+            self.restart()
+            raise Exception("DOC to DOCX conversion timed out")
+        except (OSError, xmlrpc.client.ProtocolError) as e:
+            self.restart()
+            raise Exception(f"LibreOffice listener failed: {e}")
+        except xmlrpc.client.Fault as e:
+            raise Exception(f"LibreOffice conversion failed: {e.faultString}")
+
+    def _convert_with_subprocess(self, source_path: str, output_dir: str):
+        cmd = [
+            self.libreoffice_cmd,
+            '--headless',  # Run without GUI
+            '--norestore',
+            '--nologo',
+            f'-env:UserInstallation={self.profile_url}',  # Profile owned by this worker
+            '--convert-to', 'docx',
+            '--outdir', output_dir,
+            source_path
+        ]
+        self.process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            cwd=output_dir,
+            **popen_group_kwargs()
+        )
+        try:
+            _, stderr = self.process.communicate(timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            self.restart()
+            raise Exception("DOC to DOCX conversion timed out")
+        finally:
+            returncode = self.process.returncode if self.process else None
+            self.process = None
+
+        if returncode != 0:
+            raise Exception(f"LibreOffice conversion failed: {stderr}")
+
+
+class LibreOfficePool:
+    """
+    Fixed-size pool of LibreOffice workers.
+
+    Callers queue for a free worker (up to `queue_timeout` seconds), so at most
+    `size` conversions run at once and no two share a user profile.
+    """
+
+    def __init__(self, libreoffice_cmd: str, size: int = 2, timeout: int = 60, queue_timeout: int = 120):
+        unoserver_cmd = shutil.which('unoserver')
+        self.queue_timeout = queue_timeout
+        self.workers = [
+            LibreOfficeWorker(i, libreoffice_cmd, unoserver_cmd=unoserver_cmd, timeout=timeout)
+            for i in range(size)
+        ]
+        self.idle = queue.Queue()
+        for worker in self.workers:
+            self.idle.put(worker)
+        logger.info(f"LibreOffice pool ready: {size} worker(s), {self.workers[0].mode} mode")
+
+    def convert(self, source_path: str, output_dir: str) -> str:
+        try:
+            worker = self.idle.get(timeout=self.queue_timeout)
+        except queue.Empty:
+            raise Exception("Timed out waiting for a free LibreOffice instance")
+        try:
+            return worker.convert(source_path, output_dir)
+        finally:
+            self.idle.put(worker)
+
+    def stats(self) -> dict:
+        return {
+            'size': len(self.workers),
+            'mode': self.workers[0].mode if self.workers else None,
+            'idle': self.idle.qsize(),
+            'conversions': sum(w.conversions for w in self.workers),
+            'restarts': sum(w.restarts for w in self.workers),
+        }
+
+    def shutdown(self):
+        for worker in self.workers:
+            worker.close()
+
+
 class DocToDocxConverter:
     """
     Service to convert .doc files to .docx format using LibreOffice
     """
     
     def __init__(self):
-        """Initialize the converter"""
-        self.libreoffice_cmd = self._find_libreoffice()
-        if not self.libreoffice_cmd:
-            logger.warning("LibreOffice not found. DOC to DOCX conversion will not work.")
-    
-    def _find_libreoffice(self):
+        """Initialize the converter (LibreOffice is located and started on first use)"""
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self.cache_dir = str(getattr(
+            settings, 'DOC_CONVERSION_CACHE_DIR',
+            os.path.join(settings.MEDIA_ROOT, 'conversion_cache')
+        ))
+        self.cache_max_bytes = getattr(settings, 'DOC_CONVERSION_CACHE_MAX_MB', 1024) * 1024 * 1024
+
+    @property
+    def libreoffice_cmd(self):
+        return _find_libreoffice()
+
+    def _get_pool(self) -> LibreOfficePool:
+        with self._pool_lock:
+            if self._pool is None:
+                if not self.libreoffice_cmd:
+                    logger.warning("LibreOffice not found. DOC to DOCX conversion will not work.")
+                    raise Exception("LibreOffice not available for DOC to DOCX conversion")
+                self._pool = LibreOfficePool(
+                    self.libreoffice_cmd,
+                    size=getattr(settings, 'DOC_CONVERTER_POOL_SIZE', 2),
+                    timeout=getattr(settings, 'DOC_CONVERSION_TIMEOUT', 60),
+                )
+                atexit.register(self._pool.shutdown)
+            return self._pool
+
+    def _cache_path(self, doc_file_path: str) -> str:
+        """Cache location for a source file, keyed by its SHA-256"""
+        sha256 = hashlib.sha256()
+        with open(doc_file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                sha256.update(chunk)
+        return os.path.join(self.cache_dir, f"{sha256.hexdigest()}.docx")
+
+    def convert_to_cache(self, doc_file_path: str) -> str:
         """
-        Find LibreOffice executable on the system
-        
+        Convert a .doc file, reusing an earlier conversion of identical content
+
+        Args:
+            doc_file_path: Path to the .doc file
+
         Returns:
-            str: Path to LibreOffice executable or None if not found
+            str: Path to the cached .docx file (do not modify or delete it)
+
+        Raises:
+            Exception: If conversion fails
         """
-        possible_paths = [
-            'libreoffice',  # Linux/Mac with PATH
-            '/usr/bin/libreoffice',  # Linux
-            '/Applications/LibreOffice.app/Contents/MacOS/soffice',  # macOS
-            r'C:\Program Files\LibreOffice\program\soffice.exe',  # Windows
-            r'C:\Program Files (x86)\LibreOffice\program\soffice.exe',  # Windows 32-bit
-        ]
-        
-        for path in possible_paths:
+        # Ensure we have absolute path
+        if not os.path.isabs(doc_file_path):
+            doc_file_path = default_storage.path(doc_file_path)
+
+        if not os.path.exists(doc_file_path):
+            raise FileNotFoundError(f"DOC file not found: {doc_file_path}")
+
+        cached_path = self._cache_path(doc_file_path)
+        if os.path.exists(cached_path):
+            logger.info(f"Using cached DOCX for {doc_file_path}: {cached_path}")
             try:
-                result = subprocess.run([path, '--version'], 
-                                      capture_output=True, 
-                                      timeout=10)
-                if result.returncode == 0:
-                    logger.info(f"Found LibreOffice at: {path}")
-                    return path
-            except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
-                continue
-        
-        return None
-    
+                os.utime(cached_path)  # Mark as recently used for eviction
+                return cached_path
+            except FileNotFoundError:
+                pass  # Evicted meanwhile; convert again
+
+        logger.info(f"Converting DOC to DOCX: {doc_file_path}")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix='cv-docx-') as output_dir:
+            converted_path = self._get_pool().convert(doc_file_path, output_dir)
+            # Move into place atomically so concurrent readers never see a partial file
+            staging_path = f"{cached_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.move(converted_path, staging_path)
+            os.replace(staging_path, cached_path)
+
+        logger.info(f"Successfully converted DOC to DOCX: {cached_path}")
+        self._evict_cache(keep=cached_path)
+        return cached_path
+
+    def _evict_cache(self, keep: str):
+        """
+        Delete the least recently used cached files until the cache fits in
+        DOC_CONVERSION_CACHE_MAX_MB (0 disables the limit). `keep` is never evicted.
+        """
+        if self.cache_max_bytes <= 0:
+            return
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith('.docx'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                total += stat.st_size
+                if entry.path != keep:
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        if total <= self.cache_max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Another process evicted it
+            total -= size
+            if total <= self.cache_max_bytes:
+                break
+        logger.info(f"Evicted DOCX conversion cache down to {total / 1024 ** 2:.1f} MB")
+
     def convert_doc_to_docx(self, doc_file_path: str) -> str:
         """
         Convert a .doc file to .docx format
@@ -65,57 +422,21 @@ class DocToDocxConverter:
         Raises:
             Exception: If conversion fails
         """
-        if not self.libreoffice_cmd:
-            raise Exception("LibreOffice not available for DOC to DOCX conversion")
-        
         try:
             # Ensure we have absolute path
             if not os.path.isabs(doc_file_path):
                 doc_file_path = default_storage.path(doc_file_path)
-            
-            if not os.path.exists(doc_file_path):
-                raise FileNotFoundError(f"DOC file not found: {doc_file_path}")
-            
-            # Create output directory
+
+            cached_path = self.convert_to_cache(doc_file_path)
+
+            # Place a copy next to the source, as callers expect
             doc_dir = os.path.dirname(doc_file_path)
             doc_name = os.path.splitext(os.path.basename(doc_file_path))[0]
-            
-            logger.info(f"Converting DOC to DOCX: {doc_file_path}")
-            
-            # LibreOffice command to convert DOC to DOCX
-            cmd = [
-                self.libreoffice_cmd,
-                '--headless',  # Run without GUI
-                '--convert-to', 'docx',  # Convert to DOCX format
-                '--outdir', doc_dir,  # Output directory
-                doc_file_path  # Input file
-            ]
-            
-            # Run conversion
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=60,  # 60 second timeout
-                cwd=doc_dir
-            )
-            
-            if result.returncode != 0:
-                error_msg = f"LibreOffice conversion failed: {result.stderr}"
-                logger.error(error_msg)
-                raise Exception(error_msg)
-            
-            # Check if DOCX file was created
             docx_file_path = os.path.join(doc_dir, f"{doc_name}.docx")
-            
-            if not os.path.exists(docx_file_path):
-                raise Exception(f"DOCX file was not created: {docx_file_path}")
-            
-            logger.info(f"Successfully converted DOC to DOCX: {docx_file_path}")
+            shutil.copyfile(cached_path, docx_file_path)
+
             return docx_file_path
-            
-        except subprocess.TimeoutExpired:
-            raise Exception("DOC to DOCX conversion timed out")
+
         except Exception as e:
             logger.error(f"Error converting DOC to DOCX: {str(e)}")
             raise
@@ -174,6 +495,17 @@ class DocToDocxConverter:
         """
         return self.libreoffice_cmd is not None
 
+    def get_stats(self) -> dict:
+        """
+        Pool and cache statistics
+
+        Returns:
+            dict: Worker mode, conversions, restarts and cached file count
+        """
+        stats = self._pool.stats() if self._pool else {'size': 0, 'mode': None}
+        stats['cached_files'] = len(os.listdir(self.cache_dir)) if os.path.isdir(self.cache_dir) else 0
+        return stats
+
 
 # Global instance
 doc_converter = DocToDocxConverter()
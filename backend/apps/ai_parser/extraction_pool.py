@@ -0,0 +1,494 @@
+"""
+Process-isolated extraction worker pool.
+
+Text extraction runs third-party parsers (pypdf, pdfminer, unstructured,
+LibreOffice) on untrusted files. A malformed document can make them loop
+forever or balloon in memory, which inside a Django request or Celery task
+takes the whole process down with it. Jobs sent to this pool run in separate
+worker processes that are killed when a job exceeds its wall-clock or RSS
+limit, and recycled after a fixed number of jobs. Failures come back as
+structured results instead of hung callers.
+
+This module only uses the standard library at import time, because it is also
+the worker entry point:
+
+    python -m apps.ai_parser.extraction_pool --initializer django:setup
+"""
+import os
+import sys
+import time
+import queue
+import pickle
+import struct
+import atexit
+import signal
+import logging
+import argparse
+import importlib
+import threading
+import subprocess
+from typing import Any, Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:  # RSS is read from /proc instead (Linux only); psutil is in requirements.txt
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct('!I')
+_RAISE = object()
+
+
+def popen_group_kwargs() -> Dict[str, Any]:
+    """Popen kwargs that start the child in its own process group, so it can be killed with its children"""
+    if os.name == 'posix':
+        return {'start_new_session': True}
+    return {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+
+
+def _descendant_pids(pid: int) -> List[int]:
+    """PIDs of every process below `pid`, including children that started their own session"""
+    if psutil is not None:
+        try:
+            return [child.pid for child in psutil.Process(pid).children(recursive=True)]
+        except psutil.Error:
+            return []
+    children = {}
+    try:
+        for entry in os.listdir('/proc'):
+            if entry.isdigit():
+                with open(f'/proc/{entry}/stat') as f:
+                    # The command name may contain spaces; fields resume after its ')'
+                    ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+                children.setdefault(ppid, []).append(int(entry))
+    except (OSError, ValueError, IndexError):
+        pass
+    found, pending = [], [pid]
+    while pending:
+        for child in children.get(pending.pop(), []):
+            found.append(child)
+            pending.append(child)
+    return found
+
+
+def kill_process_tree(process):
+    """
+    Kill a child process started with popen_group_kwargs() and everything it
+    spawned, including descendants that moved to a session of their own
+    """
+    if process is None or process.poll() is not None:
+        return
+    descendants = _descendant_pids(process.pid)
+    try:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+        process.wait(timeout=10)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.warning(f"Could not kill process {process.pid}: {e}")
+    for pid in descendants:
+        try:
+            if psutil is not None:
+                psutil.Process(pid).kill()
+            else:
+                os.kill(pid, signal.SIGKILL)
+        except Exception:
+            pass
+
+
+def _rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process in MB, or None if it cannot be read"""
+    try:
+        if psutil is not None:
+            return psutil.Process(pid).memory_info().rss / (1024 * 1024)
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except Exception:
+        return None
+    return None
+
+
+def _can_read_rss() -> bool:
+    """Whether worker RSS can be measured on this platform"""
+    return _rss_mb(os.getpid()) is not None
+
+
+def _resolve(target: str):
+    """Resolve 'package.module:Attr.path' to the object it names"""
+    module_path, _, attr_path = target.partition(':')
+    obj = importlib.import_module(module_path)
+    for attr in attr_path.split('.'):
+        obj = getattr(obj, attr)
+    return obj
+
+
+def _write_message(stream, message):
+    payload = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    stream.write(_HEADER.pack(len(payload)) + payload)
+    stream.flush()
+
+
+def _read_message(stream):
+    header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return None
+    (length,) = _HEADER.unpack(header)
+    payload = stream.read(length)
+    if len(payload) < length:
+        return None
+    return pickle.loads(payload)
+
+
+class ExtractionError(Exception):
+    """Raised by ExtractionPool.extract when a job fails; the structured result is on .result"""
+
+    def __init__(self, result: Dict[str, Any]):
+        self.result = result
+        super().__init__(f"{result['error_type']}: {result['error']}")
+
+
+class _Worker:
+    """One worker subprocess and the thread reading its replies"""
+
+    def __init__(self, command: List[str], cwd: str = None):
+        self.command = command
+        self.cwd = cwd
+        self.process = None
+        self.responses = None
+        self.jobs = 0
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.process else None
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=self.cwd,
+            **popen_group_kwargs()
+        )
+        self.responses = queue.Queue()
+        self.jobs = 0
+        threading.Thread(
+            target=self._read_responses,
+            args=(self.process, self.responses),
+            daemon=True
+        ).start()
+        logger.info(f"Started extraction worker {self.process.pid}")
+
+    @staticmethod
+    def _read_responses(process, responses):
+        try:
+            while True:
+                message = _read_message(process.stdout)
+                if message is None:
+                    break
+                responses.put(message)
+        except Exception:
+            pass
+        # None tells the waiting caller the worker is gone
+        responses.put(None)
+
+    def send(self, message):
+        _write_message(self.process.stdin, message)
+
+    def stop(self, graceful: bool = True):
+        if self.process is None:
+            return
+        if graceful and self.is_alive():
+            try:
+                _write_message(self.process.stdin, None)
+                self.process.wait(timeout=5)
+            except Exception:
+                pass
+        kill_process_tree(self.process)
+        self.process = None
+
+
+class ExtractionPool:
+    """
+    Fixed-size pool of extraction worker processes.
+
+    Jobs are named by a 'module:function' target and plain picklable
+    arguments, and run one at a time per worker. Callers queue for a free
+    worker; workers start on first use.
+    """
+
+    def __init__(self, command: List[str], cwd: str = None, max_workers: int = 2,
+                 timeout: float = 120, max_memory_mb: int = 1536,
+                 max_jobs_per_worker: int = 50, queue_timeout: float = 300,
+                 poll_interval: float = 0.2):
+        """
+        Args:
+            command: Command that starts a worker (runs this module's worker loop)
+            cwd: Working directory for the workers
+            max_workers: Number of worker processes
+            timeout: Default wall-clock limit per job in seconds
+            max_memory_mb: RSS limit per worker in MB (0 disables the check)
+            max_jobs_per_worker: Jobs a worker runs before it is replaced
+            queue_timeout: How long a caller waits for a free worker (None waits indefinitely)
+            poll_interval: How often a running job's time and memory are checked
+        """
+        if max_memory_mb and not _can_read_rss():
+            raise RuntimeError(
+                f"Cannot enforce the {max_memory_mb} MB extraction memory limit: install psutil "
+                f"(requirements.txt) or set EXTRACTION_MAX_MEMORY_MB = 0 to run without one"
+            )
+        self.timeout = timeout
+        self.max_memory_mb = max_memory_mb
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.queue_timeout = queue_timeout
+        self.poll_interval = poll_interval
+
+        self.workers = [_Worker(command, cwd=cwd) for _ in range(max_workers)]
+        self.idle = queue.Queue()
+        for worker in self.workers:
+            self.idle.put(worker)
+
+        self._lock = threading.Lock()
+        self._job_counter = 0
+        self.counters = {'jobs': 0, 'failed': 0, 'timeouts': 0, 'memory_kills': 0, 'crashes': 0, 'recycled': 0}
+
+    def run(self, target: str, *args, timeout: float = None) -> Dict[str, Any]:
+        """
+        Run a job in a worker process.
+
+        Args:
+            target: 'package.module:function' to call in the worker
+            *args: Picklable positional arguments
+            timeout: Wall-clock limit in seconds (defaults to the pool timeout)
+
+        Returns:
+            dict: {
+                'ok': True if the function returned,
+                'result': its return value,
+                'error': error message or None,
+                'error_type': None, 'exception', 'timeout', 'memory', 'crash' or 'queue_timeout',
+                'exception': exception class name raised in the worker, if any,
+                'duration_ms': wall-clock time including queueing,
+                'peak_rss_mb': highest worker RSS seen during the job,
+                'worker_pid': pid of the worker that ran the job
+            }
+        """
+        started = time.monotonic()
+        try:
+            worker = self.idle.get(timeout=self.queue_timeout)
+        except queue.Empty:
+            return self._failure('queue_timeout', 'No extraction worker became free', started)
+
+        try:
+            return self._run_on(worker, target, args, timeout or self.timeout, started)
+        finally:
+            self.idle.put(worker)
+
+    def extract(self, target: str, *args, timeout: float = None) -> Any:
+        """
+        Run a job and return its result.
+
+        Raises:
+            ExtractionError: If the job failed for any reason
+        """
+        result = self.run(target, *args, timeout=timeout)
+        if not result['ok']:
+            raise ExtractionError(result)
+        return result['result']
+
+    def _run_on(self, worker: _Worker, target: str, args: tuple, timeout: float, started: float) -> Dict[str, Any]:
+        if not worker.is_alive():
+            worker.start()
+
+        with self._lock:
+            self._job_counter += 1
+            job_id = self._job_counter
+            self.counters['jobs'] += 1
+
+        pid = worker.pid
+        try:
+            worker.send((job_id, target, args))
+        except (OSError, ValueError) as e:
+            worker.stop(graceful=False)
+            return self._failure('crash', f"Could not send job to worker: {e}", started, pid=pid)
+
+        deadline = time.monotonic() + timeout
+        peak_rss = 0.0
+        while True:
+            try:
+                message = worker.responses.get(timeout=self.poll_interval)
+            except queue.Empty:
+                rss = _rss_mb(pid)
+                if rss:
+                    peak_rss = max(peak_rss, rss)
+                if self.max_memory_mb and rss and rss > self.max_memory_mb:
+                    worker.stop(graceful=False)
+                    return self._failure(
+                        'memory', f"Worker exceeded {self.max_memory_mb} MB RSS ({rss:.0f} MB)",
+                        started, pid=pid, peak_rss=peak_rss
+                    )
+                if time.monotonic() > deadline:
+                    worker.stop(graceful=False)
+                    return self._failure(
+                        'timeout', f"Extraction exceeded {timeout}s", started, pid=pid, peak_rss=peak_rss
+                    )
+                continue
+
+            if message is None:
+                try:
+                    code = worker.process.wait(timeout=1)
+                except subprocess.TimeoutExpired:
+                    code = None
+                worker.stop(graceful=False)
+                return self._failure('crash', f"Worker exited with code {code}", started, pid=pid, peak_rss=peak_rss)
+
+            reply_id, ok, value, exception_name = message
+            if reply_id != job_id:
+                continue
+
+            worker.jobs += 1
+            if worker.jobs >= self.max_jobs_per_worker:
+                logger.info(f"Recycling extraction worker {pid} after {worker.jobs} jobs")
+                worker.stop()
+                with self._lock:
+                    self.counters['recycled'] += 1
+
+            if not ok:
+                return self._failure('exception', value, started, pid=pid, peak_rss=peak_rss, exception=exception_name)
+
+            return {
+                'ok': True,
+                'result': value,
+                'error': None,
+                'error_type': None,
+                'exception': None,
+                'duration_ms': round((time.monotonic() - started) * 1000, 1),
+                'peak_rss_mb': round(peak_rss, 1) or None,
+                'worker_pid': pid,
+            }
+
+    def _failure(self, error_type: str, error: str, started: float, pid: int = None,
+                 peak_rss: float = 0.0, exception: str = None) -> Dict[str, Any]:
+        counter = {'timeout': 'timeouts', 'memory': 'memory_kills', 'crash': 'crashes'}.get(error_type)
+        with self._lock:
+            self.counters['failed'] += 1
+            if counter:
+                self.counters[counter] += 1
+        if error_type != 'exception':
+            logger.warning(f"Extraction job failed ({error_type}) on worker {pid}: {error}")
+        return {
+            'ok': False,
+            'result': None,
+            'error': error,
+            'error_type': error_type,
+            'exception': exception,
+            'duration_ms': round((time.monotonic() - started) * 1000, 1),
+            'peak_rss_mb': round(peak_rss, 1) or None,
+            'worker_pid': pid,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.counters)
+        stats['workers'] = len(self.workers)
+        stats['alive'] = sum(1 for w in self.workers if w.is_alive())
+        stats['idle'] = self.idle.qsize()
+        return stats
+
+    def shutdown(self):
+        for worker in self.workers:
+            worker.stop()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """Return the process-wide extraction pool, configured from Django settings"""
+    global _pool
+    from django.conf import settings
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ExtractionPool(
+                command=[sys.executable, '-m', 'apps.ai_parser.extraction_pool', '--initializer', 'django:setup'],
+                cwd=str(settings.BASE_DIR),
+                max_workers=getattr(settings, 'EXTRACTION_POOL_WORKERS', 2),
+                timeout=getattr(settings, 'EXTRACTION_TIMEOUT', 120),
+                max_memory_mb=getattr(settings, 'EXTRACTION_MAX_MEMORY_MB', 1536),
+                max_jobs_per_worker=getattr(settings, 'EXTRACTION_MAX_JOBS_PER_WORKER', 50),
+            )
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+def run_isolated(target: str, *args, default: Any = _RAISE, timeout: float = None) -> Any:
+    """
+    Run an extraction function in the worker pool (or inline when
+    EXTRACTION_POOL_ENABLED is off).
+
+    Args:
+        target: 'package.module:function' to call
+        *args: Picklable positional arguments
+        default: Value returned instead of raising when the job fails
+        timeout: Wall-clock limit in seconds
+
+    Returns:
+        The function's return value, or `default` on failure
+
+    Raises:
+        ExtractionError: If the job failed and no default was given
+    """
+    from django.conf import settings
+
+    if not getattr(settings, 'EXTRACTION_POOL_ENABLED', True):
+        return _resolve(target)(*args)
+
+    try:
+        return get_extraction_pool().extract(target, *args, timeout=timeout)
+    except ExtractionError as e:
+        if default is _RAISE:
+            raise
+        logger.error(f"Isolated extraction {target}{args} failed: {e}")
+        return default
+
+
+def _worker_main(initializer: str = None):
+    """Worker loop: read (job_id, target, args) messages from stdin, reply on stdout"""
+    # Keep the real stdout for replies and send anything the parsers print to stderr
+    protocol_out = os.fdopen(os.dup(sys.stdout.fileno()), 'wb')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    protocol_in = sys.stdin.buffer
+
+    if initializer:
+        _resolve(initializer)()
+
+    functions = {}
+    while True:
+        job = _read_message(protocol_in)
+        if job is None:
+            break
+        job_id, target, args = job
+        try:
+            if target not in functions:
+                functions[target] = _resolve(target)
+            reply = (job_id, True, functions[target](*args), None)
+        except Exception as e:
+            reply = (job_id, False, str(e), type(e).__name__)
+        try:
+            _write_message(protocol_out, reply)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            _write_message(protocol_out, (job_id, False, f"Result could not be returned: {e}", type(e).__name__))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Extraction pool worker')
+    parser.add_argument('--initializer', help="'module:function' called once before the first job")
+    _worker_main(parser.parse_args().initializer)
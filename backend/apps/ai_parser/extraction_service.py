@@ -0,0 +1,238 @@
+"""
+Tiered text extraction for resume files.
+
+Most CVs are digitally created, so their text layer can be read directly in a
+few milliseconds. Unstructured's partitioners (and OCR) are only needed for
+scanned or oddly laid out files. This service tries the cheap extractors first,
+scores each result and only escalates to the next tier when the score is below
+the configured threshold.
+"""
+import os
+import time
+import logging
+from typing import Dict, Any, Callable, List, Optional
+from django.conf import settings
+
+from .unstructured_service import UnstructuredService
+from .extraction_pool import run_isolated, ExtractionError
+
+logger = logging.getLogger(__name__)
+
+
+# Tiers tried per file extension, cheapest first
+EXTRACTION_TIERS = {
+    '.pdf': ['pypdf', 'pdfminer', 'unstructured', 'ocr'],
+    '.docx': ['python-docx', 'unstructured'],
+    '.doc': ['libreoffice', 'unstructured'],
+    '.txt': ['plain', 'unstructured'],
+    '.rtf': ['unstructured'],
+}
+
+
+class TieredExtractionService:
+    """
+    Extract text with fast extractors first and fall back to Unstructured
+    (and OCR for PDFs) only when the fast result scores below the threshold.
+    """
+
+    def __init__(self, quality_checker: Callable[[str, str], Dict[str, Any]],
+                 unstructured_service: UnstructuredService = None,
+                 quality_threshold: int = None, isolated: bool = None):
+        """
+        Args:
+            quality_checker: Callable taking (text, file_path) and returning a report
+                with a 'quality_score' key (ResumeParsingService.check_extraction_quality)
+            unstructured_service: Service used for the unstructured and OCR tiers
+            quality_threshold: Minimum score (0-100) a tier must reach to be accepted
+            isolated: Run each tier in the extraction worker pool (defaults to
+                settings.EXTRACTION_POOL_ENABLED)
+        """
+        self.quality_checker = quality_checker
+        self.unstructured_service = unstructured_service or UnstructuredService()
+        if quality_threshold is None:
+            quality_threshold = getattr(settings, 'EXTRACTION_QUALITY_THRESHOLD', 60)
+        self.quality_threshold = quality_threshold
+        if isolated is None:
+            isolated = getattr(settings, 'EXTRACTION_POOL_ENABLED', True)
+        self.isolated = isolated
+
+        self.extractors = {
+            'pypdf': self._extract_with_pypdf,
+            'pdfminer': self._extract_with_pdfminer,
+            'python-docx': self._extract_with_python_docx,
+            'libreoffice': self._extract_with_libreoffice,
+            'plain': self._extract_plain_text,
+            'unstructured': self._extract_with_unstructured,
+            'ocr': self._extract_with_ocr,
+        }
+
+    def extract(self, file_path: str) -> Dict[str, Any]:
+        """
+        Run the extraction tiers for a file until one is good enough.
+
+        Args:
+            file_path: Relative storage path or absolute path to the file
+
+        Returns:
+            dict: {
+                'text': extracted text (best result if no tier reached the threshold),
+                'tier': name of the tier whose text was returned,
+                'quality_score': score of the returned text,
+                'tiers': [{'tier', 'duration_ms', 'quality_score', 'characters', 'error', 'error_type'}, ...],
+                'total_ms': total time spent across tiers
+            }
+
+        Raises:
+            ValueError: If the file format is not supported
+            Exception: If every tier failed with an error
+        """
+        file_extension = os.path.splitext(file_path)[1].lower()
+        tiers = EXTRACTION_TIERS.get(file_extension)
+        if not tiers:
+            raise ValueError(f"Unsupported file format: {file_extension}. Supported formats: {', '.join(EXTRACTION_TIERS)}")
+
+        absolute_path = self.unstructured_service.resolve_path(file_path)
+        if not os.path.exists(absolute_path):
+            raise FileNotFoundError(f"File not found: {absolute_path}")
+
+        attempts: List[Dict[str, Any]] = []
+        best: Optional[Dict[str, Any]] = None
+        last_error = None
+        started = time.perf_counter()
+
+        for tier in tiers:
+            tier_started = time.perf_counter()
+            attempt = {'tier': tier, 'duration_ms': 0, 'quality_score': 0, 'characters': 0,
+                       'error': None, 'error_type': None}
+            try:
+                text = self._run_tier(tier, absolute_path) or ''
+                attempt['characters'] = len(text)
+                attempt['quality_score'] = self.quality_checker(text, file_path)['quality_score'] if text.strip() else 0
+                if text.strip() and (best is None or attempt['quality_score'] > best['quality_score']):
+                    best = {'text': text, 'tier': tier, 'quality_score': attempt['quality_score']}
+            except Exception as e:
+                last_error = e
+                attempt['error'] = str(e)
+                # 'timeout', 'memory' or 'crash' when the worker had to be killed
+                attempt['error_type'] = e.result['error_type'] if isinstance(e, ExtractionError) else 'exception'
+                logger.warning(f"Extraction tier '{tier}' failed for {file_path}: {e}")
+            attempt['duration_ms'] = round((time.perf_counter() - tier_started) * 1000, 1)
+            attempts.append(attempt)
+
+            if best and best['tier'] == tier and best['quality_score'] >= self.quality_threshold:
+                break
+
+        total_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        if best is None:
+            if last_error is not None and all(a['error'] for a in attempts):
+                raise Exception(f"Failed to extract text: {last_error}")
+            best = {'text': '', 'tier': attempts[-1]['tier'], 'quality_score': 0}
+
+        logger.info(
+            f"Extraction for {file_path}: tier={best['tier']} score={best['quality_score']} "
+            f"total={total_ms}ms tiers={[(a['tier'], a['duration_ms']) for a in attempts]}"
+        )
+
+        return {
+            'text': best['text'],
+            'tier': best['tier'],
+            'quality_score': best['quality_score'],
+            'tiers': attempts,
+            'total_ms': total_ms,
+        }
+
+    def _run_tier(self, tier: str, file_path: str) -> str:
+        """Run one extractor, in a worker process when isolation is enabled"""
+        if not self.isolated:
+            return self.extractors[tier](file_path)
+        if tier == 'libreoffice':
+            # The warm LibreOffice pool stays in this process, so worker kills and
+            # recycling neither orphan nor discard it; its instances are killable
+            # processes with their own timeouts. Only the DOCX parse runs in a worker.
+            from .doc_converter import doc_converter
+
+            docx_path = doc_converter.convert_to_cache(file_path)
+            return run_isolated('apps.ai_parser.extraction_service:run_extraction_tier', 'python-docx', docx_path)
+        return run_isolated('apps.ai_parser.extraction_service:run_extraction_tier', tier, file_path)
+
+    def _extract_with_pypdf(self, file_path: str) -> str:
+        """Read the PDF text layer with pypdf"""
+        from pypdf import PdfReader
+
+        reader = PdfReader(file_path)
+        pages = []
+        for page in reader.pages:
+            page_text = page.extract_text() or ''
+            if page_text.strip():
+                pages.append(page_text)
+        return '\n'.join(pages)
+
+    def _extract_with_pdfminer(self, file_path: str) -> str:
+        """Read the PDF text layer with pdfminer (better on multi-column layouts)"""
+        from pdfminer.high_level import extract_text
+
+        return extract_text(file_path)
+
+    def _extract_with_python_docx(self, file_path: str) -> str:
+        """Read paragraphs and table cells from a DOCX with python-docx"""
+        import docx
+
+        document = docx.Document(file_path)
+        lines = [p.text.strip() for p in document.paragraphs if p.text.strip()]
+        for table in document.tables:
+            for row in table.rows:
+                cells = []
+                for cell in row.cells:
+                    cell_text = cell.text.strip()
+                    # Merged cells repeat across the row; keep each once
+                    if cell_text and cell_text not in cells:
+                        cells.append(cell_text)
+                if cells:
+                    lines.append(' | '.join(cells))
+        return '\n'.join(lines)
+
+    def _extract_with_libreoffice(self, file_path: str) -> str:
+        """Convert a DOC on the warm LibreOffice pool (cached by hash) and read it as DOCX"""
+        from .doc_converter import doc_converter
+
+        return self._extract_with_python_docx(doc_converter.convert_to_cache(file_path))
+
+    def _extract_plain_text(self, file_path: str) -> str:
+        """Read a plain text file, trying common encodings"""
+        for encoding in ('utf-8', 'utf-16', 'cp1252'):
+            try:
+                with open(file_path, 'r', encoding=encoding) as f:
+                    return f.read()
+            except UnicodeError:
+                continue
+        with open(file_path, 'r', encoding='latin-1') as f:
+            return f.read()
+
+    def _extract_with_unstructured(self, file_path: str) -> str:
+        """Partition the file with unstructured's default strategy"""
+        return self.unstructured_service.extract_text(file_path)
+
+    def _extract_with_ocr(self, file_path: str) -> str:
+        """OCR every page of a PDF (scanned CVs)"""
+        return self.unstructured_service.extract_text(file_path, strategy='ocr_only')
+
+
+_worker_service = None
+
+
+def run_extraction_tier(tier: str, file_path: str) -> str:
+    """
+    Entry point for extraction pool workers: run a single tier in-process.
+
+    Args:
+        tier: Name of the tier (a key of TieredExtractionService.extractors)
+        file_path: Absolute path to the file
+
+    Returns:
+        str: Extracted text
+    """
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = TieredExtractionService(quality_checker=None, isolated=False)
+    return _worker_service.extractors[tier](file_path)
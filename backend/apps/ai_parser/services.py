@@ -9,9 +9,36 @@ from typing import Dict, Any, Optional
 
 from .gemini_service import GeminiService
 from .unstructured_service import UnstructuredService
+from .extraction_service import TieredExtractionService
 
 logger = logging.getLogger(__name__)
 
+# Country codes/abbreviations found in CV locations, mapped to country names
+COUNTRY_CODE_MAPPINGS = {
+    'USA': 'United States',
+    'US': 'United States',
+    'UK': 'United Kingdom',
+    'UAE': 'United Arab Emirates',
+    'BD': 'Bangladesh',
+    'IN': 'India',
+    'CA': 'Canada',
+    'AU': 'Australia',
+    'DE': 'Germany',
+    'FR': 'France',
+    'JP': 'Japan',
+    'CN': 'China',
+    'SG': 'Singapore',
+    'MY': 'Malaysia',
+    'TH': 'Thailand',
+    'PH': 'Philippines',
+    'ID': 'Indonesia',
+    'VN': 'Vietnam',
+    'KR': 'South Korea',
+    'TW': 'Taiwan',
+    'HK': 'Hong Kong',
+    'NZ': 'New Zealand'
+}
+
 
 class ResumeParsingService:
     """
@@ -53,12 +80,21 @@ class ResumeParsingService:
         except Exception as e:
             logger.error(f"Failed to initialize Unstructured service: {str(e)}")
             raise ValueError("Unstructured service initialization failed. This service is required for text extraction. Please ensure Unstructured is properly installed.")
+        
+        # Fast text-layer extractors first, Unstructured/OCR only when quality is poor
+        self.extraction_service = TieredExtractionService(
+            quality_checker=self.check_extraction_quality,
+            unstructured_service=self.unstructured_service
+        )
+        
+        # Tier and per-tier timings of the most recent extraction, saved on the Resume
+        self.last_extraction = None
 
     def extract_text(self, file_path: str) -> str:
         """
-        Extract text from resume file using Unstructured library
+        Extract text from resume file, escalating from fast extractors to Unstructured
         """
-        logger.info(f"Using Unstructured to extract text from {file_path}")
+        logger.info(f"Extracting text from {file_path}")
         
         # Get file info for logging
         try:
@@ -75,14 +111,16 @@ class ResumeParsingService:
             logger.warning(f"Could not get file details: {e}")
         
         # Extract text
-        result = self.unstructured_service.extract_text(file_path)
+        extraction = self.extraction_service.extract(file_path)
+        result = extraction.pop('text')
+        self.last_extraction = extraction
         
         # Log extraction results
         text_length = len(result) if result else 0
         word_count = len(result.split()) if result else 0
         line_count = len(result.split('\n')) if result else 0
         
-        logger.info(f"Extraction completed: {text_length} characters, {word_count} words, {line_count} lines")
+        logger.info(f"Extraction completed with '{extraction['tier']}' tier: {text_length} characters, {word_count} words, {line_count} lines")
         
         # Log first and last parts for verification
         if result:
@@ -93,7 +131,6 @@ class ResumeParsingService:
         else:
             logger.warning("WARNING: No text extracted from file!")
         
-        # The UnstructuredService now returns a string directly, not a dictionary
         return result
 
     def create_parsing_prompt(self, resume_text: str) -> str:
@@ -436,35 +473,9 @@ class ResumeParsingService:
             # Last part is likely the country
             potential_country = parts[-1]
 
-            # Common country name mappings
-            country_mappings = {
-                'USA': 'United States',
-                'US': 'United States',
-                'UK': 'United Kingdom',
-                'UAE': 'United Arab Emirates',
-                'BD': 'Bangladesh',
-                'IN': 'India',
-                'CA': 'Canada',
-                'AU': 'Australia',
-                'DE': 'Germany',
-                'FR': 'France',
-                'JP': 'Japan',
-                'CN': 'China',
-                'SG': 'Singapore',
-                'MY': 'Malaysia',
-                'TH': 'Thailand',
-                'PH': 'Philippines',
-                'ID': 'Indonesia',
-                'VN': 'Vietnam',
-                'KR': 'South Korea',
-                'TW': 'Taiwan',
-                'HK': 'Hong Kong',
-                'NZ': 'New Zealand'
-            }
-
             # Check if it's a country code and expand it
-            if potential_country.upper() in country_mappings:
-                return country_mappings[potential_country.upper()]
+            if potential_country.upper() in COUNTRY_CODE_MAPPINGS:
+                return COUNTRY_CODE_MAPPINGS[potential_country.upper()]
 
             # List of common country names to validate
             common_countries = {
@@ -883,14 +894,16 @@ class ResumeParsingService:
 
         return 0
 
-    def parse_resume(self, file_path: str, preferred_provider: str = None) -> Dict[str, Any]:
+    def parse_resume(self, file_path: str, preferred_provider: str = None, resume_text: str = None) -> Dict[str, Any]:
         """
-        Main method to parse resume and return structured data
+        Main method to parse resume and return structured data.
+        Pass resume_text when the caller has already extracted it, to avoid a second extraction.
         """
         logger.info(f"Starting to parse resume: {file_path}")
 
         # Extract text from file
-        resume_text = self.extract_text(file_path)
+        if resume_text is None:
+            resume_text = self.extract_text(file_path)
 
         if not resume_text or not resume_text.strip():
             logger.error(f"No text could be extracted from {file_path}")
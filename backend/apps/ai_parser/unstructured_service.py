@@ -1,15 +1,54 @@
 import os
 import logging
+import importlib
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
-from unstructured.partition.pdf import partition_pdf
-from unstructured.partition.docx import partition_docx
-from unstructured.partition.doc import partition_doc
-from unstructured.partition.text import partition_text
-from unstructured.partition.rtf import partition_rtf
 
 logger = logging.getLogger(__name__)
 
+# Partition functions are imported on first use per format. Importing
+# unstructured pulls in NLTK, torch and the layout models, so doing it at
+# module level made every manage.py command, Celery worker and WSGI boot pay
+# for it even when no document is ever extracted.
+PARTITIONER_PATHS = {
+    '.pdf': ('unstructured.partition.pdf', 'partition_pdf'),
+    '.docx': ('unstructured.partition.docx', 'partition_docx'),
+    '.doc': ('unstructured.partition.doc', 'partition_doc'),
+    '.txt': ('unstructured.partition.text', 'partition_text'),
+    '.rtf': ('unstructured.partition.rtf', 'partition_rtf'),
+}
+
+_loaded_partitioners = {}
+
+
+def get_partitioner(file_extension):
+    """
+    Return the unstructured partition function for a file extension,
+    importing its module the first time it is requested.
+
+    Args:
+        file_extension (str): Lower-case extension including the dot (e.g. '.pdf')
+
+    Returns:
+        callable: The partition function for that format
+
+    Raises:
+        ValueError: If the extension has no registered partitioner
+    """
+    partitioner = _loaded_partitioners.get(file_extension)
+    if partitioner is not None:
+        return partitioner
+
+    if file_extension not in PARTITIONER_PATHS:
+        raise ValueError(f"No partitioner registered for {file_extension}")
+
+    module_path, function_name = PARTITIONER_PATHS[file_extension]
+    logger.info(f"Loading {module_path}.{function_name} on first use")
+    module = importlib.import_module(module_path)
+    partitioner = getattr(module, function_name)
+    _loaded_partitioners[file_extension] = partitioner
+    return partitioner
+
 class UnstructuredService:
     """
     Service for extracting text from PDF, DOCX, DOC, TXT, and RTF files using the unstructured library.
@@ -32,12 +71,42 @@ class UnstructuredService:
         """
         return list(self.SUPPORTED_EXTENSIONS)
     
-    def extract_text(self, file_path):
+    def resolve_path(self, file_path):
+        """
+        Convert a storage-relative path into an absolute filesystem path.
+        
+        Args:
+            file_path (str): Relative storage path or absolute path
+            
+        Returns:
+            str: Absolute path to the file
+        """
+        if os.path.isabs(file_path):
+            return file_path
+        
+        try:
+            # Try to get absolute path from Django storage
+            absolute_path = default_storage.path(file_path)
+            logger.info(f"Converted relative path '{file_path}' to absolute path '{absolute_path}'")
+            return absolute_path
+        except (NotImplementedError, AttributeError):
+            # Fallback: construct path manually
+            from django.conf import settings
+            media_root = getattr(settings, 'MEDIA_ROOT', '')
+            if media_root:
+                absolute_path = os.path.join(media_root, file_path)
+                logger.info(f"Constructed absolute path '{absolute_path}' from relative path '{file_path}'")
+                return absolute_path
+        return file_path
+    
+    def extract_text(self, file_path, strategy=None):
         """
         Extract text from a file using the appropriate unstructured partition function.
         
         Args:
             file_path (str): Path to the file to extract text from (can be relative or absolute)
+            strategy (str): Optional partition strategy for PDFs ('fast', 'hi_res', 'ocr_only').
+                Ignored for other formats.
             
         Returns:
             str: Extracted text content
@@ -55,20 +124,7 @@ class UnstructuredService:
                 raise ValueError(f"Unsupported file format: {file_extension}. Supported formats: {', '.join(self.SUPPORTED_EXTENSIONS)}")
             
             # Convert relative path to absolute path using Django's storage system
-            if not os.path.isabs(file_path):
-                try:
-                    # Try to get absolute path from Django storage
-                    absolute_path = default_storage.path(file_path)
-                    logger.info(f"Converted relative path '{file_path}' to absolute path '{absolute_path}'")
-                    file_path = absolute_path
-                except (NotImplementedError, AttributeError):
-                    # Fallback: construct path manually
-                    from django.conf import settings
-                    media_root = getattr(settings, 'MEDIA_ROOT', '')
-                    if media_root:
-                        absolute_path = os.path.join(media_root, file_path)
-                        logger.info(f"Constructed absolute path '{absolute_path}' from relative path '{file_path}'")
-                        file_path = absolute_path
+            file_path = self.resolve_path(file_path)
             
             # Verify file exists
             if not os.path.exists(file_path):
@@ -77,27 +133,12 @@ class UnstructuredService:
             logger.info(f"Processing file: {file_path}")
             
             # Extract text based on file type
-            elements = []
-            
-            if file_extension == '.pdf':
-                logger.info(f"Extracting text from PDF: {file_path}")
-                elements = partition_pdf(filename=file_path)
-                
-            elif file_extension == '.docx':
-                logger.info(f"Extracting text from DOCX: {file_path}")
-                elements = partition_docx(filename=file_path)
-                
-            elif file_extension == '.doc':
-                logger.info(f"Extracting text from DOC: {file_path}")
-                elements = partition_doc(filename=file_path)
-                
-            elif file_extension == '.txt':
-                logger.info(f"Extracting text from TXT: {file_path}")
-                elements = partition_text(filename=file_path)
-                
-            elif file_extension == '.rtf':
-                logger.info(f"Extracting text from RTF: {file_path}")
-                elements = partition_rtf(filename=file_path)
+            logger.info(f"Extracting text from {file_extension.lstrip('.').upper()}: {file_path}")
+            partition = get_partitioner(file_extension)
+            partition_kwargs = {'filename': file_path}
+            if strategy and file_extension == '.pdf':
+                partition_kwargs['strategy'] = strategy
+            elements = partition(**partition_kwargs)
             
             # Combine all text elements
             text_content = []
@@ -0,0 +1,32 @@
+import logging
+
+from apps.resumes.models import start_json_decode_profile, stop_json_decode_profile
+
+logger = logging.getLogger(__name__)
+
+
+class JSONDecodeProfileMiddleware:
+    """
+    Debug profile of Resume JSON column decodes per request.
+
+    Adds an `X-JSON-Decodes` header (total and per-field counts) and logs the
+    counts, so repeated decoding of the same column shows up while developing.
+    Enabled in settings when DEBUG is on.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start_json_decode_profile()
+        try:
+            response = self.get_response(request)
+        finally:
+            counts = stop_json_decode_profile()
+
+        total = sum(counts.values())
+        if total:
+            per_field = ', '.join(f"{field}={count}" for field, count in counts.most_common())
+            response['X-JSON-Decodes'] = f"{total} ({per_field})"
+            logger.debug(f"{request.method} {request.path}: {total} JSON decodes ({per_field})")
+        return response
@@ -0,0 +1,148 @@
+"""
+Search, ordering and fuzzy-matching helpers for ResumeViewSet
+"""
+import re
+import json
+import difflib
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connection
+from django.db.models import F, Q, Count, Max
+from django.db.models.functions import Upper
+from rest_framework.filters import SearchFilter, OrderingFilter
+
+from .models import FILTER_KEY_FIELDS, Resume
+from ..ai_parser.services import COUNTRY_CODE_MAPPINGS
+
+# Must match the configuration used by the search_vector trigger (migration 0013)
+SEARCH_CONFIG = 'simple'
+
+_WORD_RE = re.compile(r'^\w+$')
+
+
+def full_text_search_enabled():
+    """True when resume search can use the tsvector column (PostgreSQL only)"""
+    return connection.vendor == 'postgresql' and getattr(settings, 'RESUME_FULL_TEXT_SEARCH', True)
+
+
+def build_search_query(terms):
+    """
+    Turn search terms into one tsquery that requires every term.
+
+    Plain words match as prefixes (like the icontains search they replace);
+    terms with punctuation such as emails are parsed the way the trigger
+    parsed the stored text.
+    """
+    query = None
+    for term in terms:
+        if _WORD_RE.match(term):
+            term_query = SearchQuery(f"{term.lower()}:*", search_type='raw', config=SEARCH_CONFIG)
+        else:
+            term_query = SearchQuery(term, search_type='plain', config=SEARCH_CONFIG)
+        query = term_query if query is None else query & term_query
+    return query
+
+
+class ResumeFullTextSearchFilter(SearchFilter):
+    """
+    `?search=` backed by the GIN-indexed search_vector column, annotating each
+    match with `search_rank` (ts_rank over the field weights).
+
+    Falls back to DRF's icontains search over `search_fields` on SQLite or when
+    RESUME_FULL_TEXT_SEARCH is off.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not full_text_search_enabled():
+            return super().filter_queryset(request, queryset, view)
+
+        terms = [t for t in self.get_search_terms(request) if re.search(r'\w', t)]
+        if not terms:
+            return queryset
+
+        query = build_search_query(terms)
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F('search_vector'), query)
+        )
+
+
+class ResumeOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that orders full-text matches by rank when the client
+    did not ask for an explicit ordering.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        if not request.query_params.get(self.ordering_param) and 'search_rank' in queryset.query.annotations:
+            return ['-search_rank', '-timestamp']
+        return super().get_ordering(request, queryset, view)
+
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        valid = super().remove_invalid_fields(queryset, fields, view, request)
+        # search_rank only exists while a full-text search is active
+        if 'search_rank' not in queryset.query.annotations:
+            valid = [term for term in valid if term.lstrip('-') != 'search_rank']
+        return valid
+
+
+def trigram_search_enabled():
+    """True when the pg_trgm indexes from migration 0014 are available (PostgreSQL only)"""
+    return connection.vendor == 'postgresql'
+
+
+def expand_location_alias(location):
+    """Map country codes such as 'UK' or 'BD' to the country name stored in resumes"""
+    location = (location or '').strip()
+    return COUNTRY_CODE_MAPPINGS.get(location.upper(), location)
+
+
+def suggest_locations(location, limit=5):
+    """
+    "Did you mean" for locations: stored location values closest to a possibly
+    misspelled one, by trigram similarity (difflib ratio on SQLite).
+    
+    Returns:
+        list: Dicts with location, similarity (0-1) and number of resumes, best first
+    """
+    location = expand_location_alias(location)
+    if not location:
+        return []
+    
+    if trigram_search_enabled():
+        # The % operator on UPPER(location) is served by the resume_location_trgm index
+        rows = Resume.objects.annotate(
+            location_upper=Upper('location')
+        ).filter(
+            location_upper__trigram_similar=location.upper()
+        ).values('location').annotate(
+            similarity=Max(TrigramSimilarity(Upper('location'), location.upper())),
+            count=Count('id'),
+        ).order_by('-similarity', '-count')[:limit]
+        return [
+            {'location': row['location'], 'similarity': round(row['similarity'], 3), 'count': row['count']}
+            for row in rows
+        ]
+    
+    counts = Resume.objects.exclude(location='').values('location').annotate(count=Count('id'))
+    scored = []
+    for row in counts:
+        similarity = difflib.SequenceMatcher(None, location.lower(), row['location'].lower()).ratio()
+        if similarity >= 0.6:
+            scored.append({'location': row['location'], 'similarity': round(similarity, 3), 'count': row['count']})
+    scored.sort(key=lambda item: (item['similarity'], item['count']), reverse=True)
+    return scored[:limit]
+
+
+def json_array_contains(field_name, value):
+    """
+    Q for resumes whose JSON array column has `value` as an element, ignoring
+    case and surrounding whitespace. Matches the normalized key column that
+    Resume.save() keeps beside the array: jsonb containment (served by the GIN
+    indexes from migration 0019) on PostgreSQL, a match on the quoted key in
+    the JSON text elsewhere.
+    """
+    key_field = FILTER_KEY_FIELDS[field_name]
+    key = Resume.normalize_filter_key(value)
+    if connection.vendor == 'postgresql':
+        return Q(**{f'{key_field}__contains': [key]})
+    return Q(**{f'{key_field}__icontains': json.dumps(key)})
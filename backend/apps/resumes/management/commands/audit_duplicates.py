@@ -0,0 +1,264 @@
+import json
+import time
+from itertools import groupby, combinations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.resumes.models import Resume, ResumeLSHBucket
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Criterion name -> key columns; rows sharing all non-empty key values are duplicates
+KEY_CRITERIA = {
+    'file_hash': ('file_hash',),
+    'content_hash': ('content_hash',),
+    'person_soft_id': ('person_soft_id',),
+    'name_phone7': ('name_key', 'phone_last7'),
+    'name_phone4': ('name_key', 'phone_last4'),
+}
+ALL_CRITERIA = list(KEY_CRITERIA) + ['similarity']
+
+# Fields needed to pick the resume to keep in each cluster
+KEEPER_FIELDS = (
+    'id', 'first_name', 'last_name', 'original_filename', 'timestamp',
+    'file_creation_date', 'years_of_experience', 'total_experience_months',
+)
+
+
+class UnionFind:
+    """Disjoint sets over resume ids, remembering why ids were linked"""
+
+    def __init__(self):
+        self.parent = {}
+        self.reasons = {}
+
+    def find(self, item):
+        root = self.parent.setdefault(item, item)
+        while self.parent[root] != root:
+            root = self.parent[root]
+        # Path compression keeps later lookups O(1)
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, first, second, reason):
+        root1, root2 = self.find(first), self.find(second)
+        if root1 != root2:
+            self.parent[root2] = root1
+            self.reasons.setdefault(root1, set()).update(self.reasons.pop(root2, set()))
+        self.reasons.setdefault(root1, set()).add(reason)
+
+    def clusters(self):
+        groups = {}
+        for item in self.parent:
+            groups.setdefault(self.find(item), []).append(item)
+        return [(members, sorted(self.reasons.get(root, ()))) for root, members in groups.items() if len(members) > 1]
+
+
+class Command(BaseCommand):
+    help = 'Find duplicate resumes across the whole corpus and print a report or merge plan'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--criteria',
+            default=','.join(ALL_CRITERIA),
+            help=f"Comma-separated criteria to group by (default: all of {', '.join(ALL_CRITERIA)})",
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Rows fetched per database round trip (default: 5000)',
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=None,
+            help='Minimum estimated similarity for the similarity criterion (default: NEAR_DUPLICATE_THRESHOLD)',
+        )
+        parser.add_argument(
+            '--max-bucket-size',
+            type=int,
+            default=200,
+            help='Skip LSH buckets with more resumes than this (usually near-empty texts)',
+        )
+        parser.add_argument(
+            '--merge-plan',
+            action='store_true',
+            help='Include the merge plan (which resume to keep in each cluster)',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the full report as JSON to this file',
+        )
+
+    def handle(self, *args, **options):
+        criteria = [c.strip() for c in options['criteria'].split(',') if c.strip()]
+        unknown = set(criteria) - set(ALL_CRITERIA)
+        if unknown:
+            raise CommandError(f"Unknown criteria: {', '.join(sorted(unknown))}")
+
+        self.chunk_size = options['chunk_size']
+        started = time.perf_counter()
+        links = UnionFind()
+        report = {'total_resumes': Resume.objects.count(), 'criteria': {}}
+
+        for criterion in criteria:
+            criterion_started = time.perf_counter()
+            if criterion == 'similarity':
+                from django.conf import settings
+                threshold = options['threshold'] or getattr(settings, 'NEAR_DUPLICATE_THRESHOLD', 0.85)
+                groups = self.similarity_groups(threshold, options['max_bucket_size'])
+            else:
+                groups = self.key_groups(KEY_CRITERIA[criterion])
+
+            group_count = resume_count = 0
+            examples = []
+            for key, ids in groups:
+                group_count += 1
+                resume_count += len(ids)
+                if len(examples) < 20:
+                    examples.append({'key': key, 'resume_ids': [str(i) for i in ids]})
+                for other in ids[1:]:
+                    links.union(ids[0], other, criterion)
+
+            report['criteria'][criterion] = {
+                'groups': group_count,
+                'resumes': resume_count,
+                'seconds': round(time.perf_counter() - criterion_started, 2),
+                'examples': examples,
+            }
+            self.stdout.write(
+                f"{criterion:<16} {group_count:>8} groups  {resume_count:>9} resumes  "
+                f"({report['criteria'][criterion]['seconds']}s)"
+            )
+
+        clusters = links.clusters()
+        report['clusters'] = len(clusters)
+        report['duplicate_resumes'] = sum(len(members) - 1 for members, _ in clusters)
+        if options['merge_plan']:
+            report['merge_plan'] = self.build_merge_plan(clusters)
+
+        report['seconds'] = round(time.perf_counter() - started, 2)
+        self.stdout.write(self.style.SUCCESS(
+            f"\n{report['clusters']} duplicate clusters, {report['duplicate_resumes']} redundant resumes "
+            f"out of {report['total_resumes']} ({report['seconds']}s)"
+        ))
+
+        if options['merge_plan']:
+            for entry in report['merge_plan'][:50]:
+                self.stdout.write(
+                    f"KEEP {entry['keep']} ({entry['keep_name']}) REMOVE {', '.join(entry['remove'])} "
+                    f"[{', '.join(entry['reasons'])}]"
+                )
+            if len(report['merge_plan']) > 50:
+                self.stdout.write(f"... {len(report['merge_plan']) - 50} more clusters (use --output for all)")
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, default=str)
+            self.stdout.write(f"Report written to {options['output']}")
+
+    def key_groups(self, key_fields):
+        """
+        Stream (id, key...) rows ordered by the key and yield groups that share it.
+        Memory is bounded by the largest group, not the table.
+        """
+        queryset = Resume.objects.order_by(*key_fields, 'id')
+        for field in key_fields:
+            queryset = queryset.exclude(**{field: ''})
+        rows = queryset.values_list(*key_fields, 'id').iterator(chunk_size=self.chunk_size)
+
+        for key, group in groupby(rows, key=lambda row: row[:-1]):
+            ids = [row[-1] for row in group]
+            if len(ids) > 1:
+                yield ':'.join(key), ids
+
+    def similarity_groups(self, threshold, max_bucket_size):
+        """
+        Collect candidate pairs from shared LSH buckets, then confirm them by
+        comparing MinHash signatures in bulk.
+        """
+        pairs = set()
+        rows = ResumeLSHBucket.objects.order_by('bucket').values_list('bucket', 'resume_id').iterator(chunk_size=self.chunk_size)
+        skipped_buckets = 0
+        for _, group in groupby(rows, key=lambda row: row[0]):
+            ids = sorted({row[1] for row in group})
+            if len(ids) > max_bucket_size:
+                skipped_buckets += 1
+                continue
+            pairs.update(combinations(ids, 2))
+
+        if skipped_buckets:
+            self.stdout.write(self.style.WARNING(f"Skipped {skipped_buckets} LSH buckets larger than {max_bucket_size}"))
+        if not pairs:
+            return
+
+        ids = sorted({i for pair in pairs for i in pair})
+        signatures = self.load_signatures(ids)
+        pairs = [(a, b) for a, b in pairs if a in signatures and b in signatures]
+
+        for (a, b), similarity in zip(pairs, self.pair_similarities(pairs, signatures)):
+            if similarity >= threshold:
+                yield f"{similarity:.2f}", [a, b]
+
+    def load_signatures(self, ids):
+        """Load signatures for the given ids in chunks, as {id: list of ints}"""
+        signatures = {}
+        for start in range(0, len(ids), self.chunk_size):
+            chunk = ids[start:start + self.chunk_size]
+            for resume_id, signature in Resume.objects.filter(id__in=chunk).values_list('id', 'minhash_signature'):
+                if signature:
+                    signatures[resume_id] = json.loads(signature)
+        return signatures
+
+    @staticmethod
+    def pair_similarities(pairs, signatures, batch_size=100000):
+        """Estimated Jaccard similarity for each pair, vectorized with numpy when available"""
+        if np is None:
+            for a, b in pairs:
+                sig_a, sig_b = signatures[a], signatures[b]
+                yield sum(1 for x, y in zip(sig_a, sig_b) if x == y) / max(len(sig_a), 1)
+            return
+
+        index = {resume_id: i for i, resume_id in enumerate(signatures)}
+        matrix = np.array(list(signatures.values()), dtype=np.uint64)
+        for start in range(0, len(pairs), batch_size):
+            batch = pairs[start:start + batch_size]
+            left = np.fromiter((index[a] for a, _ in batch), dtype=np.int64, count=len(batch))
+            right = np.fromiter((index[b] for _, b in batch), dtype=np.int64, count=len(batch))
+            yield from (matrix[left] == matrix[right]).mean(axis=1).tolist()
+
+    def build_merge_plan(self, clusters):
+        """Pick the freshest resume in each cluster to keep; the rest are merge candidates"""
+        member_ids = [resume_id for members, _ in clusters for resume_id in members]
+        resumes = {}
+        for start in range(0, len(member_ids), self.chunk_size):
+            chunk = member_ids[start:start + self.chunk_size]
+            for values in Resume.objects.filter(id__in=chunk).values(*KEEPER_FIELDS):
+                # Unsaved instance: only used to score freshness, never saved
+                resumes[values['id']] = Resume(**values)
+
+        plan = []
+        for members, reasons in clusters:
+            ranked = sorted(
+                (resumes[m] for m in members if m in resumes),
+                key=lambda r: r.get_resume_freshness_score(),
+                reverse=True
+            )
+            if len(ranked) < 2:
+                continue
+            keeper = ranked[0]
+            plan.append({
+                'keep': str(keeper.id),
+                'keep_name': keeper.full_name,
+                'keep_filename': keeper.original_filename,
+                'remove': [str(r.id) for r in ranked[1:]],
+                'reasons': reasons,
+            })
+        plan.sort(key=lambda entry: len(entry['remove']), reverse=True)
+        return plan
@@ -0,0 +1,124 @@
+import random
+import re
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.resumes.models import Resume
+
+
+FIRST_NAMES = [
+    'james', 'mary', 'john', 'patricia', 'robert', 'jennifer', 'michael', 'linda', 'william', 'elizabeth',
+    'david', 'barbara', 'richard', 'susan', 'joseph', 'jessica', 'thomas', 'sarah', 'charles', 'karen',
+    'mohammed', 'fatima', 'rahim', 'ayesha', 'karim', 'nusrat', 'hasan', 'farhana', 'tanvir', 'sadia',
+]
+LAST_NAMES = [
+    'smith', 'johnson', 'williams', 'brown', 'jones', 'garcia', 'miller', 'davis', 'rodriguez', 'martinez',
+    'hossain', 'rahman', 'islam', 'ahmed', 'khan', 'chowdhury', 'uddin', 'alam', 'akter', 'begum',
+]
+
+
+class Command(BaseCommand):
+    help = 'Measure duplicate-person lookup latency (legacy icontains scan vs indexed match keys)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=100000,
+            help='Number of synthetic resumes to insert (default: 100000)',
+        )
+        parser.add_argument(
+            '--lookups',
+            type=int,
+            default=200,
+            help='Number of duplicate checks to time per method (default: 200)',
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the synthetic resumes instead of rolling them back',
+        )
+
+    def handle(self, *args, **options):
+        random.seed(42)
+        with transaction.atomic():
+            people = self.insert_synthetic_resumes(options['count'])
+            probes = random.sample(people, min(options['lookups'], len(people)))
+
+            legacy = self.time_lookups(self.legacy_lookup, probes)
+            indexed = self.time_lookups(Resume.find_similar_person_by_name_and_phone, probes)
+
+            self.stdout.write(f"\nDuplicate check latency over {Resume.objects.count()} resumes ({len(probes)} lookups):")
+            self.report('legacy icontains scan', legacy)
+            self.report('indexed match keys', indexed)
+
+            first_name, last_name, phone = probes[0]
+            name_key, phone_last7, phone_last4 = Resume.generate_match_keys(first_name, last_name, phone)
+            plan = Resume.objects.filter(name_key=name_key, phone_last7=phone_last7).explain()
+            self.stdout.write(f"\nQuery plan for an indexed lookup:\n{plan}")
+
+            if not options['keep']:
+                transaction.set_rollback(True)
+                self.stdout.write(self.style.SUCCESS('\nSynthetic resumes rolled back'))
+
+    def insert_synthetic_resumes(self, count):
+        """Bulk insert synthetic resumes with match keys filled in (bulk_create skips save())"""
+        self.stdout.write(f"Inserting {count} synthetic resumes...")
+        people = []
+        batch = []
+        for i in range(count):
+            first_name = random.choice(FIRST_NAMES).title()
+            last_name = f"{random.choice(LAST_NAMES).title()}{i % 500 or ''}"
+            phone = f"+8801{random.randint(100000000, 999999999)}"
+            name_key, phone_last7, phone_last4 = Resume.generate_match_keys(first_name, last_name, phone)
+            batch.append(Resume(
+                first_name=first_name,
+                last_name=last_name,
+                phone_number=phone,
+                cv_hash=uuid.uuid4().hex,
+                person_soft_id=uuid.uuid4().hex[:16],
+                name_key=name_key,
+                phone_last7=phone_last7,
+                phone_last4=phone_last4,
+                processing_status='completed',
+            ))
+            people.append((first_name, last_name, phone))
+            if len(batch) >= 5000:
+                Resume.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Resume.objects.bulk_create(batch)
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE {Resume._meta.db_table}')
+        return people
+
+    @staticmethod
+    def legacy_lookup(first_name, last_name, phone_number):
+        """The pre-index implementation: icontains on both names, phones compared in Python"""
+        clean_first = re.sub(r'^(mr|ms|mrs|dr|prof)\.?', '', re.sub(r'\s+', '', first_name.lower().strip()))
+        clean_last = re.sub(r'^(mr|ms|mrs|dr|prof)\.?', '', re.sub(r'\s+', '', last_name.lower().strip()))
+        name_matches = Resume.objects.filter(first_name__icontains=clean_first, last_name__icontains=clean_last)
+        return [r for r in name_matches if Resume.are_phones_similar(phone_number, r.phone_number)]
+
+    @staticmethod
+    def time_lookups(lookup, probes):
+        timings = []
+        for first_name, last_name, phone in probes:
+            started = time.perf_counter()
+            lookup(first_name, last_name, phone)
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+    def report(self, label, timings):
+        timings = sorted(timings)
+        p95 = timings[int(len(timings) * 0.95) - 1] if len(timings) > 1 else timings[0]
+        self.stdout.write(
+            f"  {label:<24} mean {statistics.mean(timings):8.2f} ms   "
+            f"p50 {statistics.median(timings):8.2f} ms   p95 {p95:8.2f} ms"
+        )
@@ -0,0 +1,140 @@
+import operator
+import random
+import statistics
+import time
+import uuid
+from functools import reduce
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from apps.resumes.filters import build_search_query, full_text_search_enabled
+from apps.resumes.models import Resume
+from apps.resumes.views import ResumeViewSet
+
+
+SKILLS = [
+    'python', 'django', 'java', 'spring', 'react', 'angular', 'sql', 'postgresql', 'aws', 'azure',
+    'docker', 'kubernetes', 'excel', 'sap', 'autocad', 'gis', 'matlab', 'tableau', 'accounting', 'procurement',
+]
+EXPERTISE = [
+    'Water Resources', 'Public Health', 'Monitoring and Evaluation', 'Software Engineering', 'Finance',
+    'Energy', 'Transport', 'Agriculture', 'Education', 'Procurement',
+]
+COUNTRIES = ['Bangladesh', 'Kenya', 'India', 'Nepal', 'Ghana', 'Vietnam', 'Peru', 'Jordan', 'Uganda', 'Pakistan']
+EMPLOYERS = ['World Bank', 'UNDP', 'Acme Consulting', 'BRAC', 'GIZ', 'Oxfam', 'Deloitte', 'Mott MacDonald']
+NAMES = ['james', 'mary', 'rahim', 'fatima', 'john', 'ayesha', 'david', 'nusrat', 'hasan', 'sarah']
+
+DEFAULT_QUERIES = ['python', 'public health', 'kenya procurement', 'world bank', 'rahim', 'kubernetes aws']
+
+
+class Command(BaseCommand):
+    help = 'Measure resume list search latency (SearchFilter icontains vs tsvector full-text search)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='10000,100000',
+            help='Comma-separated table sizes to measure at (default: 10000,100000)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Timed runs per query and method (default: 5)',
+        )
+        parser.add_argument(
+            '--query',
+            action='append',
+            dest='queries',
+            help='Search text to time (repeatable; default: a fixed mix of skills, names and places)',
+        )
+
+    def handle(self, *args, **options):
+        random.seed(42)
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        queries = options['queries'] or DEFAULT_QUERIES
+        if not full_text_search_enabled():
+            self.stdout.write(self.style.WARNING('Full-text search needs PostgreSQL; timing the icontains search only'))
+
+        with transaction.atomic():
+            for size in sizes:
+                missing = size - Resume.objects.count()
+                if missing > 0:
+                    self.insert_synthetic_resumes(missing)
+
+                self.stdout.write(f"\nSearch latency over {Resume.objects.count()} resumes (count + first page):")
+                for text in queries:
+                    legacy = self.time_search(self.legacy_queryset, text, options['repeat'])
+                    line = f"  {text!r:<22} icontains {statistics.median(legacy):9.2f} ms"
+                    if full_text_search_enabled():
+                        ranked = self.time_search(self.full_text_queryset, text, options['repeat'])
+                        line += f"   full-text {statistics.median(ranked):9.2f} ms"
+                    self.stdout.write(line)
+
+            if full_text_search_enabled():
+                plan = self.full_text_queryset(queries[0]).explain()
+                self.stdout.write(f"\nQuery plan for {queries[0]!r}:\n{plan}")
+
+            transaction.set_rollback(True)
+            self.stdout.write(self.style.SUCCESS('\nSynthetic resumes rolled back'))
+
+    def insert_synthetic_resumes(self, count):
+        """Bulk insert synthetic resumes (the search_vector trigger fills the vectors, bulk_create skips save())"""
+        self.stdout.write(f"Inserting {count} synthetic resumes...")
+        batch = []
+        for i in range(count):
+            resume = Resume(
+                first_name=random.choice(NAMES).title(),
+                last_name=f"Test{i}",
+                email=f"candidate{uuid.uuid4().hex[:10]}@example.com",
+                location=random.choice(COUNTRIES),
+                current_employer=random.choice(EMPLOYERS),
+                skill_keywords=random.sample(SKILLS, 6),
+                expertise_areas=random.sample(EXPERTISE, 2),
+                sectors=random.sample(EXPERTISE, 2),
+                cv_hash=uuid.uuid4().hex,
+                person_soft_id=uuid.uuid4().hex[:16],
+                processing_status='completed',
+            )
+            resume.update_filter_keys()
+            batch.append(resume)
+            if len(batch) >= 5000:
+                Resume.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Resume.objects.bulk_create(batch)
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE {Resume._meta.db_table}')
+
+    @staticmethod
+    def legacy_queryset(text):
+        """What DRF's SearchFilter builds: every term must match, OR'ed icontains across search_fields"""
+        fields = ResumeViewSet.search_fields
+        queryset = Resume.objects.all()
+        for term in text.split():
+            queryset = queryset.filter(reduce(operator.or_, (Q(**{f"{field}__icontains": term}) for field in fields)))
+        return queryset.order_by('-timestamp')
+
+    @staticmethod
+    def full_text_queryset(text):
+        from django.contrib.postgres.search import SearchRank
+        from django.db.models import F
+        query = build_search_query(text.split())
+        return Resume.objects.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F('search_vector'), query)
+        ).order_by('-search_rank', '-timestamp')
+
+    @staticmethod
+    def time_search(build_queryset, text, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            queryset = build_queryset(text)
+            queryset.count()
+            list(queryset[:10])
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
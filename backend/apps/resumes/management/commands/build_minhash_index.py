@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.core.files.storage import default_storage
+from apps.resumes.models import FILTER_KEY_FIELDS, Resume
+from apps.resumes.similarity import minhash_signature
+from apps.ai_parser.services import ResumeParsingService
+
+
+# Fields Resume.save() reads to refresh its derived keys; deferring any of them
+# costs a query per row
+SAVE_INPUT_FIELDS = (
+    'person_soft_id', 'cv_hash', 'timestamp', 'first_name', 'last_name', 'phone_number', *FILTER_KEY_FIELDS,
+)
+
+
+class Command(BaseCommand):
+    help = 'Compute MinHash signatures and LSH buckets for resumes uploaded before near-duplicate detection'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Recompute every resume, not only those without a signature',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Rows fetched per database round trip (default: 500)',
+        )
+
+    def handle(self, *args, **options):
+        resumes = Resume.objects.exclude(file_path='').only('id', 'file_path', 'minhash_signature', *SAVE_INPUT_FIELDS)
+        if not options['all']:
+            resumes = resumes.filter(minhash_signature='')
+
+        total = resumes.count()
+        self.stdout.write(f"Building MinHash signatures for {total} resumes...")
+
+        parsing_service = ResumeParsingService()
+        updated = skipped = failed = 0
+
+        for i, resume in enumerate(resumes.iterator(chunk_size=options['chunk_size']), 1):
+            if not default_storage.exists(resume.file_path):
+                skipped += 1
+                continue
+            try:
+                resume_text = parsing_service.extract_text(resume.file_path)
+                resume.set_minhash_signature(minhash_signature(resume_text))
+                resume.save(update_fields=['minhash_signature'])
+                updated += 1
+            except Exception as e:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f"[{i}/{total}] {resume.id}: {e}"))
+
+            if i % 100 == 0:
+                self.stdout.write(f"[{i}/{total}] processed")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {updated} updated, {skipped} skipped (file missing), {failed} failed"
+        ))
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0007_remove_resume_expertise_experience'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='extraction_tier',
+            field=models.CharField(blank=True, help_text='Extraction tier that produced the text (pypdf, pdfminer, python-docx, plain, unstructured, ocr)', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='extraction_report',
+            field=models.TextField(blank=True, help_text='JSON object with quality score and per-tier timings of the last extraction'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0008_resume_extraction_tier_resume_extraction_report'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='file_hash',
+            field=models.CharField(blank=True, db_index=True, help_text='SHA-256 of the uploaded file bytes to detect exact re-uploads', max_length=64),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:40
+
+import re
+
+from django.db import migrations, models
+
+
+BATCH_SIZE = 2000
+
+
+def normalize_name_part(name):
+    # Same normalization as Resume.normalize_name_part at the time of this migration
+    if not name:
+        return ''
+    clean = re.sub(r'\s+', '', name.lower().strip())
+    return re.sub(r'^(mr|ms|mrs|dr|prof)\.?', '', clean)
+
+
+def backfill_match_keys(apps, schema_editor):
+    Resume = apps.get_model('resumes', 'Resume')
+
+    batch = []
+    queryset = Resume.objects.only('id', 'first_name', 'last_name', 'phone_number').order_by('pk')
+    for resume in queryset.iterator(chunk_size=BATCH_SIZE):
+        clean_first = normalize_name_part(resume.first_name)
+        clean_last = normalize_name_part(resume.last_name)
+        resume.name_key = f"{clean_first}:{clean_last}"[:200] if clean_first and clean_last else ''
+
+        digits = ''.join(filter(str.isdigit, resume.phone_number or ''))
+        resume.phone_last7 = digits[-7:] if len(digits) >= 7 else ''
+        resume.phone_last4 = digits[-4:] if len(digits) >= 7 else ''
+
+        batch.append(resume)
+        if len(batch) >= BATCH_SIZE:
+            Resume.objects.bulk_update(batch, ['name_key', 'phone_last7', 'phone_last4'])
+            batch = []
+
+    if batch:
+        Resume.objects.bulk_update(batch, ['name_key', 'phone_last7', 'phone_last4'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0009_resume_file_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='name_key',
+            field=models.CharField(blank=True, help_text="Normalized 'first:last' name used to block near-duplicate person lookups", max_length=200),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='phone_last7',
+            field=models.CharField(blank=True, help_text='Last 7 digits of the phone number', max_length=7),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='phone_last4',
+            field=models.CharField(blank=True, help_text='Last 4 digits of the phone number', max_length=4),
+        ),
+        migrations.RunPython(backfill_match_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['name_key', 'phone_last7'], name='resume_name_phone7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['name_key', 'phone_last4'], name='resume_name_phone4_idx'),
+        ),
+    ]
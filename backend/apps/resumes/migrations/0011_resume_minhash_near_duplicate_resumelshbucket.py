@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0010_resume_name_key_phone_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='minhash_signature',
+            field=models.TextField(blank=True, help_text='JSON array with the MinHash signature of the resume text'),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='near_duplicate_of',
+            field=models.ForeignKey(blank=True, help_text='Existing resume whose text was nearly identical at upload', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='near_duplicates', to='resumes.resume'),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='near_duplicate_similarity',
+            field=models.FloatField(blank=True, help_text='Estimated Jaccard similarity to near_duplicate_of', null=True),
+        ),
+        migrations.CreateModel(
+            name='ResumeLSHBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.CharField(db_index=True, help_text="'<band>:<hash of the band rows>'", max_length=20)),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_buckets', to='resumes.resume')),
+            ],
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:45
+
+from datetime import datetime, timezone
+
+from django.db import migrations, models
+
+
+BATCH_SIZE = 2000
+
+
+def freshness_score(resume, now):
+    # Same formula as compute_freshness_score at the time of this migration
+    score = 0
+    if resume.file_creation_date:
+        days_old = (now - resume.file_creation_date.replace(tzinfo=timezone.utc)).days
+        score += max(0, 10000 - days_old)
+    if resume.timestamp:
+        score += max(0, 5000 - (now - resume.timestamp).days)
+    if resume.years_of_experience:
+        score += min(resume.years_of_experience * 10, 1000)
+    if resume.total_experience_months:
+        score += min(resume.total_experience_months, 500)
+    return score
+
+
+def backfill_freshness_scores(apps, schema_editor):
+    Resume = apps.get_model('resumes', 'Resume')
+    now = datetime.now(timezone.utc)
+
+    batch = []
+    queryset = Resume.objects.only(
+        'id', 'file_creation_date', 'timestamp', 'years_of_experience', 'total_experience_months'
+    ).order_by('pk')
+    for resume in queryset.iterator(chunk_size=BATCH_SIZE):
+        resume.freshness_score = freshness_score(resume, now)
+        batch.append(resume)
+        if len(batch) >= BATCH_SIZE:
+            Resume.objects.bulk_update(batch, ['freshness_score'])
+            batch = []
+
+    if batch:
+        Resume.objects.bulk_update(batch, ['freshness_score'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0011_resume_minhash_near_duplicate_resumelshbucket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='freshness_score',
+            field=models.IntegerField(db_index=True, default=0, help_text='Stored get_resume_freshness_score(); updated on save and refreshed daily for date decay'),
+        ),
+        migrations.RunPython(backfill_freshness_scores, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['person_soft_id', '-freshness_score'], name='resume_person_freshness_idx'),
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:10
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# Weight A ranks highest. The 'simple' configuration (no stemming, no stop
+# words) keeps names, emails and skill tokens such as "c++" or "sql" intact;
+# ResumeFullTextSearchFilter queries with the same configuration.
+SEARCH_VECTOR_EXPRESSION = """
+    setweight(to_tsvector('simple', coalesce(NEW.first_name, '') || ' ' || coalesce(NEW.last_name, '') || ' ' || coalesce(NEW.email, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(NEW.skill_keywords, '') || ' ' || coalesce(NEW.expertise_areas, '') || ' ' || coalesce(NEW.current_employer, '')), 'B') ||
+    setweight(to_tsvector('simple',
+        coalesce(NEW.location, '') || ' ' || coalesce(NEW.sectors, '') || ' ' || coalesce(NEW.languages_spoken, '') || ' ' ||
+        coalesce(NEW.professional_certifications, '') || ' ' || coalesce(NEW.professional_associations, '') || ' ' ||
+        coalesce(NEW.phone_number, '') || ' ' || coalesce(NEW.availability, '') || ' ' ||
+        coalesce(NEW.preferred_contract_type, '') || ' ' || coalesce(NEW.preferred_work_arrangement, '')), 'C') ||
+    setweight(to_tsvector('simple',
+        coalesce(NEW.publications, '') || ' ' || coalesce(NEW."references", '') || ' ' || coalesce(NEW.notes, '') || ' ' ||
+        coalesce(NEW.linkedin_profile, '') || ' ' || coalesce(NEW.website_portfolio, '')), 'D')
+"""
+
+CREATE_TRIGGER_SQL = f"""
+CREATE OR REPLACE FUNCTION resumes_resume_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := {SEARCH_VECTOR_EXPRESSION};
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS resumes_resume_search_vector_trigger ON resumes_resume;
+CREATE TRIGGER resumes_resume_search_vector_trigger
+    BEFORE INSERT OR UPDATE ON resumes_resume
+    FOR EACH ROW EXECUTE FUNCTION resumes_resume_search_vector_update();
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS resumes_resume_search_vector_trigger ON resumes_resume;
+DROP FUNCTION IF EXISTS resumes_resume_search_vector_update();
+DROP INDEX IF EXISTS resume_search_vector_gin;
+"""
+
+# Fill existing rows in one statement, before the trigger exists so each row is computed once
+BACKFILL_SQL = f"""
+UPDATE resumes_resume SET search_vector = {SEARCH_VECTOR_EXPRESSION.replace('NEW.', '')};
+"""
+
+CREATE_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS resume_search_vector_gin ON resumes_resume USING gin (search_vector);
+"""
+
+
+def create_search_trigger(apps, schema_editor):
+    # SQLite (development) has no tsvector support: the column stays NULL and
+    # ResumeFullTextSearchFilter falls back to icontains matching
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(BACKFILL_SQL)
+    schema_editor.execute(CREATE_TRIGGER_SQL)
+    schema_editor.execute(CREATE_INDEX_SQL)
+
+
+def drop_search_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(DROP_TRIGGER_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0012_resume_freshness_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Weighted tsvector over the searchable fields', null=True),
+        ),
+        migrations.RunPython(create_search_trigger, drop_search_trigger),
+    ]
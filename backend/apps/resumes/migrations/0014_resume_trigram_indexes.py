@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:40
+
+from django.db import migrations
+
+
+# Indexed on UPPER(column): Django compiles icontains to UPPER(column::text) LIKE UPPER(...)
+# on PostgreSQL, so the existing icontains filters use these indexes as well as the
+# trigram similarity lookups in apps.resumes.filters.
+TRIGRAM_COLUMNS = ['location', 'first_name', 'last_name', 'current_employer']
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # SQLite (development) has no pg_trgm: the filters fall back to difflib
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS resume_{column}_trgm '
+            f'ON resumes_resume USING gin (UPPER({column}) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS resume_{column}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0013_resume_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0014_resume_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['-timestamp', '-id'], name='resume_timestamp_id_idx'),
+        ),
+    ]
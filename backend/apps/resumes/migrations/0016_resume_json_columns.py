@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:40
+
+from django.db import migrations, models
+
+
+# Step 1 of the TextField -> JSONField conversion: add nullable jsonb columns
+# next to the legacy text columns. 0017 fills them, 0018 swaps them in.
+JSON_COLUMNS = [
+    'expertise_areas', 'expertise_details', 'sectors', 'skill_keywords', 'languages_spoken',
+    'professional_certifications', 'professional_associations', 'publications',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0015_resume_timestamp_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name=f'{field}_json',
+            field=models.JSONField(blank=True, null=True),
+        )
+        for field in JSON_COLUMNS
+    ]
@@ -0,0 +1,113 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:41
+
+import json
+import logging
+import re
+
+from django.db import migrations, transaction
+
+logger = logging.getLogger(__name__)
+
+
+BATCH_SIZE = 1000
+
+# Legacy column -> type of its decoded value
+JSON_COLUMNS = {
+    'expertise_areas': list,
+    'expertise_details': dict,
+    'sectors': list,
+    'skill_keywords': list,
+    'languages_spoken': list,
+    'professional_certifications': list,
+    'professional_associations': list,
+    'publications': list,
+}
+
+
+def decode_legacy_value(raw, kind):
+    """
+    Decode one legacy TextField value.
+
+    Malformed values are salvaged rather than dropped: a plain "a, b; c" string
+    becomes ['a', 'b', 'c'], a scalar becomes a one-element list, and anything
+    that is not an object for expertise_details becomes {}.
+
+    Returns:
+        tuple: (value, True if the text was valid JSON)
+    """
+    if raw is None or not str(raw).strip():
+        return kind(), True
+    try:
+        value = json.loads(raw)
+        valid = True
+    except (TypeError, ValueError):
+        if kind is list:
+            return [part.strip() for part in re.split(r'[,;\n]', raw) if part.strip()], False
+        return kind(), False
+
+    if kind is dict:
+        return (value, valid) if isinstance(value, dict) else ({}, False)
+    if isinstance(value, list):
+        return value, valid
+    if isinstance(value, dict):
+        return list(value.keys()), False
+    return ([value] if value not in ('', None) else []), False
+
+
+def copy_to_json_columns(apps, schema_editor):
+    """
+    Fill the *_json columns in batches that commit on their own. Rows already
+    copied are skipped, so an interrupted run resumes where it stopped.
+    """
+    Resume = apps.get_model('resumes', 'Resume')
+    legacy_fields = list(JSON_COLUMNS)
+    json_fields = [f'{field}_json' for field in legacy_fields]
+
+    # Every copied row has a non-NULL expertise_areas_json (at least [])
+    pending = Resume.objects.filter(expertise_areas_json__isnull=True).order_by('pk')
+    copied = malformed = 0
+    last_pk = None
+    while True:
+        batch_queryset = pending if last_pk is None else pending.filter(pk__gt=last_pk)
+        rows = list(batch_queryset.values_list('pk', *legacy_fields)[:BATCH_SIZE])
+        if not rows:
+            break
+
+        batch = []
+        for pk, *raw_values in rows:
+            resume = Resume(pk=pk)
+            for field, raw in zip(legacy_fields, raw_values):
+                value, valid = decode_legacy_value(raw, JSON_COLUMNS[field])
+                if not valid:
+                    malformed += 1
+                    logger.warning(f"Resume {pk}: salvaged malformed {field} value {str(raw)[:80]!r}")
+                setattr(resume, f'{field}_json', value)
+            batch.append(resume)
+
+        with transaction.atomic(using=schema_editor.connection.alias):
+            Resume.objects.bulk_update(batch, json_fields)
+        copied += len(batch)
+        last_pk = rows[-1][0]
+
+    if copied:
+        logger.info(f"Copied JSON columns of {copied} resumes ({malformed} malformed values salvaged)")
+
+
+def clear_json_columns(apps, schema_editor):
+    Resume = apps.get_model('resumes', 'Resume')
+    Resume.objects.update(**{f'{field}_json': None for field in JSON_COLUMNS})
+
+
+class Migration(migrations.Migration):
+
+    # Each batch commits on its own: a failed or interrupted copy is resumed by
+    # running migrate again instead of starting over
+    atomic = False
+
+    dependencies = [
+        ('resumes', '0016_resume_json_columns'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_to_json_columns, clear_json_columns),
+    ]
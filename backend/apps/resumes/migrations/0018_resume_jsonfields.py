@@ -0,0 +1,136 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:42
+
+import json
+from importlib import import_module
+
+from django.db import migrations, models
+
+
+BATCH_SIZE = 1000
+
+# Column -> empty value; expertise_details is an object, the rest are arrays
+JSON_COLUMNS = {
+    'expertise_areas': list,
+    'expertise_details': dict,
+    'sectors': list,
+    'skill_keywords': list,
+    'languages_spoken': list,
+    'professional_certifications': list,
+    'professional_associations': list,
+    'publications': list,
+}
+
+HELP_TEXTS = {
+    'expertise_areas': 'List of expertise areas',
+    'expertise_details': 'Object mapping expertise areas to detailed information from resume',
+    'sectors': 'List of industry sectors',
+    'skill_keywords': 'List of skill keywords',
+    'languages_spoken': 'List of languages',
+    'professional_certifications': 'List of certifications',
+    'professional_associations': 'List of associations',
+    'publications': 'List of publications',
+}
+
+# Array columns with GIN (jsonb_path_ops) indexes for the __contains filters
+GIN_COLUMNS = ['expertise_areas', 'sectors', 'skill_keywords']
+
+
+def copy_remaining_rows(apps, schema_editor):
+    # Rows written by the running application since 0017 finished
+    copy_migration = import_module('apps.resumes.migrations.0017_copy_json_columns')
+    copy_migration.copy_to_json_columns(apps, schema_editor)
+
+
+def copy_to_text_columns(apps, schema_editor):
+    Resume = apps.get_model('resumes', 'Resume')
+    legacy_fields = list(JSON_COLUMNS)
+    batch = []
+    queryset = Resume.objects.only('pk', *[f'{field}_json' for field in legacy_fields]).order_by('pk')
+    for resume in queryset.iterator(chunk_size=BATCH_SIZE):
+        for field in legacy_fields:
+            value = getattr(resume, f'{field}_json')
+            setattr(resume, field, json.dumps(value) if value else '')
+        batch.append(resume)
+        if len(batch) >= BATCH_SIZE:
+            Resume.objects.bulk_update(batch, legacy_fields)
+            batch = []
+    if batch:
+        Resume.objects.bulk_update(batch, legacy_fields)
+
+
+# The search_vector trigger from 0013 concatenates the columns as text; jsonb needs a cast
+SEARCH_VECTOR_EXPRESSION = """
+    setweight(to_tsvector('simple', coalesce(NEW.first_name, '') || ' ' || coalesce(NEW.last_name, '') || ' ' || coalesce(NEW.email, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(NEW.skill_keywords::text, '') || ' ' || coalesce(NEW.expertise_areas::text, '') || ' ' || coalesce(NEW.current_employer, '')), 'B') ||
+    setweight(to_tsvector('simple',
+        coalesce(NEW.location, '') || ' ' || coalesce(NEW.sectors::text, '') || ' ' || coalesce(NEW.languages_spoken::text, '') || ' ' ||
+        coalesce(NEW.professional_certifications::text, '') || ' ' || coalesce(NEW.professional_associations::text, '') || ' ' ||
+        coalesce(NEW.phone_number, '') || ' ' || coalesce(NEW.availability, '') || ' ' ||
+        coalesce(NEW.preferred_contract_type, '') || ' ' || coalesce(NEW.preferred_work_arrangement, '')), 'C') ||
+    setweight(to_tsvector('simple',
+        coalesce(NEW.publications::text, '') || ' ' || coalesce(NEW."references", '') || ' ' || coalesce(NEW.notes, '') || ' ' ||
+        coalesce(NEW.linkedin_profile, '') || ' ' || coalesce(NEW.website_portfolio, '')), 'D')
+"""
+
+LEGACY_SEARCH_VECTOR_EXPRESSION = SEARCH_VECTOR_EXPRESSION.replace('::text', '')
+
+
+def replace_search_vector_function(expression):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        schema_editor.execute(f"""
+            CREATE OR REPLACE FUNCTION resumes_resume_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {expression};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql;
+        """)
+    return operation
+
+
+def create_gin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in GIN_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS resume_{column}_gin '
+            f'ON resumes_resume USING gin ({column} jsonb_path_ops)'
+        )
+
+
+def drop_gin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in GIN_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS resume_{column}_gin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0017_copy_json_columns'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_remaining_rows, copy_to_text_columns),
+        *[migrations.RemoveField(model_name='resume', name=field) for field in JSON_COLUMNS],
+        *[
+            migrations.RenameField(model_name='resume', old_name=f'{field}_json', new_name=field)
+            for field in JSON_COLUMNS
+        ],
+        migrations.RunPython(
+            replace_search_vector_function(SEARCH_VECTOR_EXPRESSION),
+            replace_search_vector_function(LEGACY_SEARCH_VECTOR_EXPRESSION),
+        ),
+        *[
+            migrations.AlterField(
+                model_name='resume',
+                name=field,
+                field=models.JSONField(blank=True, default=kind, help_text=HELP_TEXTS[field]),
+            )
+            for field, kind in JSON_COLUMNS.items()
+        ],
+        migrations.RunPython(create_gin_indexes, drop_gin_indexes),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 4.2.7 on 2026-10-19 18:05
+
+from django.db import migrations, models
+
+
+BATCH_SIZE = 1000
+
+# Array column -> lower-cased key column matched by the element filters
+FILTER_KEY_FIELDS = {
+    'expertise_areas': 'expertise_keys',
+    'sectors': 'sector_keys',
+    'skill_keywords': 'skill_keys',
+}
+
+HELP_TEXTS = {
+    'expertise_keys': 'Lower-cased expertise areas',
+    'sector_keys': 'Lower-cased sectors',
+    'skill_keys': 'Lower-cased skill keywords',
+}
+
+
+def generate_filter_keys(values):
+    # Same normalization as Resume.generate_filter_keys at the time of this migration
+    if not isinstance(values, list):
+        return []
+    keys = (' '.join(value.split()).casefold() for value in values if isinstance(value, str))
+    return list(dict.fromkeys(key for key in keys if key))
+
+
+def backfill_filter_keys(apps, schema_editor):
+    Resume = apps.get_model('resumes', 'Resume')
+    key_fields = list(FILTER_KEY_FIELDS.values())
+    batch = []
+    queryset = Resume.objects.only('pk', *FILTER_KEY_FIELDS).order_by('pk')
+    for resume in queryset.iterator(chunk_size=BATCH_SIZE):
+        for field, key_field in FILTER_KEY_FIELDS.items():
+            setattr(resume, key_field, generate_filter_keys(getattr(resume, field)))
+        batch.append(resume)
+        if len(batch) >= BATCH_SIZE:
+            Resume.objects.bulk_update(batch, key_fields)
+            batch = []
+    if batch:
+        Resume.objects.bulk_update(batch, key_fields)
+
+
+def move_gin_indexes(from_columns, to_columns):
+    # 0018 indexed the arrays themselves; the filters now match the key columns
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for column in from_columns:
+            schema_editor.execute(f'DROP INDEX IF EXISTS resume_{column}_gin')
+        for column in to_columns:
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS resume_{column}_gin '
+                f'ON resumes_resume USING gin ({column} jsonb_path_ops)'
+            )
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0018_resume_jsonfields'),
+    ]
+
+    operations = [
+        *[
+            migrations.AddField(
+                model_name='resume',
+                name=key_field,
+                field=models.JSONField(blank=True, default=list, editable=False, help_text=HELP_TEXTS[key_field]),
+            )
+            for key_field in FILTER_KEY_FIELDS.values()
+        ],
+        migrations.RunPython(backfill_filter_keys, migrations.RunPython.noop),
+        migrations.RunPython(
+            move_gin_indexes(list(FILTER_KEY_FIELDS), list(FILTER_KEY_FIELDS.values())),
+            move_gin_indexes(list(FILTER_KEY_FIELDS.values()), list(FILTER_KEY_FIELDS)),
+        ),
+    ]
@@ -1,13 +1,129 @@
 from django.db import models
+from django.contrib.postgres.search import SearchVectorField
 from django.utils import timezone
 import hashlib
 import uuid
 import json
 import os
 import re
+import threading
+from collections import Counter
 from datetime import date
+from django.conf import settings
 from django.core.files.storage import default_storage
 
+from .similarity import minhash_signature, estimate_similarity, band_buckets
+
+
+def compute_freshness_score(file_creation_date, timestamp, years_of_experience, total_experience_months, now=None):
+    """
+    Freshness score of a resume from its dates and experience. Higher = more recent.
+    
+    Shared by Resume.get_resume_freshness_score and the bulk refresh of the
+    stored freshness_score column, so both always agree. FRESHNESS_SCORE_SQL
+    is the same formula for the set-based refresh on PostgreSQL.
+    """
+    from datetime import datetime, timezone
+    if now is None:
+        now = datetime.now(timezone.utc)
+    score = 0
+    
+    # File creation date gets highest priority (if available)
+    if file_creation_date:
+        # More recent files get higher scores
+        days_old = (now - file_creation_date.replace(tzinfo=timezone.utc)).days
+        score += max(0, 10000 - days_old)  # Up to 10000 points for very recent files
+    
+    # Upload timestamp as secondary factor
+    if timestamp:
+        upload_days_old = (now - timestamp).days
+        score += max(0, 5000 - upload_days_old)  # Up to 5000 points for recent uploads
+    
+    # Years of experience as tie-breaker (more experience might indicate more recent resume)
+    if years_of_experience:
+        score += min(years_of_experience * 10, 1000)  # Up to 1000 points for experience
+    
+    # Total experience months for finer granularity
+    if total_experience_months:
+        score += min(total_experience_months, 500)  # Up to 500 points
+    
+    return score
+
+
+# compute_freshness_score as a PostgreSQL expression over a resumes_resume row;
+# both parameters are `now`. FLOOR over the epoch matches timedelta.days.
+FRESHNESS_SCORE_SQL = """
+    COALESCE(GREATEST(0, 10000 - FLOOR(EXTRACT(EPOCH FROM (%s - file_creation_date)) / 86400)), 0)
+    + COALESCE(GREATEST(0, 5000 - FLOOR(EXTRACT(EPOCH FROM (%s - "timestamp")) / 86400)), 0)
+    + COALESCE(LEAST(years_of_experience * 10, 1000), 0)
+    + COALESCE(LEAST(total_experience_months, 500), 0)
+"""
+
+
+# Per-thread count of Resume JSON column decodes, collected while a profile is
+# active (see apps.core.middleware.JSONDecodeProfileMiddleware)
+_json_decode_profile = threading.local()
+
+
+def start_json_decode_profile():
+    """Start counting JSON column decodes on this thread"""
+    _json_decode_profile.counts = Counter()
+
+
+def stop_json_decode_profile():
+    """Stop counting and return the decode counts per field"""
+    counts = getattr(_json_decode_profile, 'counts', None)
+    _json_decode_profile.counts = None
+    return counts or Counter()
+
+
+def count_json_decode(field_name):
+    counts = getattr(_json_decode_profile, 'counts', None)
+    if counts is not None:
+        counts[field_name] += 1
+
+
+def copy_json_value(value):
+    """Deep copy of a decoded JSON value; only its lists and dicts are mutable"""
+    if isinstance(value, list):
+        return [copy_json_value(item) if isinstance(item, (list, dict)) else item for item in value]
+    if isinstance(value, dict):
+        return {key: copy_json_value(item) if isinstance(item, (list, dict)) else item for key, item in value.items()}
+    return value
+
+
+# Fields compute_freshness_score depends on
+FRESHNESS_INPUT_FIELDS = ('file_creation_date', 'timestamp', 'years_of_experience', 'total_experience_months')
+
+# Fields Resume.generate_match_keys depends on, and the blocking keys it produces
+MATCH_KEY_INPUT_FIELDS = ('first_name', 'last_name', 'phone_number')
+MATCH_KEY_FIELDS = ('name_key', 'phone_last7', 'phone_last4')
+
+# JSON array columns filtered by element -> column holding their lower-cased match keys
+FILTER_KEY_FIELDS = {
+    'expertise_areas': 'expertise_keys',
+    'sectors': 'sector_keys',
+    'skill_keywords': 'skill_keys',
+}
+
+
+class ResumeQuerySet(models.QuerySet):
+    """Resume queries that rank by the stored freshness score"""
+    
+    def by_freshness(self):
+        """Freshest resumes first"""
+        return self.order_by('-freshness_score', '-timestamp')
+    
+    def latest_per_person(self):
+        """
+        Keep only the freshest resume of each person (by person_soft_id).
+        Resumes without a person_soft_id are always kept.
+        """
+        freshest = Resume.objects.filter(
+            person_soft_id=models.OuterRef('person_soft_id')
+        ).order_by('-freshness_score', '-timestamp', '-id').values('id')[:1]
+        return self.filter(models.Q(person_soft_id='') | models.Q(id=models.Subquery(freshest)))
+
 
 class Resume(models.Model):
     """
@@ -20,8 +136,16 @@ class Resume(models.Model):
     
     # Duplicate Detection Fields
     content_hash = models.CharField(max_length=64, blank=True, db_index=True, help_text="Hash of resume content to detect identical files")
+    file_hash = models.CharField(max_length=64, blank=True, db_index=True, help_text="SHA-256 of the uploaded file bytes to detect exact re-uploads")
     person_soft_id = models.CharField(max_length=64, blank=True, db_index=True, help_text="Soft identifier for person (name+details based)")
     file_creation_date = models.DateTimeField(null=True, blank=True, help_text="File modification date from metadata (when file was last changed)")
+    name_key = models.CharField(max_length=200, blank=True, help_text="Normalized 'first:last' name used to block near-duplicate person lookups")
+    phone_last7 = models.CharField(max_length=7, blank=True, help_text="Last 7 digits of the phone number")
+    phone_last4 = models.CharField(max_length=4, blank=True, help_text="Last 4 digits of the phone number")
+    minhash_signature = models.TextField(blank=True, help_text="JSON array with the MinHash signature of the resume text")
+    near_duplicate_of = models.ForeignKey('self', null=True, blank=True, on_delete=models.SET_NULL, related_name='near_duplicates', help_text="Existing resume whose text was nearly identical at upload")
+    near_duplicate_similarity = models.FloatField(null=True, blank=True, help_text="Estimated Jaccard similarity to near_duplicate_of")
+    freshness_score = models.IntegerField(default=0, db_index=True, help_text="Stored get_resume_freshness_score(); updated on save and refreshed daily for date decay")
     
     # Personal Information
     first_name = models.CharField(max_length=100, blank=True)
@@ -39,25 +163,30 @@ class Resume(models.Model):
     preferred_contract_type = models.CharField(max_length=100, blank=True)
     preferred_work_arrangement = models.CharField(max_length=100, blank=True)
     
-    # Skills and Expertise (stored as JSON text fields)
-    expertise_areas = models.TextField(blank=True, help_text="JSON array of expertise areas")
-    expertise_details = models.TextField(blank=True, help_text="JSON object mapping expertise areas to detailed information from resume")
-    sectors = models.TextField(blank=True, help_text="JSON array of industry sectors")
-    skill_keywords = models.TextField(blank=True, help_text="JSON array of skill keywords")
+    # Skills and Expertise (jsonb on PostgreSQL)
+    expertise_areas = models.JSONField(default=list, blank=True, help_text="List of expertise areas")
+    expertise_details = models.JSONField(default=dict, blank=True, help_text="Object mapping expertise areas to detailed information from resume")
+    sectors = models.JSONField(default=list, blank=True, help_text="List of industry sectors")
+    skill_keywords = models.JSONField(default=list, blank=True, help_text="List of skill keywords")
+    
+    # Case-insensitive element filters (kept in sync with the arrays above by save())
+    expertise_keys = models.JSONField(default=list, blank=True, editable=False, help_text="Lower-cased expertise areas")
+    sector_keys = models.JSONField(default=list, blank=True, editable=False, help_text="Lower-cased sectors")
+    skill_keys = models.JSONField(default=list, blank=True, editable=False, help_text="Lower-cased skill keywords")
     
     # Contact Information
     linkedin_profile = models.URLField(blank=True)
     website_portfolio = models.URLField(blank=True)
     
     # Additional Information
-    languages_spoken = models.TextField(blank=True, help_text="JSON array of languages")
+    languages_spoken = models.JSONField(default=list, blank=True, help_text="List of languages")
     references = models.TextField(blank=True)
     notes = models.TextField(blank=True)
     
     # Education and Certifications
-    professional_certifications = models.TextField(blank=True, help_text="JSON array of certifications")
-    professional_associations = models.TextField(blank=True, help_text="JSON array of associations")
-    publications = models.TextField(blank=True, help_text="JSON array of publications")
+    professional_certifications = models.JSONField(default=list, blank=True, help_text="List of certifications")
+    professional_associations = models.JSONField(default=list, blank=True, help_text="List of associations")
+    publications = models.JSONField(default=list, blank=True, help_text="List of publications")
     
     # File Information
     original_filename = models.CharField(max_length=255, blank=True)
@@ -69,6 +198,13 @@ class Resume(models.Model):
     processing_status = models.CharField(max_length=50, default='pending')  # pending, processing, completed, failed
     error_message = models.TextField(blank=True)
     
+    # Full-text search (maintained by a database trigger on PostgreSQL, see migration 0013)
+    search_vector = SearchVectorField(null=True, editable=False, help_text="Weighted tsvector over the searchable fields")
+    
+    # Text Extraction Diagnostics
+    extraction_tier = models.CharField(max_length=20, blank=True, help_text="Extraction tier that produced the text (pypdf, pdfminer, python-docx, plain, unstructured, ocr)")
+    extraction_report = models.TextField(blank=True, help_text="JSON object with quality score and per-tier timings of the last extraction")
+    
     class Meta:
         ordering = ['-timestamp']
         indexes = [
@@ -83,8 +219,17 @@ class Resume(models.Model):
             models.Index(fields=['processing_status']),
             models.Index(fields=['date_of_birth']),
             models.Index(fields=['file_creation_date']),
+            # Blocking indexes for find_similar_person_by_name_and_phone
+            models.Index(fields=['name_key', 'phone_last7'], name='resume_name_phone7_idx'),
+            models.Index(fields=['name_key', 'phone_last4'], name='resume_name_phone4_idx'),
+            # Freshest resume per person (find_same_person, latest_per_person)
+            models.Index(fields=['person_soft_id', '-freshness_score'], name='resume_person_freshness_idx'),
+            # Keyset pagination on (timestamp, id)
+            models.Index(fields=['-timestamp', '-id'], name='resume_timestamp_id_idx'),
         ]
     
+    objects = ResumeQuerySet.as_manager()
+    
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.email})"
     
@@ -95,14 +240,38 @@ class Resume(models.Model):
         # Generate person soft ID for duplicate person detection
         if not self.person_soft_id:
             self.person_soft_id = self.generate_person_soft_id()
+        
+        # Keep near-duplicate matching keys in sync with name and phone
+        self.name_key, self.phone_last7, self.phone_last4 = self.generate_match_keys(
+            self.first_name, self.last_name, self.phone_number
+        )
+        self.update_filter_keys()
             
         # Generate CV hash based on person soft ID and timestamp (not email)
         if not self.cv_hash:
             # Use person soft ID + timestamp for uniqueness
             hash_input = f"{self.person_soft_id}{self.timestamp.isoformat()}{self.first_name}{self.last_name}".lower()
             self.cv_hash = hashlib.sha256(hash_input.encode()).hexdigest()
+        
+        # Materialized for SQL ordering; the date decay is caught up by refresh_freshness_scores
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self.freshness_score = self.get_resume_freshness_score()
+        else:
+            update_fields = list(update_fields)
+            update_fields += [FILTER_KEY_FIELDS[field] for field in update_fields if field in FILTER_KEY_FIELDS]
+            if set(update_fields) & set(MATCH_KEY_INPUT_FIELDS):
+                update_fields += MATCH_KEY_FIELDS
+            if set(update_fields) & set(FRESHNESS_INPUT_FIELDS):
+                self.freshness_score = self.get_resume_freshness_score()
+                update_fields.append('freshness_score')
+            kwargs['update_fields'] = update_fields
             
         super().save(*args, **kwargs)
+        
+        if getattr(self, '_minhash_changed', False):
+            self.update_lsh_buckets()
+            self._minhash_changed = False
     
     @property
     def full_name(self):
@@ -164,109 +333,170 @@ class Resume(models.Model):
             return "Expert"
     
     # JSON field helpers
-    def get_expertise_areas(self):
-        """Get expertise areas as Python list"""
-        if not self.expertise_areas:
-            return []
+    @property
+    def _json_cache(self):
+        """Decoded JSON columns of this instance: field name -> (raw string, value)"""
+        return self.__dict__.setdefault('_json_cache_store', {})
+    
+    def _get_json(self, field_name, default_factory):
+        """
+        Decode a JSON text column at most once per loaded value. The cache entry
+        is keyed on the identity of the raw string, so assigning the column
+        directly or reloading it also invalidates it. Callers get a copy, so
+        mutating the result cannot change what later calls return.
+        """
+        raw = getattr(self, field_name)
+        if not raw:
+            return default_factory()
+        cached = self._json_cache.get(field_name)
+        if cached is not None and cached[0] is raw:
+            return copy_json_value(cached[1])
+        
+        count_json_decode(field_name)
         try:
-            return json.loads(self.expertise_areas)
+            value = json.loads(raw)
         except json.JSONDecodeError:
-            return []
+            value = default_factory()
+        self._json_cache[field_name] = (raw, value)
+        return copy_json_value(value)
+    
+    def _get_native_json(self, field_name, default_factory):
+        """
+        Value of a JSONField column, falling back to decoding a JSON string
+        assigned by older code and to the empty default for wrong types.
+        """
+        value = getattr(self, field_name)
+        if isinstance(value, str):
+            value = self._get_json(field_name, default_factory)
+        if not isinstance(value, default_factory):
+            return default_factory()
+        return value
+    
+    def json_field_as_text(self, field_name):
+        """JSON column serialized as text, for full-text indexing in Elasticsearch"""
+        value = getattr(self, field_name)
+        if not value:
+            return ''
+        return value if isinstance(value, str) else json.dumps(value)
+    
+    def get_expertise_areas(self):
+        """Get expertise areas as Python list"""
+        return self._get_native_json('expertise_areas', list)
     
     def set_expertise_areas(self, areas_list):
         """Set expertise areas from Python list"""
-        self.expertise_areas = json.dumps(areas_list) if areas_list else ""
+        self.expertise_areas = areas_list or []
     
     def get_sectors(self):
         """Get sectors as Python list"""
-        if not self.sectors:
-            return []
-        try:
-            return json.loads(self.sectors)
-        except json.JSONDecodeError:
-            return []
+        return self._get_native_json('sectors', list)
     
     def set_sectors(self, sectors_list):
         """Set sectors from Python list"""
-        self.sectors = json.dumps(sectors_list) if sectors_list else ""
+        self.sectors = sectors_list or []
     
     def get_skill_keywords(self):
         """Get skill keywords as Python list"""
-        if not self.skill_keywords:
-            return []
-        try:
-            return json.loads(self.skill_keywords)
-        except json.JSONDecodeError:
-            return []
+        return self._get_native_json('skill_keywords', list)
     
     def set_skill_keywords(self, keywords_list):
         """Set skill keywords from Python list"""
-        self.skill_keywords = json.dumps(keywords_list) if keywords_list else ""
+        self.skill_keywords = keywords_list or []
     
     def get_languages_spoken(self):
         """Get languages as Python list"""
-        if not self.languages_spoken:
-            return []
-        try:
-            return json.loads(self.languages_spoken)
-        except json.JSONDecodeError:
-            return []
+        return self._get_native_json('languages_spoken', list)
     
     def set_languages_spoken(self, languages_list):
         """Set languages from Python list"""
-        self.languages_spoken = json.dumps(languages_list) if languages_list else ""
+        self.languages_spoken = languages_list or []
     
     def get_professional_certifications(self):
         """Get certifications as Python list"""
-        if not self.professional_certifications:
-            return []
-        try:
-            return json.loads(self.professional_certifications)
-        except json.JSONDecodeError:
-            return []
+        return self._get_native_json('professional_certifications', list)
     
     def set_professional_certifications(self, certs_list):
         """Set certifications from Python list"""
-        self.professional_certifications = json.dumps(certs_list) if certs_list else ""
+        self.professional_certifications = certs_list or []
     
     def get_professional_associations(self):
         """Get associations as Python list"""
-        if not self.professional_associations:
-            return []
-        try:
-            return json.loads(self.professional_associations)
-        except json.JSONDecodeError:
-            return []
+        return self._get_native_json('professional_associations', list)
     
     def set_professional_associations(self, associations_list):
         """Set associations from Python list"""
-        self.professional_associations = json.dumps(associations_list) if associations_list else ""
+        self.professional_associations = associations_list or []
     
     def get_publications(self):
         """Get publications as Python list"""
-        if not self.publications:
-            return []
-        try:
-            return json.loads(self.publications)
-        except json.JSONDecodeError:
-            return []
+        return self._get_native_json('publications', list)
     
     def set_publications(self, publications_list):
         """Set publications from Python list"""
-        self.publications = json.dumps(publications_list) if publications_list else ""
+        self.publications = publications_list or []
     
     def get_expertise_details(self):
         """Get expertise details as Python dict"""
-        if not self.expertise_details:
-            return {}
-        try:
-            return json.loads(self.expertise_details)
-        except json.JSONDecodeError:
-            return {}
+        return self._get_native_json('expertise_details', dict)
     
     def set_expertise_details(self, details_dict):
         """Set expertise details from Python dict"""
-        self.expertise_details = json.dumps(details_dict) if details_dict else ""
+        self.expertise_details = details_dict or {}
+    
+    def get_extraction_report(self):
+        """Get extraction report as Python dict"""
+        return self._get_json('extraction_report', dict)
+    
+    def set_extraction_report(self, report_dict):
+        """Set extraction tier and report from the parsing service's last extraction"""
+        self.extraction_tier = report_dict.get('tier', '') if report_dict else ""
+        self.extraction_report = json.dumps(report_dict) if report_dict else ""
+        self._json_cache.pop('extraction_report', None)
+    
+    def get_minhash_signature(self):
+        """Get MinHash signature as Python list"""
+        return self._get_json('minhash_signature', list)
+    
+    def set_minhash_signature(self, signature):
+        """Set MinHash signature from Python list; LSH buckets are rebuilt on the next save"""
+        self.minhash_signature = json.dumps(signature) if signature else ""
+        self._json_cache.pop('minhash_signature', None)
+        self._minhash_changed = True
+    
+    def update_lsh_buckets(self):
+        """
+        Replace this resume's LSH band buckets with those of its current signature.
+        """
+        self.lsh_buckets.all().delete()
+        ResumeLSHBucket.objects.bulk_create([
+            ResumeLSHBucket(resume=self, bucket=bucket)
+            for bucket in band_buckets(self.get_minhash_signature())
+        ])
+    
+    def to_parsed_data(self):
+        """
+        Rebuild the parsing service's output from this resume, so its parse can be
+        reused for a near-duplicate upload.
+        """
+        simple_fields = [
+            'first_name', 'last_name', 'email', 'phone_number', 'location',
+            'current_employer', 'years_of_experience', 'total_experience_months',
+            'availability', 'preferred_contract_type', 'preferred_work_arrangement',
+            'linkedin_profile', 'website_portfolio', 'references', 'notes'
+        ]
+        parsed_data = {field: getattr(self, field) for field in simple_fields}
+        parsed_data['date_of_birth'] = self.date_of_birth.isoformat() if self.date_of_birth else None
+        parsed_data.update({
+            'expertise_areas': self.get_expertise_areas(),
+            'expertise_details': self.get_expertise_details(),
+            'sectors': self.get_sectors(),
+            'skill_keywords': self.get_skill_keywords(),
+            'languages_spoken': self.get_languages_spoken(),
+            'professional_certifications': self.get_professional_certifications(),
+            'professional_associations': self.get_professional_associations(),
+            'publications': self.get_publications(),
+        })
+        return parsed_data
     
     # === DUPLICATE DETECTION METHODS ===
     
@@ -281,14 +511,10 @@ class Resume(models.Model):
         # Normalize and add name components only
         if self.first_name:
             # Remove extra spaces, convert to lowercase, remove common prefixes
-            clean_first = re.sub(r'\s+', '', self.first_name.lower().strip())
-            clean_first = re.sub(r'^(mr|ms|mrs|dr|prof)\.?', '', clean_first)
-            identity_parts.append(clean_first)
+            identity_parts.append(self.normalize_name_part(self.first_name))
             
         if self.last_name:
-            clean_last = re.sub(r'\s+', '', self.last_name.lower().strip())
-            clean_last = re.sub(r'^(mr|ms|mrs|dr|prof)\.?', '', clean_last)
-            identity_parts.append(clean_last)
+            identity_parts.append(self.normalize_name_part(self.last_name))
         
         # Add phone for differentiation, but use a normalized approach
         if self.phone_number:
@@ -306,6 +532,51 @@ class Resume(models.Model):
         else:
             return hashlib.sha256(f"unknown_{uuid.uuid4()}".encode()).hexdigest()[:16]
     
+    @staticmethod
+    def normalize_name_part(name):
+        """
+        Normalize a first or last name for matching: lowercase, no whitespace,
+        no leading title (Mr, Dr, ...).
+        """
+        if not name:
+            return ''
+        clean = re.sub(r'\s+', '', name.lower().strip())
+        return re.sub(r'^(mr|ms|mrs|dr|prof)\.?', '', clean)
+    
+    @classmethod
+    def generate_match_keys(cls, first_name, last_name, phone_number):
+        """
+        Build the indexed keys used to find the same person with a different phone.
+        
+        Returns:
+            tuple: (name_key, phone_last7, phone_last4); name_key is empty unless
+            both names are present, phone keys are empty for numbers under 7 digits
+        """
+        clean_first = cls.normalize_name_part(first_name)
+        clean_last = cls.normalize_name_part(last_name)
+        name_key = f"{clean_first}:{clean_last}"[:200] if clean_first and clean_last else ''
+        
+        digits = ''.join(filter(str.isdigit, phone_number or ''))
+        if len(digits) < 7:
+            return name_key, '', ''
+        return name_key, digits[-7:], digits[-4:]
+    
+    @staticmethod
+    def normalize_filter_key(value):
+        """Canonical form of a filter value: whitespace collapsed and case-folded"""
+        return ' '.join(str(value).split()).casefold()
+    
+    @classmethod
+    def generate_filter_keys(cls, values):
+        """Distinct normalized keys of a JSON array, skipping blank and non-string elements"""
+        keys = (cls.normalize_filter_key(value) for value in values if isinstance(value, str))
+        return list(dict.fromkeys(key for key in keys if key))
+    
+    def update_filter_keys(self):
+        """Recompute the lower-cased key columns that json_array_contains filters on"""
+        for field_name, key_field in FILTER_KEY_FIELDS.items():
+            setattr(self, key_field, self.generate_filter_keys(self._get_native_json(field_name, list)))
+    
     def generate_content_hash(self, resume_text):
         """
         Generate hash from resume content to detect identical files.
@@ -364,36 +635,66 @@ class Resume(models.Model):
                 return False
         return False
     
-    def get_resume_freshness_score(self):
+    def get_resume_freshness_score(self, now=None):
         """
         Calculate a "freshness" score to determine which resume is more recent.
         Higher score = more recent/fresh resume.
         """
-        score = 0
-        
-        # File creation date gets highest priority (if available)
-        if self.file_creation_date:
-            # More recent files get higher scores
-            from datetime import datetime, timezone
-            now = datetime.now(timezone.utc)
-            days_old = (now - self.file_creation_date.replace(tzinfo=timezone.utc)).days
-            score += max(0, 10000 - days_old)  # Up to 10000 points for very recent files
+        return compute_freshness_score(
+            self.file_creation_date, self.timestamp,
+            self.years_of_experience, self.total_experience_months, now=now
+        )
+    
+    @classmethod
+    def refresh_freshness_scores(cls, batch_size=5000):
+        """
+        Recompute the stored freshness_score of every resume.
         
-        # Upload timestamp as secondary factor
-        from datetime import datetime, timezone
-        now = datetime.now(timezone.utc)
-        upload_days_old = (now - self.timestamp).days
-        score += max(0, 5000 - upload_days_old)  # Up to 5000 points for recent uploads
+        The score loses a point per day of age, so this runs periodically to keep
+        SQL ordering in step with get_resume_freshness_score(). Only rows whose
+        score changed are written: on PostgreSQL by a single UPDATE filtered on
+        the recomputed score, elsewhere in batches from Python.
         
-        # Years of experience as tie-breaker (more experience might indicate more recent resume)
-        if self.years_of_experience:
-            score += min(self.years_of_experience * 10, 1000)  # Up to 1000 points for experience
+        Returns:
+            int: Number of resumes updated
+        """
+        from datetime import datetime, timezone as dt_timezone
+        from django.db import connection
+        from django.db.models import Q
+        from django.db.models.expressions import RawSQL
+        now = datetime.now(dt_timezone.utc)
         
-        # Total experience months for finer granularity
-        if self.total_experience_months:
-            score += min(self.total_experience_months, 500)  # Up to 500 points
+        if connection.vendor == 'postgresql':
+            score = RawSQL(FRESHNESS_SCORE_SQL, (now, now), output_field=models.IntegerField())
+            return cls.objects.filter(~Q(freshness_score=score)).update(freshness_score=score)
         
-        return score
+        updated = 0
+        batch = []
+        rows = cls.objects.order_by().values_list(
+            'id', 'file_creation_date', 'timestamp', 'years_of_experience',
+            'total_experience_months', 'freshness_score'
+        ).iterator(chunk_size=batch_size)
+        for resume_id, file_date, timestamp, years, months, stored_score in rows:
+            score = compute_freshness_score(file_date, timestamp, years, months, now=now)
+            if score != stored_score:
+                batch.append(cls(id=resume_id, freshness_score=score))
+            if len(batch) >= batch_size:
+                cls.objects.bulk_update(batch, ['freshness_score'])
+                updated += len(batch)
+                batch = []
+        if batch:
+            cls.objects.bulk_update(batch, ['freshness_score'])
+            updated += len(batch)
+        return updated
+    
+    @classmethod
+    def find_identical_file(cls, file_hash):
+        """
+        Find resume uploaded from a byte-identical file.
+        """
+        if not file_hash:
+            return None
+        return cls.objects.filter(file_hash=file_hash).first()
     
     @classmethod
     def find_identical_content(cls, content_hash):
@@ -404,6 +705,38 @@ class Resume(models.Model):
             return None
         return cls.objects.filter(content_hash=content_hash).first()
     
+    @classmethod
+    def find_near_duplicate(cls, resume_text=None, signature=None, threshold=None):
+        """
+        Find the most similar existing resume by MinHash/LSH.
+        
+        Args:
+            resume_text: Text to compare (ignored if signature is given)
+            signature: Precomputed MinHash signature
+            threshold: Minimum estimated similarity (defaults to settings.NEAR_DUPLICATE_THRESHOLD)
+        
+        Returns:
+            tuple: (resume or None, similarity)
+        """
+        if signature is None:
+            signature = minhash_signature(resume_text or '')
+        buckets = band_buckets(signature)
+        if not buckets:
+            return None, 0.0
+        if threshold is None:
+            threshold = getattr(settings, 'NEAR_DUPLICATE_THRESHOLD', 0.85)
+        
+        candidate_ids = ResumeLSHBucket.objects.filter(bucket__in=buckets).values_list('resume_id', flat=True).distinct()
+        best_id, best_similarity = None, 0.0
+        for candidate in cls.objects.filter(id__in=candidate_ids).only('id', 'minhash_signature'):
+            similarity = estimate_similarity(signature, candidate.get_minhash_signature())
+            if similarity >= threshold and similarity > best_similarity:
+                best_id, best_similarity = candidate.id, similarity
+        
+        if best_id is None:
+            return None, 0.0
+        return cls.objects.get(pk=best_id), best_similarity
+    
     @classmethod
     def are_phones_similar(cls, phone1, phone2):
         """
@@ -443,43 +776,29 @@ class Resume(models.Model):
         if not person_soft_id:
             return cls.objects.none()
         
-        resumes = cls.objects.filter(person_soft_id=person_soft_id).order_by('-timestamp')
-        
-        # Sort by freshness score if we have multiple resumes
-        if resumes.count() > 1:
-            resumes_list = list(resumes)
-            resumes_list.sort(key=lambda r: r.get_resume_freshness_score(), reverse=True)
-            return resumes_list
-        
-        return list(resumes)
+        return list(cls.objects.filter(person_soft_id=person_soft_id).order_by('-freshness_score', '-timestamp'))
 
     @classmethod
     def find_similar_person_by_name_and_phone(cls, first_name, last_name, phone_number):
         """
         Find existing resumes for people with same name and similar phone numbers.
         This helps catch same person using different phones (work/personal).
+        
+        Candidates come from the (name_key, phone_last7) and (name_key, phone_last4)
+        indexes; are_phones_similar then confirms each of the few candidates.
         """
-        if not first_name or not last_name:
+        name_key, phone_last7, phone_last4 = cls.generate_match_keys(first_name, last_name, phone_number)
+        if not name_key or not phone_last7:
             return []
-            
-        # Normalize names for comparison
-        clean_first = re.sub(r'\s+', '', first_name.lower().strip()) if first_name else ''
-        clean_first = re.sub(r'^(mr|ms|mrs|dr|prof)\.?', '', clean_first)
-        clean_last = re.sub(r'\s+', '', last_name.lower().strip()) if last_name else ''
-        clean_last = re.sub(r'^(mr|ms|mrs|dr|prof)\.?', '', clean_last)
-        
-        # Find all resumes with matching names
-        name_matches = cls.objects.filter(
-            first_name__icontains=clean_first,
-            last_name__icontains=clean_last
-        )
         
-        similar_resumes = []
-        for resume in name_matches:
-            if cls.are_phones_similar(phone_number, resume.phone_number):
-                similar_resumes.append(resume)
+        candidates = cls.objects.filter(name_key=name_key).filter(
+            models.Q(phone_last7=phone_last7) | models.Q(phone_last4=phone_last4)
+        )
         
-        return similar_resumes
+        return [
+            resume for resume in candidates
+            if cls.are_phones_similar(phone_number, resume.phone_number)
+        ]
     
     @classmethod
     def handle_duplicate_resume(cls, parsed_data, file_path, resume_text):
@@ -540,4 +859,16 @@ class Resume(models.Model):
             else:
                 return 'older', existing_resume, f'Newer resume already exists for {existing_resume.full_name}'
         
-        return 'keep', None, 'No duplicates found' 
\ No newline at end of file
+        return 'keep', None, 'No duplicates found'
+
+
+class ResumeLSHBucket(models.Model):
+    """
+    One LSH band bucket of a resume's MinHash signature. Resumes sharing any
+    bucket are near-duplicate candidates.
+    """
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='lsh_buckets')
+    bucket = models.CharField(max_length=20, db_index=True, help_text="'<band>:<hash of the band rows>'")
+    
+    def __str__(self):
+        return f"{self.bucket} -> {self.resume_id}"
@@ -0,0 +1,109 @@
+"""
+Pagination for resume listings
+"""
+import json
+import logging
+from django.conf import settings
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination, CursorPagination
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_count(queryset):
+    """
+    Row count the PostgreSQL planner expects for a queryset (from table
+    statistics, no scan). Returns None on other databases or on failure.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    try:
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+    except Exception as e:
+        logger.warning(f"Count estimate failed, using COUNT(*): {str(e)}")
+        return None
+
+
+class EstimatedCountPaginator(DjangoPaginator):
+    """
+    Paginator that uses the planner's row estimate instead of COUNT(*) for
+    large result sets. Small results (under RESUME_ESTIMATED_COUNT_THRESHOLD)
+    are still counted exactly.
+    """
+    count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        if estimate is not None and estimate >= getattr(settings, 'RESUME_ESTIMATED_COUNT_THRESHOLD', 10000):
+            self.count_is_estimate = True
+            return estimate
+        return super().count
+
+    def page(self, number):
+        self.count  # Decides whether this paginator is estimating
+        if not self.count_is_estimate:
+            return super().page(number)
+        # An estimate can be short of the real count: slice without capping at it
+        number = max(int(number), 1)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(self.object_list[bottom:bottom + self.per_page], number, self)
+
+
+class ResumeCursorPagination(CursorPagination):
+    """
+    Keyset pagination on (timestamp, id): each page is an index range scan
+    from the previous cursor, so page 1000 costs the same as page 1.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+    ordering = ('-timestamp', '-id')
+
+
+class ResumePagination(PageNumberPagination):
+    """
+    Custom pagination for resume results.
+
+    Page numbers by default. `?pagination=cursor` (or a `cursor` from a
+    previous response) switches to keyset pagination, and `?count=estimated`
+    replaces COUNT(*) with the planner estimate for large result sets.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+
+    cursor_pagination_class = ResumeCursorPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if request.query_params.get('pagination') == 'cursor' or request.query_params.get('cursor'):
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+
+        if request.query_params.get('count') == 'estimated':
+            self.django_paginator_class = EstimatedCountPaginator
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+
+        response = super().get_paginated_response(data)
+        if getattr(self.page.paginator, 'count_is_estimate', False):
+            response.data['count_is_estimate'] = True
+        return response
+
+    def get_html_context(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_html_context()
+        return super().get_html_context()
@@ -3,7 +3,55 @@ from .models import Resume
 import json
 
 
-class ResumeSerializer(serializers.ModelSerializer):
+class SparseFieldsetMixin:
+    """
+    Trim serializer output to the fields named in `?fields=a,b,c`, and work out
+    which model columns those fields need so the view can load only them.
+    """
+    fields_query_param = 'fields'
+    
+    # Read-only serializer fields computed from other model fields
+    source_fields = {
+        'full_name': ('first_name', 'last_name'),
+        'age': ('date_of_birth',),
+        'experience_level': ('total_experience_months', 'years_of_experience'),
+        'experience_display': ('total_experience_months', 'years_of_experience'),
+        'total_experience_years': ('total_experience_months', 'years_of_experience'),
+    }
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.get_requested_fields(self.context.get('request'))
+        if requested:
+            for field_name in set(self.fields) - requested:
+                self.fields.pop(field_name)
+    
+    @classmethod
+    def get_requested_fields(cls, request):
+        """Field names from the request's fields= parameter, or None for all fields"""
+        if request is None:
+            return None
+        value = request.query_params.get(cls.fields_query_param)
+        if not value:
+            return None
+        return {name.strip() for name in value.split(',') if name.strip()}
+    
+    @classmethod
+    def get_model_fields(cls, request):
+        """Model columns needed to serialize the requested fields (for QuerySet.only())"""
+        serializer_fields = cls(context={'request': request}).fields
+        model_fields = {f.name for f in Resume._meta.concrete_fields}
+        
+        needed = {'id'}
+        for field_name in serializer_fields:
+            if field_name in cls.source_fields:
+                needed.update(cls.source_fields[field_name])
+            elif field_name in model_fields:
+                needed.add(field_name)
+        return sorted(needed)
+
+
+class ResumeSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for Resume model
     """
@@ -22,10 +70,11 @@ class ResumeSerializer(serializers.ModelSerializer):
     professional_certifications = serializers.SerializerMethodField()
     professional_associations = serializers.SerializerMethodField()
     publications = serializers.SerializerMethodField()
+    extraction_report = serializers.SerializerMethodField()
     
     class Meta:
         model = Resume
-        fields = '__all__'
+        exclude = ('minhash_signature', 'search_vector', 'expertise_keys', 'sector_keys', 'skill_keys')
         read_only_fields = ('id', 'timestamp', 'cv_hash', 'full_name', 'experience_level', 'experience_display', 'age', 'total_experience_years')
     
     def get_expertise_areas(self, obj):
@@ -59,6 +108,27 @@ class ResumeSerializer(serializers.ModelSerializer):
     def get_publications(self, obj):
         """Convert publications JSON string to array"""
         return obj.get_publications()
+    
+    def get_extraction_report(self, obj):
+        """Convert extraction_report JSON string to dict"""
+        return obj.get_extraction_report()
+
+
+class ResumeListSerializer(ResumeSerializer):
+    """
+    Summary of a resume for list pages: leaves out the large free-text and
+    JSON columns (expertise_details, references, notes, publications, ...),
+    which are only decoded for the detail view.
+    """
+    class Meta(ResumeSerializer.Meta):
+        exclude = None
+        fields = (
+            'id', 'timestamp', 'first_name', 'last_name', 'full_name', 'email', 'phone_number',
+            'location', 'date_of_birth', 'age', 'current_employer', 'years_of_experience',
+            'total_experience_months', 'total_experience_years', 'experience_level', 'experience_display',
+            'availability', 'expertise_areas', 'sectors', 'skill_keywords', 'original_filename',
+            'file_type', 'processing_status', 'freshness_score',
+        )
 
 
 class ResumeUploadSerializer(serializers.Serializer):
@@ -0,0 +1,95 @@
+"""
+MinHash signatures and LSH banding for near-duplicate resume detection.
+
+A resume's text is normalized, split into overlapping word shingles and
+summarized as a fixed-length MinHash signature. The fraction of equal
+positions between two signatures estimates the Jaccard similarity of their
+shingle sets. Signatures are cut into bands; two resumes that share any band
+bucket become candidates, so finding near-duplicates is an indexed lookup on
+the band buckets instead of a comparison against every stored resume.
+"""
+import re
+import random
+import struct
+import hashlib
+from typing import List
+
+# 128 permutations in 16 bands of 8 rows: pairs above ~0.7 Jaccard almost
+# always share a band, pairs below ~0.5 rarely do
+NUM_PERM = 128
+NUM_BANDS = 16
+ROWS_PER_BAND = NUM_PERM // NUM_BANDS
+SHINGLE_SIZE = 5
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed seed: signatures must stay comparable across processes and releases
+_rng = random.Random(1729)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace, so re-exports of the same CV compare equal"""
+    text = text.lower()
+    text = re.sub(r'[^\w\s@.]', ' ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Set of overlapping word n-grams of the normalized text"""
+    words = normalize_text(text).split()
+    if len(words) <= size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(text: str) -> List[int]:
+    """
+    Compute the MinHash signature of a text.
+
+    Args:
+        text: Resume text
+
+    Returns:
+        list: NUM_PERM integers, or an empty list if the text has no words
+    """
+    shingle_hashes = [
+        struct.unpack('<I', hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest())[0]
+        for s in shingles(text or '')
+    ]
+    if not shingle_hashes:
+        return []
+
+    return [
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in shingle_hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def estimate_similarity(signature1: List[int], signature2: List[int]) -> float:
+    """Estimated Jaccard similarity of two signatures (0.0 - 1.0)"""
+    if not signature1 or len(signature1) != len(signature2):
+        return 0.0
+    matches = sum(1 for a, b in zip(signature1, signature2) if a == b)
+    return matches / len(signature1)
+
+
+def band_buckets(signature: List[int]) -> List[str]:
+    """
+    LSH bucket keys for a signature, one per band.
+
+    Returns:
+        list: Keys of the form '<band>:<hash of the band's rows>'
+    """
+    if len(signature) != NUM_PERM:
+        return []
+    buckets = []
+    for band in range(NUM_BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(struct.pack(f'<{ROWS_PER_BAND}Q', *rows), digest_size=8).hexdigest()
+        buckets.append(f"{band:02d}:{digest}")
+    return buckets
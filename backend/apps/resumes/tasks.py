@@ -0,0 +1,22 @@
+"""
+Celery tasks for periodic resume maintenance
+"""
+from celery import shared_task
+from apps.resumes.models import Resume
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def refresh_freshness_scores():
+    """
+    Recompute stored freshness scores so their date decay stays current.
+    Scheduled daily via CELERY_BEAT_SCHEDULE.
+    
+    Returns:
+        dict: Number of resumes whose score changed
+    """
+    updated = Resume.refresh_freshness_scores()
+    logger.info(f"Refreshed freshness scores for {updated} resumes")
+    return {'updated': updated}
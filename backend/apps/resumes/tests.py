@@ -0,0 +1,90 @@
+from unittest import mock
+
+from django.db import models
+from django.test import SimpleTestCase
+
+from .filters import json_array_contains
+from .models import Resume
+from .views import ResumeViewSet
+
+
+class FilterKeyTests(SimpleTestCase):
+    def test_keys_are_case_folded_and_deduplicated(self):
+        keys = Resume.generate_filter_keys(['Python', ' python ', 'Machine  Learning', '', None, 3])
+        self.assertEqual(keys, ['python', 'machine learning'])
+
+    def test_update_filter_keys_follows_the_arrays(self):
+        resume = Resume(expertise_areas=['Data Science'], sectors=['FinTech', 'Energy'], skill_keywords=['SQL'])
+        resume.update_filter_keys()
+        self.assertEqual(resume.expertise_keys, ['data science'])
+        self.assertEqual(resume.sector_keys, ['fintech', 'energy'])
+        self.assertEqual(resume.skill_keys, ['sql'])
+
+    def test_update_filter_keys_reads_legacy_json_text(self):
+        resume = Resume(skill_keywords='["Django", "DJANGO"]')
+        resume.update_filter_keys()
+        self.assertEqual(resume.skill_keys, ['django'])
+
+
+class JsonArrayContainsTests(SimpleTestCase):
+    def lookup(self, vendor, field_name, value):
+        with mock.patch('apps.resumes.filters.connection') as connection:
+            connection.vendor = vendor
+            return json_array_contains(field_name, value).children[0]
+
+    def test_postgresql_matches_the_normalized_key(self):
+        self.assertEqual(self.lookup('postgresql', 'skill_keywords', ' PyThon '), ('skill_keys__contains', ['python']))
+        self.assertEqual(self.lookup('postgresql', 'expertise_areas', 'Data  Science'), ('expertise_keys__contains', ['data science']))
+
+    def test_other_databases_match_the_quoted_key(self):
+        self.assertEqual(self.lookup('sqlite', 'sectors', 'FinTech'), ('sector_keys__icontains', '"fintech"'))
+
+
+class JsonCacheTests(SimpleTestCase):
+    def test_decoded_value_is_not_shared_between_calls(self):
+        resume = Resume(extraction_report='{"tiers": [{"name": "pypdf"}]}')
+        report = resume.get_extraction_report()
+        report['tiers'][0]['name'] = 'changed'
+        report['quality'] = 0
+        self.assertEqual(resume.get_extraction_report(), {'tiers': [{'name': 'pypdf'}]})
+
+
+class ReplaceOlderResumeTests(SimpleTestCase):
+    def replace(self, existing, near_duplicate):
+        with mock.patch.object(Resume, 'delete_file') as delete_file, mock.patch.object(Resume, 'delete') as delete:
+            result = ResumeViewSet._replace_older_resume(existing, near_duplicate)
+        delete_file.assert_called_once_with()
+        delete.assert_called_once_with()
+        return result
+
+    def test_near_duplicate_that_is_the_replaced_resume_is_dropped(self):
+        # find_near_duplicate and handle_duplicate_resume load the row separately
+        self.assertIsNone(self.replace(Resume(pk=7), Resume(pk=7)))
+
+    def test_other_near_duplicate_is_kept(self):
+        near_duplicate = Resume(pk=8)
+        self.assertIs(self.replace(Resume(pk=7), near_duplicate), near_duplicate)
+
+    def test_no_near_duplicate(self):
+        self.assertIsNone(self.replace(Resume(pk=7), None))
+
+
+class SaveUpdateFieldsTests(SimpleTestCase):
+    def saved_fields(self, resume, update_fields):
+        with mock.patch.object(models.Model, 'save') as base_save:
+            resume.save(update_fields=update_fields)
+        return set(base_save.call_args.kwargs['update_fields'])
+
+    def test_name_or_phone_update_writes_the_match_keys(self):
+        resume = Resume(pk=1, first_name='Jane', last_name='Doe', phone_number='+44 20 7946 0958')
+        for field in ('first_name', 'last_name', 'phone_number'):
+            self.assertTrue({'name_key', 'phone_last7', 'phone_last4'} <= self.saved_fields(resume, [field]))
+        self.assertEqual((resume.name_key, resume.phone_last7, resume.phone_last4), ('jane:doe', '9460958', '0958'))
+
+    def test_other_updates_leave_the_match_keys_alone(self):
+        resume = Resume(pk=1, first_name='Jane', last_name='Doe')
+        self.assertEqual(self.saved_fields(resume, ['notes']), {'notes'})
+
+    def test_array_update_writes_its_filter_keys(self):
+        resume = Resume(pk=1, skill_keywords=['SQL'])
+        self.assertEqual(self.saved_fields(resume, ['skill_keywords']), {'skill_keywords', 'skill_keys'})
@@ -0,0 +1,65 @@
+"""
+Upload handlers that hash files while Django writes them.
+
+The SHA-256 of each uploaded file is computed from the request body chunks as
+they are stored (in memory or in the temporary file), so the upload views can
+reject exact re-uploads without reading the file again.
+"""
+import hashlib
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+
+# Larger than Django's 64 KB default: fewer hash/write calls per upload
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class HashingUploadMixin:
+    """
+    Hash every chunk the handler keeps and attach the digest to the
+    resulting UploadedFile as `sha256`.
+    """
+    chunk_size = UPLOAD_CHUNK_SIZE
+
+    def new_file(self, *args, **kwargs):
+        # Set before super(): MemoryFileUploadHandler raises StopFutureHandlers when it activates
+        self.sha256 = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        result = super().receive_data_chunk(raw_data, start)
+        # None means this handler stored the chunk; otherwise it is passed on and hashed there
+        if result is None:
+            self.sha256.update(raw_data)
+        return result
+
+    def file_complete(self, file_size):
+        uploaded_file = super().file_complete(file_size)
+        if uploaded_file is not None:
+            uploaded_file.sha256 = self.sha256.hexdigest()
+        return uploaded_file
+
+
+class HashingMemoryFileUploadHandler(HashingUploadMixin, MemoryFileUploadHandler):
+    """Keep small uploads in memory, hashing them as they arrive"""
+
+
+class HashingTemporaryFileUploadHandler(HashingUploadMixin, TemporaryFileUploadHandler):
+    """Stream large uploads to a temporary file, hashing them as they are written"""
+
+
+def get_upload_hash(uploaded_file):
+    """
+    Return the SHA-256 of an uploaded file.
+
+    Uses the digest computed by the hashing upload handlers, and falls back to
+    one pass over the file for uploads that did not go through them.
+    """
+    file_hash = getattr(uploaded_file, 'sha256', None)
+    if file_hash:
+        return file_hash
+
+    sha256 = hashlib.sha256()
+    for chunk in uploaded_file.chunks(chunk_size=UPLOAD_CHUNK_SIZE):
+        sha256.update(chunk)
+    uploaded_file.seek(0)
+    uploaded_file.sha256 = sha256.hexdigest()
+    return uploaded_file.sha256
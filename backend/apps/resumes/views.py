@@ -8,25 +8,23 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, JSONParser
-from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
 import django_filters
 import json
 from django.db import models
 
 from .models import Resume
-from .serializers import ResumeSerializer, ResumeUploadSerializer, BatchResumeUploadSerializer, BatchUploadResultSerializer
+from .pagination import ResumePagination
+from .filters import ResumeFullTextSearchFilter, ResumeOrderingFilter, expand_location_alias, suggest_locations, json_array_contains
+from .upload_handlers import get_upload_hash
+from .similarity import minhash_signature
+from .serializers import ResumeSerializer, ResumeListSerializer, ResumeUploadSerializer, BatchResumeUploadSerializer, BatchUploadResultSerializer
 from ..ai_parser.services import ResumeParsingService
 
 logger = logging.getLogger(__name__)
 
-
-class ResumePagination(PageNumberPagination):
-    """Custom pagination for resume results"""
-    page_size = 10
-    page_size_query_param = 'page_size'
-    max_page_size = 50
+# Distinct values per option that filter_options reads from Elasticsearch
+FILTER_OPTIONS_FACET_SIZE = 1000
 
 
 class ResumeFilter(django_filters.FilterSet):
@@ -46,6 +44,9 @@ class ResumeFilter(django_filters.FilterSet):
     sectors = django_filters.CharFilter(method='filter_sectors')
     skills = django_filters.CharFilter(method='filter_skills')
     experience = django_filters.CharFilter(method='filter_experience_level')
+    latest_only = django_filters.BooleanFilter(method='filter_latest_only')
+    name = django_filters.CharFilter(method='filter_name')
+    employer = django_filters.CharFilter(field_name='current_employer', lookup_expr='icontains')
     
     class Meta:
         model = Resume
@@ -62,13 +63,21 @@ class ResumeFilter(django_filters.FilterSet):
         if not location_values:
             return queryset
         
-        # Build OR query for multiple locations
+        # location_match=fuzzy also matches misspellings and country codes ("Bangaldesh", "UK")
+        fuzzy = self.data.get('location_match') == 'fuzzy'
+        
+        # Build OR query for multiple locations (icontains is served by the trigram index)
         from django.db.models import Q
         location_queries = Q()
         
         for location in location_values:
             if location and location.strip():
                 location_queries |= Q(location__icontains=location.strip())
+                if fuzzy:
+                    location_queries |= Q(location__icontains=expand_location_alias(location))
+                    suggestions = [s['location'] for s in suggest_locations(location)]
+                    if suggestions:
+                        location_queries |= Q(location__in=suggestions)
         
         return queryset.filter(location_queries) if location_queries else queryset
     
@@ -89,8 +98,8 @@ class ResumeFilter(django_filters.FilterSet):
         
         for expertise in expertise_values:
             if expertise and expertise.strip():
-        # Filter resumes where the expertise_areas JSON field contains the value
-                expertise_queries |= Q(expertise_areas__icontains=f'"{expertise.strip()}"')
+                # Element match on the JSON array (GIN-indexed jsonb containment on PostgreSQL)
+                expertise_queries |= json_array_contains('expertise_areas', expertise.strip())
         
         return queryset.filter(expertise_queries) if expertise_queries else queryset
     
@@ -111,8 +120,8 @@ class ResumeFilter(django_filters.FilterSet):
         
         for sector in sector_values:
             if sector and sector.strip():
-        # Filter resumes where the sectors JSON field contains the value
-                sector_queries |= Q(sectors__icontains=f'"{sector.strip()}"')
+                # Element match on the JSON array (GIN-indexed jsonb containment on PostgreSQL)
+                sector_queries |= json_array_contains('sectors', sector.strip())
         
         return queryset.filter(sector_queries) if sector_queries else queryset
     
@@ -133,8 +142,8 @@ class ResumeFilter(django_filters.FilterSet):
         
         for skill in skill_values:
             if skill and skill.strip():
-        # Filter resumes where the skill_keywords JSON field contains the value
-                skill_queries |= Q(skill_keywords__icontains=f'"{skill.strip()}"')
+                # Element match on the JSON array (GIN-indexed jsonb containment on PostgreSQL)
+                skill_queries |= json_array_contains('skill_keywords', skill.strip())
         
         return queryset.filter(skill_queries) if skill_queries else queryset
     
@@ -164,6 +173,21 @@ class ResumeFilter(django_filters.FilterSet):
             return queryset.filter(years_of_experience__gte=10)
         
         return queryset
+    
+    def filter_name(self, queryset, name, value):
+        """Filter by name: every word must appear in the first or last name"""
+        if not value:
+            return queryset
+        
+        for part in value.split():
+            queryset = queryset.filter(models.Q(first_name__icontains=part) | models.Q(last_name__icontains=part))
+        return queryset
+    
+    def filter_latest_only(self, queryset, name, value):
+        """Keep only the freshest resume of each person"""
+        if not value:
+            return queryset
+        return queryset.latest_per_person()
 
 
 class ResumeViewSet(viewsets.ModelViewSet):
@@ -173,11 +197,13 @@ class ResumeViewSet(viewsets.ModelViewSet):
     queryset = Resume.objects.all()
     serializer_class = ResumeSerializer
     parser_classes = [MultiPartParser, JSONParser]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, ResumeFullTextSearchFilter, ResumeOrderingFilter]
     filterset_class = ResumeFilter
     pagination_class = ResumePagination
     
-    # Search fields - covers all available data in the database
+    # Search fields - covers all available data in the database.
+    # On PostgreSQL the same fields are indexed in search_vector and searched with ts_rank;
+    # this list is used for the icontains fallback (SQLite)
     search_fields = [
         # Basic personal information
         'first_name', 'last_name', 'email', 'phone_number', 'location',
@@ -195,8 +221,26 @@ class ResumeViewSet(viewsets.ModelViewSet):
     ]
     
     # Ordering fields
-    ordering_fields = ['timestamp', 'first_name', 'last_name', 'years_of_experience']
-    ordering = ['-timestamp']
+    ordering_fields = ['timestamp', 'first_name', 'last_name', 'years_of_experience', 'freshness_score', 'search_rank']
+    ordering = ['-timestamp', '-id']
+    
+    def get_serializer_class(self):
+        """
+        Lightweight summaries for list pages. `?fields=a,b` selects any fields of
+        the full serializer instead, and `?detail=full` returns full records.
+        """
+        if self.action == 'list' and not (
+            ResumeSerializer.get_requested_fields(self.request) or self.request.query_params.get('detail') == 'full'
+        ):
+            return ResumeListSerializer
+        return ResumeSerializer
+    
+    def get_queryset(self):
+        """Load only the columns the chosen serializer outputs"""
+        queryset = super().get_queryset()
+        if self.action in ('list', 'retrieve'):
+            queryset = queryset.only(*self.get_serializer_class().get_model_fields(self.request))
+        return queryset
     
     @action(detail=False, methods=['post'])
     def upload(self, request):
@@ -211,6 +255,17 @@ class ResumeViewSet(viewsets.ModelViewSet):
         parse_immediately = serializer.validated_data['parse_immediately']
         
         try:
+            # SHA-256 computed by the upload handler while the file was received
+            file_hash = get_upload_hash(uploaded_file)
+            
+            # Exact re-upload: reject before saving, extracting or calling the AI
+            identical_resume = Resume.find_identical_file(file_hash)
+            if identical_resume:
+                return Response({
+                    'error': 'Identical resume already exists',
+                    'detail': f'Identical file already exists for {identical_resume.full_name}'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
             # Save the uploaded file
             file_path = default_storage.save(
                 f'uploads/{uploaded_file.name}',
@@ -220,13 +275,18 @@ class ResumeViewSet(viewsets.ModelViewSet):
             # Parse the resume first to get the email and other data
             if parse_immediately:
                 try:
-                    # Use AI parsing service to extract data
+                    # Extract text once; it is used for AI parsing and duplicate detection
                     parsing_service = ResumeParsingService()
-                    parsed_data = parsing_service.parse_resume(file_path)
-                    
-                    # Extract resume text for duplicate detection
                     resume_text = parsing_service.extract_text(file_path)
                     
+                    # Flag near-duplicates before the AI call, optionally reusing their parse
+                    signature, near_duplicate, similarity = self._find_near_duplicate(resume_text)
+                    if near_duplicate and settings.REUSE_NEAR_DUPLICATE_PARSE:
+                        parsed_data = near_duplicate.to_parsed_data()
+                    else:
+                        # Use AI parsing service to extract data
+                        parsed_data = parsing_service.parse_resume(file_path, resume_text=resume_text)
+                    
                     # Handle duplicate detection using new system
                     action, existing_resume, message = Resume.handle_duplicate_resume(
                         parsed_data, file_path, resume_text
@@ -251,8 +311,7 @@ class ResumeViewSet(viewsets.ModelViewSet):
                     elif action == 'replace':
                         # Delete the older resume and its file
                         logger.info(f"Replacing older resume: {message}")
-                        existing_resume.delete_file()
-                        existing_resume.delete()
+                        near_duplicate = self._replace_older_resume(existing_resume, near_duplicate)
                      
                     # Generate content hash and file modification date
                     temp_resume = Resume(
@@ -273,6 +332,9 @@ class ResumeViewSet(viewsets.ModelViewSet):
                         'processing_status': 'completed',
                         'is_processed': True,
                         'content_hash': content_hash,
+                        'file_hash': file_hash,
+                        'near_duplicate_of': near_duplicate,
+                        'near_duplicate_similarity': similarity if near_duplicate else None,
                         'file_creation_date': file_creation_date,
                         'email': parsed_data.get('email', '')  # No fallback needed
                     }
@@ -318,6 +380,8 @@ class ResumeViewSet(viewsets.ModelViewSet):
                         resume.set_professional_associations(parsed_data['professional_associations'])
                     if 'publications' in parsed_data:
                         resume.set_publications(parsed_data['publications'])
+                    resume.set_extraction_report(parsing_service.last_extraction)
+                    resume.set_minhash_signature(signature)
                     
                     # Save the resume with JSON fields
                     resume.save()
@@ -350,6 +414,7 @@ class ResumeViewSet(viewsets.ModelViewSet):
                     original_filename=uploaded_file.name,
                     file_path=file_path,
                     file_type=uploaded_file.name.split('.')[-1].lower(),
+                    file_hash=file_hash,
                     processing_status='pending',
                     email=''  # No email needed
                 )
@@ -419,11 +484,54 @@ class ResumeViewSet(viewsets.ModelViewSet):
         
         return Response(summary, status=status_code)
     
+    def _find_near_duplicate(self, resume_text):
+        """
+        MinHash the resume text and look up a near-duplicate among stored resumes
+        
+        Returns:
+            tuple: (signature, near-duplicate resume or None, similarity)
+        """
+        signature = minhash_signature(resume_text)
+        near_duplicate, similarity = Resume.find_near_duplicate(signature=signature)
+        if near_duplicate:
+            logger.info(f"Upload is a near-duplicate of resume {near_duplicate.id} (similarity {similarity:.2f})")
+        return signature, near_duplicate, similarity
+    
+    @staticmethod
+    def _replace_older_resume(existing_resume, near_duplicate):
+        """
+        Delete the older resume (and its file) that an upload replaces.
+        
+        Returns the near-duplicate to link the upload to: None when it is the
+        replaced resume, which find_near_duplicate and handle_duplicate_resume
+        return as separate instances of the same row.
+        """
+        if near_duplicate and near_duplicate.pk == existing_resume.pk:
+            near_duplicate = None
+        existing_resume.delete_file()
+        existing_resume.delete()
+        return near_duplicate
+    
     def _process_single_file(self, uploaded_file, parse_immediately):
         """
         Process a single file and return the result
         """
         try:
+            # SHA-256 computed by the upload handler while the file was received
+            file_hash = get_upload_hash(uploaded_file)
+            
+            # Exact re-upload: skip before saving, extracting or calling the AI
+            identical_resume = Resume.find_identical_file(file_hash)
+            if identical_resume:
+                return {
+                    'filename': uploaded_file.name,
+                    'status': 'duplicate',
+                    'resume_id': None,
+                    'message': f'Identical file: Identical file already exists for {identical_resume.full_name}',
+                    'error_details': None,
+                    'resume_data': None
+                }
+            
             # Save the uploaded file
             file_path = default_storage.save(
                 f'uploads/{uploaded_file.name}',
@@ -432,13 +540,18 @@ class ResumeViewSet(viewsets.ModelViewSet):
             
             if parse_immediately:
                 try:
-                    # Use AI parsing service to extract data
+                    # Extract text once; it is used for AI parsing and duplicate detection
                     parsing_service = ResumeParsingService()
-                    parsed_data = parsing_service.parse_resume(file_path)
-                    
-                    # Extract resume text for duplicate detection
                     resume_text = parsing_service.extract_text(file_path)
                     
+                    # Flag near-duplicates before the AI call, optionally reusing their parse
+                    signature, near_duplicate, similarity = self._find_near_duplicate(resume_text)
+                    if near_duplicate and settings.REUSE_NEAR_DUPLICATE_PARSE:
+                        parsed_data = near_duplicate.to_parsed_data()
+                    else:
+                        # Use AI parsing service to extract data
+                        parsed_data = parsing_service.parse_resume(file_path, resume_text=resume_text)
+                    
                     # Handle duplicate detection using new system
                     action, existing_resume, message = Resume.handle_duplicate_resume(
                         parsed_data, file_path, resume_text
@@ -471,8 +584,7 @@ class ResumeViewSet(viewsets.ModelViewSet):
                     elif action == 'replace':
                         # Delete the older resume and its file
                         logger.info(f"Replacing older resume: {message}")
-                        existing_resume.delete_file()
-                        existing_resume.delete()
+                        near_duplicate = self._replace_older_resume(existing_resume, near_duplicate)
                      
                     # Generate content hash and file modification date
                     temp_resume = Resume(
@@ -493,6 +605,9 @@ class ResumeViewSet(viewsets.ModelViewSet):
                         'processing_status': 'completed',
                         'is_processed': True,
                         'content_hash': content_hash,
+                        'file_hash': file_hash,
+                        'near_duplicate_of': near_duplicate,
+                        'near_duplicate_similarity': similarity if near_duplicate else None,
                         'file_creation_date': file_creation_date,
                         'email': parsed_data.get('email', '')
                     }
@@ -538,6 +653,8 @@ class ResumeViewSet(viewsets.ModelViewSet):
                         resume.set_professional_associations(parsed_data['professional_associations'])
                     if 'publications' in parsed_data:
                         resume.set_publications(parsed_data['publications'])
+                    resume.set_extraction_report(parsing_service.last_extraction)
+                    resume.set_minhash_signature(signature)
                     
                     resume.save()
                     
@@ -574,6 +691,7 @@ class ResumeViewSet(viewsets.ModelViewSet):
                     original_filename=uploaded_file.name,
                     file_path=file_path,
                     file_type=uploaded_file.name.split('.')[-1].lower(),
+                    file_hash=file_hash,
                     processing_status='pending',
                     email=f'pending_{uploaded_file.name}_{hash(uploaded_file.name)}@temp.com'
                 )
@@ -617,7 +735,8 @@ class ResumeViewSet(viewsets.ModelViewSet):
             
             # Use AI parsing service
             parsing_service = ResumeParsingService()
-            parsed_data = parsing_service.parse_resume(resume.file_path)
+            resume_text = parsing_service.extract_text(resume.file_path)
+            parsed_data = parsing_service.parse_resume(resume.file_path, resume_text=resume_text)
             
             # Update resume with simple fields from parsed data
             simple_fields = [
@@ -657,6 +776,8 @@ class ResumeViewSet(viewsets.ModelViewSet):
                 resume.set_professional_associations(parsed_data['professional_associations'])
             if 'publications' in parsed_data:
                 resume.set_publications(parsed_data['publications'])
+            resume.set_extraction_report(parsing_service.last_extraction)
+            resume.set_minhash_signature(minhash_signature(resume_text))
             
             resume.processing_status = 'completed'
             resume.is_processed = True
@@ -720,8 +841,29 @@ class ResumeViewSet(viewsets.ModelViewSet):
     def filter_options(self, request):
         """
         Get all available filter options from the entire database
+        
+        Read from Elasticsearch facet aggregations when the CV index has them,
+        otherwise collected by scanning the resumes.
         """
         try:
+            from apps.search.services import search_service
+            result = search_service.get_facets(
+                '', facets=['expertise', 'location', 'sectors', 'skills', 'experience'], size=FILTER_OPTIONS_FACET_SIZE
+            )
+            if result and any(result['facets'].values()):
+                facets = result['facets']
+                
+                def values(name):
+                    return sorted(bucket['value'] for bucket in facets.get(name, []) if bucket['count'])
+                
+                return Response({
+                    'expertise': values('expertise'),
+                    'locations': values('location'),
+                    'sectors': values('sectors'),
+                    'skills': values('skills'),
+                    'experienceLevels': values('experience')
+                })
+            
             # Get all processed resumes
             processed_resumes = Resume.objects.filter(processing_status='completed')
             
@@ -774,6 +916,25 @@ class ResumeViewSet(viewsets.ModelViewSet):
                 'experienceLevels': []
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @action(detail=False, methods=['get'])
+    def location_suggestions(self, request):
+        """
+        "Did you mean" for a location filter value (?q=Bangaldesh)
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'Query parameter q is required'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            limit = int(request.query_params.get('limit', 5))
+        except ValueError:
+            return Response({'error': 'Query parameter limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, 20))
+        return Response({
+            'query': query,
+            'suggestions': suggest_locations(query, limit=limit)
+        })
+
     @action(detail=True, methods=['get'])
     def download(self, request, pk=None):
         """
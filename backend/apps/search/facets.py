@@ -0,0 +1,82 @@
+"""
+Facet definitions for CV and file search
+Elasticsearch aggregations computed over every matching document, in the same request as the hits
+"""
+from typing import Dict, List, Tuple
+
+# Experience bands in years; keys and bounds match Resume.experience_level, where
+# 0 or unknown years is 'Not specified' (indexed years have at most one decimal)
+EXPERIENCE_BANDS = [
+    {'key': 'Not specified', 'to': 0.1},
+    {'key': 'Junior', 'from': 0.1, 'to': 2},
+    {'key': 'Mid-level', 'from': 2, 'to': 5},
+    {'key': 'Senior', 'from': 5, 'to': 10},
+    {'key': 'Expert', 'from': 10},
+]
+
+FILE_SIZE_BUCKETS = [
+    {'key': 'under_100kb', 'to': 102400},
+    {'key': '100kb_to_1mb', 'from': 102400, 'to': 1048576},
+    {'key': '1mb_to_10mb', 'from': 1048576, 'to': 10485760},
+    {'key': 'over_10mb', 'from': 10485760},
+]
+
+# Facet name -> (aggregation type, aggregation parameters)
+CV_FACETS: Dict[str, Tuple[str, Dict]] = {
+    'skills': ('terms', {'field': 'skill_keywords', 'size': 20}),
+    'expertise': ('terms', {'field': 'expertise_areas', 'size': 20}),
+    'sectors': ('terms', {'field': 'sectors', 'size': 20}),
+    'location': ('terms', {'field': 'location.raw', 'size': 20}),
+    'experience': ('range', {'field': 'years_of_experience', 'ranges': EXPERIENCE_BANDS, 'missing': 0}),
+    'file_type': ('terms', {'field': 'file_type', 'size': 10}),
+}
+
+FILE_FACETS: Dict[str, Tuple[str, Dict]] = {
+    'extension': ('terms', {'field': 'file_extension', 'size': 20}),
+    'directory': ('terms', {'field': 'directory_path', 'size': 20}),
+    'size': ('range', {'field': 'file_size', 'ranges': FILE_SIZE_BUCKETS}),
+    'modified': ('date_histogram', {
+        'field': 'modified_date', 'calendar_interval': 'month', 'format': 'yyyy-MM', 'min_doc_count': 1,
+    }),
+}
+
+
+def parse_facet_names(value, definitions: Dict) -> List[str]:
+    """
+    Facet names requested as 'skills,location', a list, or 'all'.
+    Unknown names are ignored.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    names = [name.strip() for name in value if name and name.strip()]
+    if 'all' in names:
+        return list(definitions)
+    return [name for name in names if name in definitions]
+
+
+def add_facets(search, definitions: Dict, names: List[str], size: int = None):
+    """Add one aggregation per facet (named facet_<name>); `size` overrides the terms facet sizes"""
+    for name in names:
+        agg_type, params = definitions[name]
+        params = dict(params)
+        if size and agg_type == 'terms':
+            params['size'] = size
+        search.aggs.bucket(f'facet_{name}', agg_type, **params)
+    return search
+
+
+def format_facets(response, names: List[str]) -> Dict[str, List[Dict]]:
+    """Buckets of each facet as [{'value': ..., 'count': ...}], in Elasticsearch order"""
+    aggregations = getattr(response, 'aggregations', None)
+    facets = {}
+    for name in names:
+        aggregation = getattr(aggregations, f'facet_{name}', None) if aggregations is not None else None
+        if aggregation is None:
+            continue
+        facets[name] = [
+            {'value': getattr(bucket, 'key_as_string', bucket.key), 'count': bucket.doc_count}
+            for bucket in aggregation.buckets
+        ]
+    return facets
@@ -2,29 +2,27 @@
 Pure File Document for independent file indexing
 This document class handles file indexing without Django model dependencies
 """
-from elasticsearch_dsl import Document, Index, Text, Keyword, Integer, Date
+from elasticsearch_dsl import Document, Index, Text, Keyword, Integer, Float, Date, Boolean
 from django.conf import settings
 import os
 import hashlib
 from datetime import datetime
 import logging
 
+from apps.ai_parser.extraction_pool import run_isolated
+from .indices import FILE_INDEX_ALIAS, content_analyzer, index_settings
+
 logger = logging.getLogger(__name__)
 
-# Create the file index
-file_index = Index('file_index')
-file_index.settings(
-    number_of_shards=1,
-    number_of_replicas=0,
-    analysis={
-        'analyzer': {
-            'file_analyzer': {
-                'type': 'standard',
-                'stopwords': '_english_'
-            }
-        }
-    }
-)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Characters of extracted text stored in content_head for result previews
+CONTENT_HEAD_LENGTH = 300
+
+# Create the file index (alias of file_index_v<N>, see INDEX_VERSIONS): every indexed
+# file once per content hash, CVs included
+file_index = Index(FILE_INDEX_ALIAS)
+file_index.settings(**index_settings())
 
 class FileDocument(Document):
     """
@@ -32,17 +30,16 @@ class FileDocument(Document):
     This indexes actual files directly, independent of database records
     """
     
-    # File Identity
-    file_path = Keyword()                      # Full path to file
-    filename = Text(analyzer='standard')       # Filename with text analysis
+    # File Identity (doc_values off where a field is never sorted or aggregated)
+    file_path = Keyword(doc_values=False)      # Full path to file
+    filename = Text(analyzer=content_analyzer, fields={'raw': Keyword()})  # Filename with text analysis
     file_extension = Keyword()                 # .pdf, .docx, etc.
-    file_hash = Keyword()                      # SHA-256 hash for deduplication
+    file_hash = Keyword(doc_values=False)      # SHA-256 hash for deduplication
     
-    # File Content - The main searchable content
-    content = Text(
-        analyzer='standard',
-        search_analyzer='standard'
-    )
+    # File Content - The main searchable content; offsets let the unified
+    # highlighter read match positions from the index instead of re-analyzing it
+    content = Text(analyzer=content_analyzer, index_options='offsets')
+    content_head = Text(index=False)           # Start of content, returned instead of the full text
     
     # File Physical Properties
     file_size = Integer()                      # File size in bytes
@@ -57,16 +54,40 @@ class FileDocument(Document):
     
     # Directory Structure
     directory_path = Keyword()                 # Directory containing file
-    relative_path = Keyword()                  # Relative path from base
+    relative_path = Keyword(doc_values=False)  # Relative path from base
+    
+    # Set when the file was indexed as a file (not only as a CV upload): the
+    # document then stays in file search after its CVs are deleted
+    indexed_as_file = Boolean()
+    
+    # CV fields (apps.search.documents.CV_FIELDS), present only when the file is a CV
+    resume_ids = Keyword(multi=True)           # Resumes whose file this is
+    name = Text(analyzer=content_analyzer, fields={'raw': Keyword()})
+    email = Keyword(doc_values=False)
+    phone = Keyword(doc_values=False)
+    skills = Text(analyzer=content_analyzer, index_options='offsets')
+    experience = Text(analyzer=content_analyzer, index_options='offsets')
+    education = Text(analyzer=content_analyzer, index_options='offsets')
+    summary = Text(analyzer=content_analyzer)
+    location = Text(analyzer=content_analyzer, fields={'raw': Keyword()})
+    current_employer = Text(analyzer=content_analyzer, fields={'raw': Keyword()})
+    years_of_experience = Float()
+    skill_keywords = Keyword(multi=True)       # Exact values for filters and facets
+    expertise_areas = Keyword(multi=True)
+    sectors = Keyword(multi=True)
+    file_type = Keyword()                      # Resume.file_type
+    linkedin_profile = Keyword(index=False, doc_values=False)
+    languages_spoken = Text(analyzer=content_analyzer)
+    professional_certifications = Text(analyzer=content_analyzer)
 
     class Index:
-        name = 'file_index'
+        name = FILE_INDEX_ALIAS
 
     @classmethod
-    def create_from_file(cls, file_path: str, base_directory: str = None):
+    def create_from_file(cls, file_path: str, base_directory: str = None, file_hash: str = None):
         """
         Create a FileDocument from a physical file
-        This is the main method to index files
+        This is the main method to index files (pass file_hash if already computed)
         """
         try:
             if not os.path.exists(file_path):
@@ -79,12 +100,14 @@ class FileDocument(Document):
             file_ext = os.path.splitext(filename)[1].lower()
             
             # Generate file hash
-            file_hash = cls.generate_file_hash(file_path)
+            file_hash = file_hash or cls.generate_file_hash(file_path)
             if not file_hash:
                 return None
                 
-            # Extract text content
-            content = cls.extract_text_from_file(file_path)
+            # Extract text content in a worker process (timeouts and memory caps)
+            content = run_isolated(
+                'apps.search.file_documents:FileDocument.extract_text_from_file', file_path, default=''
+            )
             if not content:
                 logger.warning(f"No content extracted from: {file_path}")
                 content = ""
@@ -113,6 +136,7 @@ class FileDocument(Document):
                 file_extension=file_ext,
                 file_hash=file_hash,
                 content=content,
+                content_head=content[:CONTENT_HEAD_LENGTH],
                 file_size=file_stat.st_size,
                 created_date=datetime.fromtimestamp(file_stat.st_ctime),
                 modified_date=datetime.fromtimestamp(file_stat.st_mtime),
@@ -135,8 +159,8 @@ class FileDocument(Document):
         try:
             hash_sha256 = hashlib.sha256()
             with open(file_path, "rb") as f:
-                # Read file in chunks to handle large files
-                for chunk in iter(lambda: f.read(4096), b""):
+                # Read file in 1 MB chunks to handle large files with few syscalls
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
                     hash_sha256.update(chunk)
             return hash_sha256.hexdigest()
         except Exception as e:
@@ -3,23 +3,65 @@ Pure File Search Service
 Handles searching through indexed files directly (not database records)
 """
 import os
+import re
+import time
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-from django.core.cache import cache
 from django.conf import settings
 from elasticsearch import Elasticsearch
 from elasticsearch_dsl import Search, Q
 from .file_documents import FileDocument
+from .documents import CV_FIELDS, resume_file_path, resume_search_fields
+from .facets import FILE_FACETS, add_facets, format_facets
+from .suggestions import suggestion_service, FILE_SUGGESTION_KINDS
+from .result_cache import SearchResultCache, bump_index_generation
+from .indices import FILE_INDEX_ALIAS, create_versioned_index, get_alias_indices
+from .pagination import InvalidCursorError, execute_cursor_page, iter_all_hits
 
 logger = logging.getLogger(__name__)
 
+# _source fields returned with each hit; the full extracted content stays in ES
+FILE_HIT_FIELDS = [
+    'filename', 'file_path', 'relative_path', 'file_extension', 'file_size', 'created_date',
+    'modified_date', 'indexed_date', 'page_count', 'word_count', 'language', 'directory_path',
+    'content_head', 'resume_ids',
+]
+
+# Painless: add params.resume_id as the last entry of resume_ids and write its CV fields
+_ATTACH_RESUME_SCRIPT = '''
+if (ctx._source.resume_ids == null) { ctx._source.resume_ids = new ArrayList(); }
+def rid = params.resume_id;
+ctx._source.resume_ids.removeIf(id -> id == rid);
+ctx._source.resume_ids.add(rid);
+ctx._source.putAll(params.fields);
+'''
+
+# Painless (update_by_query): drop params.resume_id from resume_ids. A document left
+# without resumes loses its CV fields, and is deleted unless it was indexed as a file
+_DETACH_RESUME_SCRIPT = '''
+def rid = params.resume_id;
+ctx._source.resume_ids.removeIf(id -> id == rid);
+if (ctx._source.resume_ids.isEmpty()) {
+    if (ctx._source.indexed_as_file == true) {
+        for (field in params.cv_fields) { ctx._source.remove(field); }
+    } else {
+        ctx.op = 'delete';
+    }
+}
+'''
+
+_HIGHLIGHT_TAG_RE = re.compile(r'</?mark>')
+
 class FileSearchService:
     """Service for searching indexed files directly"""
     
     def __init__(self):
         self.es_client = self._get_es_client()
-        self.index_name = 'file_index'
+        self.index_name = FILE_INDEX_ALIAS
+        self.result_cache = SearchResultCache('file_search', self.index_name)
+        self._index_stats = None
+        self._index_stats_time = 0.0
     
     def _get_es_client(self):
         """Get Elasticsearch client"""
@@ -37,15 +79,19 @@ class FileSearchService:
             logger.error(f"Elasticsearch connection error: {e}")
             return None
     
-    def index_file(self, file_path: str, base_directory: str = None) -> bool:
-        """Index a single file"""
+    def index_file(self, file_path: str, base_directory: str = None, file_hash: str = None) -> bool:
+        """Index a single file (pass file_hash if already computed)"""
         try:
             if not self.es_client:
                 return False
                 
-            doc = FileDocument.create_from_file(file_path, base_directory)
+            doc = FileDocument.create_from_file(file_path, base_directory, file_hash=file_hash)
             if doc:
-                doc.save(using=self.es_client, index=self.index_name)
+                doc.indexed_as_file = True
+                # Partial upsert: CV fields already on this content hash's document are kept
+                self.es_client.update(index=self.index_name, id=doc.meta.id,
+                                      body={'doc': doc.to_dict(), 'doc_as_upsert': True})
+                bump_index_generation(self.index_name)
                 logger.info(f"Indexed file: {file_path}")
                 return True
             return False
@@ -53,6 +99,93 @@ class FileSearchService:
             logger.error(f"Error indexing file {file_path}: {e}")
             return False
     
+    def index_resume(self, resume, index: str = None) -> Dict[str, Any]:
+        """
+        Write a CV to the corpus: its CV fields on the document of its file.
+        The file is extracted only when no document with its content hash
+        exists yet, so a CV costs one extraction and one copy of its text.
+        The resume is detached from documents of an earlier file.
+        
+        Args:
+            resume: Resume instance
+            index: Index to write to (default: the corpus alias)
+            
+        Returns:
+            dict with action ('updated' or 'created'), doc_id, took_ms and
+            detached_from: resumes that shared an earlier document of this one
+            and must be re-indexed if their fields were the ones shown on it
+        """
+        index = index or self.index_name
+        started = time.perf_counter()
+        resume_id = str(resume.id)
+        fields = resume_search_fields(resume)
+        file_path = resume_file_path(resume)
+        file_hash = FileDocument.generate_file_hash(file_path) if file_path else None
+        
+        if file_hash and self.es_client.exists(index=index, id=file_hash):
+            # Already extracted (uploaded before, or indexed as a plain file)
+            doc_id = file_hash
+            self.es_client.update(index=index, id=doc_id, retry_on_conflict=3, body={
+                'script': {'source': _ATTACH_RESUME_SCRIPT, 'params': {'resume_id': resume_id, 'fields': fields}}
+            })
+            action = 'updated'
+        else:
+            doc = FileDocument.create_from_file(file_path, os.path.dirname(file_path), file_hash=file_hash) if file_hash else None
+            if doc is None:
+                # No readable file: the CV is searchable by its fields only
+                doc = FileDocument(
+                    meta={'id': f"resume-{resume.id}"},
+                    filename=resume.original_filename or '',
+                    file_path=resume.file_path or '',
+                    content='',
+                    content_head=''
+                )
+            doc_id = doc.meta.id
+            for name, value in fields.items():
+                setattr(doc, name, value)
+            doc.resume_ids = [resume_id]
+            doc.save(using=self.es_client, index=index)
+            action = 'created'
+        
+        detached_from = self._detach_resume(index, resume_id, keep_doc_id=doc_id)
+        bump_index_generation(self.index_name)
+        
+        took_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(f"Indexed CV {resume.id} ({action} {doc_id}) in {took_ms} ms")
+        return {'action': action, 'doc_id': doc_id, 'took_ms': took_ms, 'detached_from': detached_from}
+    
+    def delete_resume_from_index(self, resume_id) -> List[str]:
+        """
+        Remove a CV from the corpus. Its document keeps serving file search if
+        the file was indexed as a file, and other CVs with the same file.
+        
+        Returns:
+            Resumes still on the deleted CV's document; re-index them so the
+            document shows their fields
+        """
+        remaining = self._detach_resume(self.index_name, str(resume_id))
+        bump_index_generation(self.index_name)
+        return remaining
+    
+    def _detach_resume(self, index: str, resume_id: str, keep_doc_id: str = None) -> List[str]:
+        """Detach a resume from its documents (except keep_doc_id); returns the other resumes on them"""
+        query = {'bool': {'filter': [{'term': {'resume_ids': resume_id}}]}}
+        if keep_doc_id:
+            query['bool']['must_not'] = [{'ids': {'values': [keep_doc_id]}}]
+        
+        response = self.es_client.search(index=index, body={'query': query, '_source': ['resume_ids'], 'size': 100})
+        hits = response['hits']['hits']
+        if not hits:
+            return []
+        
+        self.es_client.update_by_query(index=index, conflicts='proceed', refresh=True, body={
+            'query': query,
+            'script': {'source': _DETACH_RESUME_SCRIPT, 'params': {'resume_id': resume_id, 'cv_fields': CV_FIELDS}},
+        })
+        return sorted({
+            other for hit in hits for other in hit['_source'].get('resume_ids', []) if other != resume_id
+        })
+    
     def index_directory(self, directory_path: str, recursive: bool = True, 
                        file_extensions: List[str] = None) -> Dict[str, Any]:
         """Index all files in a directory"""
@@ -70,12 +203,13 @@ class FileSearchService:
                     file_ext = os.path.splitext(file)[1].lower()
                     
                     if file_ext in file_extensions:
-                        # Check if file already indexed (by hash)
-                        if self.is_file_indexed(file_path):
+                        # Check if file already indexed (by hash), hashing the file only once
+                        file_hash = FileDocument.generate_file_hash(file_path)
+                        if self.is_file_indexed(file_path, file_hash=file_hash):
                             skipped_count += 1
                             continue
                             
-                        if self.index_file(file_path, directory_path):
+                        if self.index_file(file_path, directory_path, file_hash=file_hash):
                             indexed_count += 1
                         else:
                             failed_count += 1
@@ -94,98 +228,43 @@ class FileSearchService:
         }
     
     def search_files(self, query: str, filters: Dict = None, 
-                    page: int = 1, page_size: int = 20) -> Dict[str, Any]:
-        """Search indexed files"""
+                    page: int = 1, page_size: int = 20, facets: List[str] = None) -> Dict[str, Any]:
+        """Search indexed files (facets: names from FILE_FACETS to aggregate over all matches)"""
         if not self.es_client or not query.strip():
             return self._empty_result()
             
-        # Check cache
-        cache_key = self._generate_cache_key(query, filters, page, page_size)
-        cached_result = cache.get(cache_key)
-        if cached_result:
-            return cached_result
-            
+        params = {'query': query, 'filters': filters, 'page': page, 'page_size': page_size, 'facets': facets}
         try:
-            search = Search(using=self.es_client, index=self.index_name)
-            
-            # Build query - search in file content and filename
-            search = search.query(
-                'multi_match',
-                query=query,
-                fields=[
-                    'content^3.0',           # File content (highest priority)
-                    'filename^2.0',          # Filename
-                    'relative_path^1.0'      # File path
-                ],
-                type='best_fields',
-                minimum_should_match='75%'
+            return self.result_cache.get_or_compute(
+                params, lambda: self._execute_file_search(query, filters, page, page_size, facets)
             )
-            
-            # Apply filters
-            if filters:
-                search = self._apply_file_filters(search, filters)
-            
-            # Add highlighting
-            search = search.highlight(
-                'content',
-                'filename', 
-                'relative_path',
-                fragment_size=200,
-                number_of_fragments=3,
-                pre_tags=['<mark>'],
-                post_tags=['</mark>']
-            )
-            
-            # Pagination
-            start = (page - 1) * page_size
-            search = search[start:start + page_size]
-            
-            # Execute search
-            response = search.execute()
-            
-            # Format results
-            result = self._format_file_results(response, query)
-            
-            # Cache results
-            cache.set(cache_key, result, 300)  # 5 minutes
-            
-            return result
-            
         except Exception as e:
             logger.error(f"File search failed for query '{query}': {e}")
             return self._empty_result()
     
+    def _execute_file_search(self, query: str, filters: Dict, page: int, page_size: int,
+                             facets: List[str]) -> Dict[str, Any]:
+        """Run a file search against Elasticsearch (uncached; errors propagate so they are not cached)"""
+        search = self._build_file_search(query, filters, facets)
+        
+        # Pagination
+        start = (page - 1) * page_size
+        search = search[start:start + page_size]
+        
+        # Execute search
+        response = search.execute()
+        
+        # Format results
+        return self._format_file_results(response, query, facets=facets)
+    
     def boolean_search_files(self, query: str, filters: Dict = None,
-                           page: int = 1, page_size: int = 20) -> Dict[str, Any]:
+                           page: int = 1, page_size: int = 20, facets: List[str] = None) -> Dict[str, Any]:
         """Boolean search in files with AND/OR/NOT operators"""
         if not self.es_client or not query.strip():
             return self._empty_result()
             
         try:
-            search = Search(using=self.es_client, index=self.index_name)
-            
-            # Build boolean query
-            search = search.query(
-                'query_string',
-                query=query,
-                fields=['content^3.0', 'filename^2.0', 'relative_path^1.0'],
-                default_operator='AND'
-            )
-            
-            # Apply filters
-            if filters:
-                search = self._apply_file_filters(search, filters)
-                
-            # Add highlighting
-            search = search.highlight(
-                'content',
-                'filename',
-                'relative_path',
-                fragment_size=200,
-                number_of_fragments=3,
-                pre_tags=['<mark>'],
-                post_tags=['</mark>']
-            )
+            search = self._build_file_search(query, filters, facets, search_type='boolean')
             
             # Pagination
             start = (page - 1) * page_size
@@ -194,12 +273,104 @@ class FileSearchService:
             # Execute search
             response = search.execute()
             
-            return self._format_file_results(response, query, search_type='boolean')
+            return self._format_file_results(response, query, search_type='boolean', facets=facets)
             
         except Exception as e:
             logger.error(f"Boolean file search failed for query '{query}': {e}")
             return self._empty_result()
     
+    def search_files_cursor(self, query: str, filters: Dict = None, cursor: str = None,
+                            page_size: int = 20, facets: List[str] = None,
+                            search_type: str = 'basic') -> Dict[str, Any]:
+        """
+        File search with cursor pagination (search_after in a point-in-time), for
+        pages beyond the from/size window. The result carries next_cursor (None on
+        the last page). Raises InvalidCursorError for a malformed or expired cursor.
+        """
+        if not self.es_client or not query.strip():
+            return dict(self._empty_result(), next_cursor=None)
+        
+        try:
+            search = self._build_file_search(query, filters, facets, search_type=search_type)
+            response, next_cursor = execute_cursor_page(
+                search, self.es_client, self.index_name, cursor, page_size
+            )
+            result = self._format_file_results(response, query, search_type=search_type, facets=facets)
+            result['next_cursor'] = next_cursor
+            return result
+            
+        except InvalidCursorError:
+            raise
+        except Exception as e:
+            logger.error(f"Cursor file search failed for query '{query}': {e}")
+            return dict(self._empty_result(), next_cursor=None)
+    
+    def iter_matching_files(self, query: str, filters: Dict = None, search_type: str = 'basic',
+                            batch_size: int = 1000):
+        """Metadata of every file matching the query (all files if empty) and filters, for exports"""
+        search = Search(using=self.es_client, index=self.index_name)
+        if query.strip():
+            search = search.query(self._file_query(query, search_type))
+        if filters:
+            search = self._apply_file_filters(search, filters)
+        search = search.source(includes=FILE_HIT_FIELDS)
+        return iter_all_hits(search, self.es_client, self.index_name, batch_size)
+    
+    def _file_query(self, query: str, search_type: str = 'basic') -> Q:
+        """Full-text query over content, filename and path"""
+        if search_type == 'boolean':
+            return Q(
+                'query_string',
+                query=query,
+                fields=['content^3.0', 'filename^2.0', 'relative_path^1.0'],
+                default_operator='AND'
+            )
+        return Q(
+            'multi_match',
+            query=query,
+            fields=[
+                'content^3.0',           # File content (highest priority)
+                'filename^2.0',          # Filename
+                'relative_path^1.0'      # File path
+            ],
+            type='best_fields',
+            minimum_should_match='75%'
+        )
+    
+    def _build_file_search(self, query: str, filters: Dict, facets: List[str],
+                           search_type: str = 'basic') -> Search:
+        """Query, filters, highlighting and facets of a file search, without pagination"""
+        search = Search(using=self.es_client, index=self.index_name)
+        
+        # Build query - search in file content and filename
+        search = search.query(self._file_query(query, search_type))
+        
+        # Apply filters
+        if filters:
+            search = self._apply_file_filters(search, filters)
+        
+        # Return metadata only; previews come from the highlights and content_head
+        search = search.source(includes=FILE_HIT_FIELDS)
+        
+        # Refresh stale index statistics in this same request
+        search = self._with_index_stats(search)
+        
+        # Facet counts over all matches, in the same request
+        if facets:
+            search = add_facets(search, FILE_FACETS, facets)
+        
+        # Add highlighting
+        return search.highlight(
+            'content',
+            'filename', 
+            'relative_path',
+            type='unified',          # Uses the offsets stored for content
+            fragment_size=200,
+            number_of_fragments=3,
+            pre_tags=['<mark>'],
+            post_tags=['</mark>']
+        )
+    
     def _apply_file_filters(self, search: Search, filters: Dict) -> Search:
         """Apply filters specific to files"""
         if filters.get('file_extension'):
@@ -226,11 +397,14 @@ class FileSearchService:
             
         return search
     
-    def _format_file_results(self, response, query: str, search_type: str = 'basic') -> Dict[str, Any]:
+    def _format_file_results(self, response, query: str, search_type: str = 'basic',
+                             facets: List[str] = None) -> Dict[str, Any]:
         """Format file search results"""
+        index_stats = self._update_index_stats(response)
         files = []
         
         for hit in response:
+            highlights = hit.meta.highlight.to_dict() if hasattr(hit.meta, 'highlight') else {}
             file_data = {
                 'file_id': hit.meta.id,
                 'score': hit.meta.score,
@@ -247,17 +421,19 @@ class FileSearchService:
                 'word_count': getattr(hit, 'word_count', 0),
                 'language': getattr(hit, 'language', ''),
                 'directory': getattr(hit, 'directory_path', ''),
-                'content_preview': self._get_content_preview(getattr(hit, 'content', ''), query),
-                'highlights': {}
+                'resume_ids': list(getattr(hit, 'resume_ids', [])),  # Set when the file is a CV
+                'content_preview': self._get_content_preview(highlights, getattr(hit, 'content_head', '')),
+                'highlights': highlights
             }
-            
-            # Add highlights
-            if hasattr(hit.meta, 'highlight'):
-                file_data['highlights'] = hit.meta.highlight.to_dict()
-                
             files.append(file_data)
         
-        return {
+        facet_counts = format_facets(response, facets) if facets else {}
+        if 'extension' in facet_counts:
+            extensions_found = [bucket['value'] for bucket in facet_counts['extension']]
+        else:
+            extensions_found = list(set([f.get('file_extension', '') for f in files if f.get('file_extension')]))
+        
+        result = {
             'files': files,
             'total_files': response.hits.total.value if hasattr(response.hits.total, 'value') else len(files),
             'max_score': response.hits.max_score,
@@ -266,52 +442,60 @@ class FileSearchService:
                 'query': query,
                 'search_type': search_type,
                 'index_name': self.index_name,
-                'total_indexed_files': self.get_total_indexed_files(),
-                'file_extensions_found': list(set([f.get('file_extension', '') for f in files if f.get('file_extension')])),
+                'total_indexed_files': index_stats['total_files'],
+                'indexed_files_by_extension': index_stats['extensions'],
+                'file_extensions_found': extensions_found,
                 'categories_found': list(set([f.get('file_category', '') for f in files if f.get('file_category')])),
                 'search_time_ms': response.took
             }
         }
+        if facets:
+            result['facets'] = facet_counts
+        return result
     
-    def get_file_suggestions(self, partial_query: str, limit: int = 10) -> List[str]:
-        """Get file search suggestions"""
-        if not self.es_client or len(partial_query) < 2:
-            return []
-            
+    def get_facets(self, query: str = '', filters: Dict = None,
+                   facets: List[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Facet counts without hits (size=0) for a query, or the whole index when
+        the query is empty. Returns None if Elasticsearch failed.
+        """
+        if not self.es_client:
+            return None
+        
+        facets = facets or list(FILE_FACETS)
         try:
             search = Search(using=self.es_client, index=self.index_name)
+            if query.strip():
+                search = search.query(
+                    'multi_match',
+                    query=query,
+                    fields=['content^3.0', 'filename^2.0', 'relative_path^1.0'],
+                    type='best_fields',
+                    minimum_should_match='75%'
+                )
+            if filters:
+                search = self._apply_file_filters(search, filters)
+            search = add_facets(search, FILE_FACETS, facets)[:0]
             
-            # Search in filenames and content for suggestions
-            search = search.query(
-                'match_phrase_prefix',
-                content=partial_query
-            )
-            
-            search = search.source(['filename', 'content'])[:limit]
             response = search.execute()
-            
-            suggestions = set()
-            for hit in response:
-                # Extract relevant phrases from content
-                content = getattr(hit, 'content', '')
-                words = content.lower().split()
-                
-                # Find phrases starting with partial query
-                query_lower = partial_query.lower()
-                for i, word in enumerate(words):
-                    if word.startswith(query_lower):
-                        phrase = ' '.join(words[i:i+3])  # 3-word phrases
-                        if len(phrase) > len(partial_query):
-                            suggestions.add(phrase)
-                            
-                if len(suggestions) >= limit:
-                    break
-                    
-            return list(suggestions)[:limit]
-            
+            return {
+                'facets': format_facets(response, facets),
+                'total_files': response.hits.total.value if hasattr(response.hits.total, 'value') else 0,
+                'took': response.took
+            }
         except Exception as e:
-            logger.error(f"File suggestions failed: {e}")
+            logger.error(f"File facet query failed for '{query}': {e}")
+            return None
+    
+    def get_file_suggestions(self, partial_query: str, limit: int = 10) -> List[str]:
+        """Most common filenames starting with the partial query (completion index)"""
+        if len(partial_query) < 2:
             return []
+        
+        suggestions = suggestion_service.suggest(partial_query, FILE_SUGGESTION_KINDS, limit)
+        if suggestions is None:
+            return []
+        return [suggestion['value'] for suggestion in suggestions]
     
     def get_system_status(self) -> Dict[str, Any]:
         """Get file search system status"""
@@ -330,14 +514,17 @@ class FileSearchService:
                 'elasticsearch_connected': True,
                 'file_search_ready': index_exists,
                 'index_name': self.index_name,
-                'total_files': self.get_total_indexed_files() if index_exists else 0
+                'total_files': self.get_total_indexed_files() if index_exists else 0,
+                'result_cache': self.result_cache.stats()
             }
             
             if index_exists:
+                # Keyed by the versioned index behind the alias; '_all' sums them
                 index_stats = self.es_client.indices.stats(index=self.index_name)
                 status.update({
-                    'index_size_bytes': index_stats['indices'][self.index_name]['total']['store']['size_in_bytes'],
-                    'index_size_mb': round(index_stats['indices'][self.index_name]['total']['store']['size_in_bytes'] / 1048576, 2)
+                    'index_versions': get_alias_indices(self.es_client, self.index_name),
+                    'index_size_bytes': index_stats['_all']['total']['store']['size_in_bytes'],
+                    'index_size_mb': round(index_stats['_all']['total']['store']['size_in_bytes'] / 1048576, 2)
                 })
                 
             return status
@@ -350,6 +537,32 @@ class FileSearchService:
                 'error': str(e)
             }
     
+    def _with_index_stats(self, search: Search) -> Search:
+        """
+        Add a global aggregation (total files and per-extension counts, independent
+        of the query) when the cached index statistics are older than
+        FILE_INDEX_STATS_TTL, so they never cost a separate request.
+        """
+        ttl = getattr(settings, 'FILE_INDEX_STATS_TTL', 60)
+        if self._index_stats is not None and time.monotonic() - self._index_stats_time < ttl:
+            return search
+        search.aggs.bucket('index_stats', 'global').bucket(
+            'extensions', 'terms', field='file_extension', size=100
+        )
+        return search
+    
+    def _update_index_stats(self, response) -> Dict[str, Any]:
+        """Cache the statistics aggregated by _with_index_stats and return the current ones"""
+        aggregations = getattr(response, 'aggregations', None)
+        if aggregations is not None and hasattr(aggregations, 'index_stats'):
+            stats = aggregations.index_stats
+            self._index_stats = {
+                'total_files': stats.doc_count,
+                'extensions': {bucket.key: bucket.doc_count for bucket in stats.extensions.buckets},
+            }
+            self._index_stats_time = time.monotonic()
+        return self._index_stats or {'total_files': 0, 'extensions': {}}
+    
     def get_total_indexed_files(self) -> int:
         """Get total number of indexed files"""
         try:
@@ -360,10 +573,23 @@ class FileSearchService:
         except:
             return 0
     
-    def is_file_indexed(self, file_path: str) -> bool:
+    def get_indexed_content(self, file_path: str) -> Optional[str]:
+        """Extracted text stored for a file, or None if the file is not indexed"""
+        try:
+            if not self.es_client:
+                return None
+            search = Search(using=self.es_client, index=self.index_name)
+            search = search.filter('term', file_path=file_path).source(includes=['content'])[:1]
+            response = search.execute()
+            return response.hits[0].content if response.hits else None
+        except Exception as e:
+            logger.warning(f"Could not read indexed content for {file_path}: {e}")
+            return None
+    
+    def is_file_indexed(self, file_path: str, file_hash: str = None) -> bool:
         """Check if a file is already indexed"""
         try:
-            file_hash = FileDocument.generate_file_hash(file_path)
+            file_hash = file_hash or FileDocument.generate_file_hash(file_path)
             if not file_hash:
                 return False
                 
@@ -379,6 +605,7 @@ class FileSearchService:
             file_hash = FileDocument.generate_file_hash(file_path)
             if file_hash:
                 self.es_client.delete(index=self.index_name, id=file_hash)
+                bump_index_generation(self.index_name)
                 return True
             return False
         except Exception as e:
@@ -386,40 +613,32 @@ class FileSearchService:
             return False
     
     def create_file_index(self) -> bool:
-        """Create the file index"""
+        """
+        Create the file index (file_index_v<N> behind the file_index alias) if it
+        is missing. A live index is never dropped; rebuild one with
+        `manage.py reindex_search --index files`.
+        """
         try:
-            FileDocument._index.delete(using=self.es_client, ignore=404)
-            FileDocument.init(using=self.es_client)
+            create_versioned_index(self.es_client, FileDocument, FILE_INDEX_ALIAS)
             return True
         except Exception as e:
             logger.error(f"Failed to create file index: {e}")
             return False
     
-    def _get_content_preview(self, content: str, query: str, max_length: int = 300) -> str:
-        """Get content preview around query terms"""
-        if not content:
-            return ""
-            
-        query_lower = query.lower()
-        content_lower = content.lower()
-        
-        # Find first occurrence of query
-        index = content_lower.find(query_lower)
-        if index == -1:
-            # Return beginning of content if query not found
-            return content[:max_length] + ('...' if len(content) > max_length else '')
-        
-        # Get text around the query
-        start = max(0, index - 100)
-        end = min(len(content), index + max_length - 100)
+    def _get_content_preview(self, highlights: Dict, content_head: str, max_length: int = 300) -> str:
+        """
+        Plain-text preview for a hit: the first content highlight fragment
+        (text around the match), or the stored start of the content when only
+        the filename or path matched.
+        """
+        fragments = highlights.get('content')
+        if fragments:
+            preview = _HIGHLIGHT_TAG_RE.sub('', fragments[0]).strip()
+            return '...' + preview + '...'
         
-        preview = content[start:end]
-        if start > 0:
-            preview = '...' + preview
-        if end < len(content):
-            preview = preview + '...'
-            
-        return preview
+        if not content_head:
+            return ""
+        return content_head[:max_length] + ('...' if len(content_head) >= max_length else '')
     
     def _format_file_size(self, bytes_size: int) -> str:
         """Format file size in human readable format"""
@@ -434,12 +653,6 @@ class FileSearchService:
         
         return f"{bytes_size:.1f} {sizes[i]}"
     
-    def _generate_cache_key(self, query: str, filters: Dict, page: int, page_size: int) -> str:
-        """Generate cache key for search results"""
-        import hashlib
-        key_data = f"file_search:{query}:{str(filters)}:{page}:{page_size}"
-        return hashlib.md5(key_data.encode()).hexdigest()
-    
     def _empty_result(self) -> Dict[str, Any]:
         """Return empty search result"""
         return {
@@ -452,6 +665,7 @@ class FileSearchService:
                 'search_type': 'empty',
                 'index_name': self.index_name,
                 'total_indexed_files': 0,
+                'indexed_files_by_extension': {},
                 'file_extensions_found': [],
                 'categories_found': [],
                 'search_time_ms': 0
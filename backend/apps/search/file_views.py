@@ -1,12 +1,13 @@
 """File-specific API endpoints for pure file indexing and searching"""
 import os
+import json
 import logging
 import mimetypes
 import tempfile
 import subprocess
 from datetime import datetime
 from typing import List, Dict, Any
-from django.http import JsonResponse, FileResponse, HttpResponse
+from django.http import JsonResponse, FileResponse, HttpResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.conf import settings
@@ -16,6 +17,9 @@ from rest_framework.authentication import SessionAuthentication
 from rest_framework.response import Response
 from rest_framework import status
 from .file_search_service import FileSearchService
+from .facets import FILE_FACETS, parse_facet_names
+from .pagination import InvalidCursorError, MAX_RESULT_WINDOW
+from apps.resumes.upload_handlers import get_upload_hash, UPLOAD_CHUNK_SIZE
 
 logger = logging.getLogger(__name__)
 file_service = FileSearchService()
@@ -225,6 +229,27 @@ def get_file_info(request):
             'message': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def _get_file_filters(data) -> Dict[str, Any]:
+    """File search filters from request data"""
+    filters = {}
+    if data.get('file_extension'):
+        filters['file_extension'] = data['file_extension']
+    if data.get('file_category'):
+        filters['file_category'] = data['file_category']
+    if data.get('min_size'):
+        filters['min_size'] = int(data['min_size'])
+    if data.get('max_size'):
+        filters['max_size'] = int(data['max_size'])
+    if data.get('directory'):
+        filters['directory'] = data['directory']
+    if data.get('date_from'):
+        filters['date_from'] = data['date_from']
+    if data.get('date_to'):
+        filters['date_to'] = data['date_to']
+    if data.get('language'):
+        filters['language'] = data['language']
+    return filters
+
 @csrf_exempt
 @api_view(['POST', 'GET'])
 @authentication_classes([])
@@ -259,24 +284,39 @@ def search_files_only(request):
         page = int(data.get('page', 1))
         page_size = min(int(data.get('page_size', 20)), 100)  # Max 100 results per page
         
-        # Extract filters
-        filters = {}
-        if data.get('file_extension'):
-            filters['file_extension'] = data['file_extension']
-        if data.get('file_category'):
-            filters['file_category'] = data['file_category']
-        if data.get('min_size'):
-            filters['min_size'] = int(data['min_size'])
-        if data.get('max_size'):
-            filters['max_size'] = int(data['max_size'])
-        if data.get('directory'):
-            filters['directory'] = data['directory']
-        if data.get('date_from'):
-            filters['date_from'] = data['date_from']
-        if data.get('date_to'):
-            filters['date_to'] = data['date_to']
-        if data.get('language'):
-            filters['language'] = data['language']
+        filters = _get_file_filters(data)
+        facets = parse_facet_names(data.get('facets'), FILE_FACETS)
+        
+        # Cursor pagination: any depth, constant cost per page
+        if 'cursor' in data:
+            try:
+                result = file_service.search_files_cursor(
+                    query=query,
+                    filters=filters,
+                    cursor=data.get('cursor') or None,
+                    page_size=page_size,
+                    facets=facets,
+                    search_type=search_type
+                )
+            except InvalidCursorError as e:
+                return Response({
+                    'error': 'Invalid cursor',
+                    'message': str(e)
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            next_cursor = result.pop('next_cursor')
+            result['pagination'] = {
+                'page_size': page_size,
+                'next_cursor': next_cursor,
+                'has_next': next_cursor is not None
+            }
+            return Response(result, status=status.HTTP_200_OK)
+        
+        if page * page_size > MAX_RESULT_WINDOW:
+            return Response({
+                'error': f'Page is beyond the first {MAX_RESULT_WINDOW} results',
+                'message': 'Use cursor pagination ("cursor": null, then next_cursor) for deeper pages'
+            }, status=status.HTTP_400_BAD_REQUEST)
         
         # Perform search
         if search_type == 'boolean':
@@ -284,14 +324,16 @@ def search_files_only(request):
                 query=query,
                 filters=filters,
                 page=page,
-                page_size=page_size
+                page_size=page_size,
+                facets=facets
             )
         else:
             result = file_service.search_files(
                 query=query,
                 filters=filters,
                 page=page,
-                page_size=page_size
+                page_size=page_size,
+                facets=facets
             )
         
         return Response(result, status=status.HTTP_200_OK)
@@ -303,6 +345,68 @@ def search_files_only(request):
             'message': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def export_files(request):
+    """
+    Stream the metadata of every file matching a query as NDJSON (one JSON
+    object per line), reading the index in batches so memory stays constant
+    
+    GET /api/search/files/export?q=budget&file_extension=pdf&search_type=boolean   (q=* or no q exports all files)
+    """
+    query = request.GET.get('q', '').strip()
+    if query == '*':
+        query = ''
+    if not file_service.es_client:
+        return Response({
+            'error': 'File search unavailable'
+        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    
+    hits = file_service.iter_matching_files(
+        query, _get_file_filters(request.GET), search_type=request.GET.get('search_type', 'basic')
+    )
+    
+    def lines():
+        try:
+            for hit in hits:
+                yield json.dumps(dict(hit.to_dict(), file_id=hit.meta.id), default=str) + '\n'
+        except Exception as e:
+            # Headers are already sent; end the stream with an error line
+            logger.error(f"File export failed for query '{query}': {e}")
+            yield json.dumps({'error': 'Export failed', 'message': str(e)}) + '\n'
+    
+    response = StreamingHttpResponse(lines(), content_type='application/x-ndjson')
+    response['Content-Disposition'] = 'attachment; filename="file_search_export.ndjson"'
+    return response
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def file_facets(request):
+    """Facet counts for file search without hits (?q=&facets=extension,size&file_extension=...)"""
+    try:
+        query = request.GET.get('q', '').strip()
+        facets = parse_facet_names(request.GET.get('facets', 'all'), FILE_FACETS)
+        if not facets:
+            return Response({
+                'error': 'No known facets requested',
+                'available_facets': list(FILE_FACETS)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        result = file_service.get_facets(query, _get_file_filters(request.GET), facets)
+        if result is None:
+            return Response({
+                'error': 'Facets unavailable'
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        
+        return Response(result, status=status.HTTP_200_OK)
+        
+    except Exception as e:
+        logger.error(f"File facets error: {e}")
+        return Response({
+            'error': 'Facets failed',
+            'message': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def file_suggestions(request):
@@ -457,6 +561,7 @@ def file_search_status(request):
             'endpoints': {
                 'search': '/api/files/search/',
                 'suggestions': '/api/files/suggestions/',
+                'facets': '/api/files/facets/',
                 'index_directory': '/api/files/index/directory/',
                 'index_file': '/api/files/index/file/',
                 'delete_file': '/api/files/index/delete/',
@@ -473,7 +578,7 @@ def file_search_status(request):
 
 @api_view(['POST'])
 def create_file_index(request):
-    """Create/recreate the file search index"""
+    """Create the file search index if missing (rebuild it with manage.py reindex_search)"""
     try:
         success = file_service.create_file_index()
         
@@ -533,11 +638,11 @@ def upload_and_index_file(request):
         file_path = os.path.join(upload_dir, uploaded_file.name)
         
         with open(file_path, 'wb') as destination:
-            for chunk in uploaded_file.chunks():
+            for chunk in uploaded_file.chunks(chunk_size=UPLOAD_CHUNK_SIZE):
                 destination.write(chunk)
         
-        # Index the uploaded file
-        success = file_service.index_file(file_path, upload_dir)
+        # Index the uploaded file, reusing the hash computed by the upload handler
+        success = file_service.index_file(file_path, upload_dir, file_hash=get_upload_hash(uploaded_file))
         
         if success:
             return Response({
@@ -590,28 +695,15 @@ def get_file_content(request):
             }, status=status.HTTP_404_NOT_FOUND)
         
         # Try to get content from search index first
-        try:
-            search_results = file_service.search_files(
-                query="*",
-                filters={'file_path': file_path},
-                page_size=1
-            )
-            
-            if search_results and search_results.get('files') and len(search_results['files']) > 0:
-                indexed_file = search_results['files'][0]
-                extracted_text = indexed_file.get('content', '')
-                
-                if extracted_text:
-                    logger.info(f"Found extracted content in search index")
-                    return Response({
-                        'success': True,
-                        'extracted_text': extracted_text,
-                        'file_path': file_path,
-                        'source': 'search_index'
-                    })
-        
-        except Exception as search_error:
-            logger.warning(f"Could not get content from search index: {search_error}")
+        extracted_text = file_service.get_indexed_content(file_path)
+        if extracted_text:
+            logger.info(f"Found extracted content in search index")
+            return Response({
+                'success': True,
+                'extracted_text': extracted_text,
+                'file_path': file_path,
+                'source': 'search_index'
+            })
         
         # Fallback: Extract content directly from file
         try:
@@ -0,0 +1,211 @@
+"""
+Index settings, analyzers and versioned index names for the search corpus
+Documents are written to `<alias>_v<version>`; searches and writes use the alias,
+so a new mapping can be built beside the live index and swapped in
+"""
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Optional
+from django.conf import settings
+from elasticsearch.helpers import bulk, scan
+from elasticsearch_dsl import analyzer
+
+logger = logging.getLogger(__name__)
+
+# Read/write alias of the search corpus: one document per file content hash,
+# with CV fields on the files that are CVs
+FILE_INDEX_ALIAS = 'file_index'
+# Former CV-only index, no longer written or searched; reported until deleted
+LEGACY_CV_INDEX = 'cv_documents'
+
+# Mapping version per alias; bump when a field or analyzer changes and reindex
+INDEX_VERSIONS = {
+    FILE_INDEX_ALIAS: 3,
+}
+
+# Full text: standard tokens, lowercased and accent-folded so "José" matches "jose";
+# no stopwords, so phrases and W/n proximity keep every word
+content_analyzer = analyzer('content_analyzer', tokenizer='standard', filter=['lowercase', 'asciifolding'])
+
+
+def index_settings() -> Dict[str, int]:
+    """
+    Shard and replica counts for the search corpus.
+
+    One primary shard holds tens of GB; the corpus is far below that, and
+    extra shards only add per-shard overhead to every search. Replicas add
+    failover and read throughput but cannot be allocated on a single node.
+    """
+    return {
+        'number_of_shards': getattr(settings, 'SEARCH_INDEX_SHARDS', 1),
+        'number_of_replicas': getattr(settings, 'SEARCH_INDEX_REPLICAS', 0),
+    }
+
+
+def versioned_index_name(alias: str, version: int) -> str:
+    return f"{alias}_v{version}"
+
+
+def get_alias_indices(es_client, alias: str) -> List[str]:
+    """Concrete indices behind an alias (empty if the alias does not exist)"""
+    if not es_client.indices.exists_alias(name=alias):
+        return []
+    return sorted(es_client.indices.get_alias(name=alias))
+
+
+def create_versioned_index(es_client, document, alias: str, version: Optional[int] = None,
+                           replace: bool = False) -> str:
+    """
+    Create `<alias>_v<version>` with the document's mapping and point the alias at it.
+
+    An existing alias is left alone unless `replace` is set, in which case the
+    indices behind it (or a legacy concrete index named like the alias) are
+    deleted first.
+
+    Returns:
+        Name of the index the alias points to
+    """
+    version = version or INDEX_VERSIONS[alias]
+    current = get_alias_indices(es_client, alias)
+    legacy = not current and es_client.indices.exists(index=alias)
+
+    if (current or legacy) and not replace:
+        if legacy:
+            logger.warning(f"{alias} is a concrete index from before versioned indices; reindex to move it behind an alias")
+        return current[0] if current else alias
+
+    for index in current or ([alias] if legacy else []):
+        es_client.indices.delete(index=index, ignore=[404])
+
+    name = versioned_index_name(alias, version)
+    es_client.indices.delete(index=name, ignore=[404])
+    document.init(index=name, using=es_client)
+    es_client.indices.put_alias(index=name, name=alias, body={'is_write_index': True})
+    logger.info(f"Created index {name} behind alias {alias}")
+    return name
+
+
+def list_index_versions(es_client, alias: str) -> List[int]:
+    """Versions N of the existing <alias>_v<N> indices, oldest first"""
+    pattern = re.compile(rf"^{re.escape(alias)}_v(\d+)$")
+    indices = es_client.indices.get(index=f"{alias}_v*", ignore=[404])
+    return sorted(int(match.group(1)) for match in map(pattern.match, indices) if match)
+
+
+def next_index_version(es_client, alias: str) -> int:
+    """One above the highest existing version, and at least the current mapping version"""
+    versions = list_index_versions(es_client, alias)
+    return max([INDEX_VERSIONS[alias]] + [version + 1 for version in versions])
+
+
+def build_index(es_client, document, alias: str, version: int) -> str:
+    """
+    Create <alias>_v<version> with the document's mapping, set up for bulk
+    loading (no refreshes, no replicas) and not yet behind the alias
+    """
+    name = versioned_index_name(alias, version)
+    if es_client.indices.exists(index=name):
+        raise ValueError(f"Index {name} already exists")
+    document.init(index=name, using=es_client)
+    es_client.indices.put_settings(index=name, body={
+        'index': {'refresh_interval': '-1', 'number_of_replicas': 0}
+    })
+    return name
+
+
+def finish_build(es_client, name: str, timeout: str = '5m'):
+    """Restore normal refreshes and replicas on a bulk-loaded index and wait until it can serve"""
+    es_client.indices.put_settings(index=name, body={
+        'index': {'refresh_interval': None, 'number_of_replicas': index_settings()['number_of_replicas']}
+    })
+    es_client.indices.refresh(index=name)
+    es_client.cluster.health(index=name, wait_for_status='yellow', timeout=timeout)
+
+
+# Painless: replace the document unless the target already holds a copy indexed later
+_NEWER_WINS_SCRIPT = '''
+if (ctx.op == 'create') {
+    ctx.op = 'noop';
+} else {
+    def current = ctx._source.indexed_date;
+    def incoming = params.doc.indexed_date;
+    if (current != null && incoming != null && current.compareTo(incoming) > 0) {
+        ctx.op = 'noop';
+    } else {
+        ctx._source = params.doc;
+    }
+}
+'''
+
+
+def bulk_load(es_client, target: str, actions: Iterable[Dict[str, Any]], batch_size: int = 500,
+              newer_only: bool = False) -> int:
+    """
+    Bulk-write actions ({'_id', '_source'}) into `target`.
+    With newer_only, only documents the target already has are rewritten, and
+    only if the target's copy has an older indexed_date, so catching up from the
+    old index after a swap applies its updates without undoing writes made
+    through the alias since or recreating documents deleted through it.
+
+    Returns:
+        Number of documents written
+    """
+    def with_target():
+        for action in actions:
+            if newer_only:
+                yield {
+                    '_op_type': 'update', '_index': target, '_id': action['_id'], 'retry_on_conflict': 3,
+                    'script': {'source': _NEWER_WINS_SCRIPT, 'params': {'doc': action['_source']}},
+                    # The script sees missing documents as ctx.op 'create' and skips them
+                    'scripted_upsert': True,
+                    'upsert': {},
+                }
+            else:
+                yield dict(action, _index=target, _op_type='index')
+
+    written, _ = bulk(es_client, with_target(), chunk_size=batch_size, request_timeout=120)
+    return written
+
+
+def iter_index_documents(es_client, source: str, query: Optional[Dict] = None,
+                         batch_size: int = 500) -> Iterable[Dict[str, Any]]:
+    """_id and _source of every document in `source` (or those matching `query`)"""
+    body = {'query': query or {'match_all': {}}}
+    for hit in scan(es_client, index=source, query=body, size=batch_size, preserve_order=False):
+        yield {'_id': hit['_id'], '_source': hit['_source']}
+
+
+def swap_alias(es_client, alias: str, target: str) -> List[str]:
+    """
+    Point the alias at `target` in one atomic update. A legacy concrete index
+    named like the alias is deleted in the same update (its documents must
+    already be in `target`).
+
+    Returns:
+        Indices the alias pointed to before
+    """
+    previous = get_alias_indices(es_client, alias)
+    actions = [{'remove': {'index': index, 'alias': alias}} for index in previous if index != target]
+    if not previous and es_client.indices.exists(index=alias):
+        actions.append({'remove_index': {'index': alias}})
+    actions.append({'add': {'index': target, 'alias': alias, 'is_write_index': True}})
+    es_client.indices.update_aliases(body={'actions': actions})
+    logger.info(f"Alias {alias} now points to {target} (was {', '.join(previous) or 'unset'})")
+    return previous
+
+
+def prune_index_versions(es_client, alias: str, keep: int = 1) -> List[str]:
+    """
+    Delete old <alias>_v<N> indices, keeping the live one and the `keep` most
+    recent others for rollback
+
+    Returns:
+        Deleted index names
+    """
+    live = set(get_alias_indices(es_client, alias))
+    old = [versioned_index_name(alias, version) for version in list_index_versions(es_client, alias)]
+    old = [name for name in old if name not in live]
+    deleted = old[:max(len(old) - keep, 0)]
+    for name in deleted:
+        es_client.indices.delete(index=name, ignore=[404])
+    return deleted
@@ -0,0 +1,74 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.search.query_parser import QueryParseError, _parse_cached, compile_query, parse_boolean_query
+from apps.search.services import BOOLEAN_FIELD_ALIASES, BOOLEAN_SEARCH_FIELDS, search_service
+
+
+DEFAULT_QUERIES = [
+    'python',
+    'Python AND Django',
+    'Manager OR Lead',
+    'Java NOT JavaScript',
+    '(python OR java) AND (django OR spring) NOT intern',
+    '"project manager" AND budget*',
+    'manager w/5 project',
+    'senior pre/2 engineer',
+    'skills:python name:"john smith"',
+    'develop* AND (aws OR azure OR gcp)',
+]
+
+
+class Command(BaseCommand):
+    help = 'Measure boolean search latency against the CV index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Timed runs per query (default: 5)',
+        )
+        parser.add_argument(
+            '--query',
+            action='append',
+            dest='queries',
+            help='Boolean query to time (repeatable; default: a fixed mix of operators)',
+        )
+
+    def handle(self, *args, **options):
+        queries = options['queries'] or DEFAULT_QUERIES
+        self.stdout.write(f"Boolean search latency ({options['repeat']} runs each, page 1 of 20):")
+
+        for query in queries:
+            timings = []
+            took = []
+            try:
+                parse_ms = self.time_parse(query, options['repeat'])
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    results = search_service.boolean_search(query)
+                    timings.append((time.perf_counter() - started) * 1000)
+                    took.append(results.get('took', 0))
+            except QueryParseError as e:
+                self.stdout.write(self.style.ERROR(f"  {query!r:<55} invalid: {e}"))
+                continue
+
+            self.stdout.write(
+                f"  {query!r:<55} {results['total_hits']:>7} hits  "
+                f"median {statistics.median(timings):8.2f} ms  (parse+compile {parse_ms:.3f} ms, "
+                f"ES took {statistics.median(took):.0f} ms)"
+            )
+
+    @staticmethod
+    def time_parse(query, repeat):
+        """Median parse and compile time of `query` with a cold parse cache, in ms"""
+        timings = []
+        for _ in range(repeat):
+            _parse_cached.cache_clear()
+            started = time.perf_counter()
+            compile_query(parse_boolean_query(query, BOOLEAN_FIELD_ALIASES), BOOLEAN_SEARCH_FIELDS)
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
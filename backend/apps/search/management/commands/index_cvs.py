@@ -5,7 +5,8 @@ Handles timeout issues by processing in batches with retries
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from apps.resumes.models import Resume
-from elasticsearch import Elasticsearch
+from apps.search.file_search_service import FileSearchService
+from apps.search.indices import FILE_INDEX_ALIAS
 from elasticsearch.exceptions import ConnectionTimeout, RequestError
 import time
 import logging
@@ -57,16 +58,16 @@ class Command(BaseCommand):
             self.style.SUCCESS(f'Starting CV indexing with batch size: {batch_size}')
         )
 
-        # Setup Elasticsearch client
-        es = Elasticsearch([{'host': 'localhost', 'port': 9200}], 
-                          timeout=30, max_retries=2, retry_on_timeout=True)
+        # CVs are written to the file corpus: CV fields on the document of the CV's file
+        file_service = FileSearchService()
+        es = file_service.es_client
+        if not es:
+            raise CommandError('❌ Elasticsearch connection failed')
+        self.stdout.write(self.style.SUCCESS('✅ Elasticsearch connection OK'))
 
-        # Test connection
-        try:
-            es.ping()
-            self.stdout.write(self.style.SUCCESS('✅ Elasticsearch connection OK'))
-        except Exception as e:
-            raise CommandError(f'❌ Elasticsearch connection failed: {e}')
+        # Writing to a missing index would create it with a dynamic mapping instead of FileDocument's
+        if not dry_run:
+            file_service.create_file_index()
 
         # Get resumes to process
         queryset = Resume.objects.all().order_by('id')
@@ -100,7 +101,7 @@ class Command(BaseCommand):
                     processed += 1
                     continue
 
-                success = self.index_resume(es, resume, max_retries)
+                success = self.index_resume(file_service, resume, max_retries)
                 if success:
                     processed += 1
                     self.stdout.write(
@@ -127,42 +128,17 @@ class Command(BaseCommand):
         if not dry_run:
             # Verify index
             try:
-                doc_count = es.count(index='cv_documents')['count']
-                self.stdout.write(f'Total documents in index: {doc_count}')
+                doc_count = es.count(index=FILE_INDEX_ALIAS, body={'query': {'exists': {'field': 'resume_ids'}}})['count']
+                self.stdout.write(f'Total CV documents in index: {doc_count}')
             except Exception as e:
                 self.stdout.write(self.style.WARNING(f'Could not verify index: {e}'))
 
-    def index_resume(self, es, resume, max_retries):
+    def index_resume(self, file_service, resume, max_retries):
         """Index a single resume with retry logic"""
         for attempt in range(max_retries):
             try:
-                # Prepare document
-                doc = {
-                    'name': f"{resume.first_name or ''} {resume.last_name or ''}".strip(),
-                    'email': resume.email or '',
-                    'phone': resume.phone_number or '',
-                    'skills': resume.skill_keywords or '',
-                    'experience': resume.expertise_details or '',
-                    'education': '',  # No direct education field in this model
-                    'summary': resume.expertise_areas or '',
-                    'file_content': '',  # Skip file content for now
-                    'location': resume.location or '',
-                    'current_employer': resume.current_employer or '',
-                    'years_of_experience': resume.years_of_experience or 0,
-                    'sectors': resume.sectors or '',
-                    'linkedin_profile': resume.linkedin_profile or '',
-                    'languages_spoken': resume.languages_spoken or '',
-                    'professional_certifications': resume.professional_certifications or '',
-                }
-
-                # Index document
-                result = es.index(
-                    index='cv_documents',
-                    id=str(resume.id),
-                    document=doc,  # Using 'document' instead of 'body' for newer ES versions
-                    timeout='30s'
-                )
-                
+                # Extracts the file only if its content is not indexed yet
+                file_service.index_resume(resume)
                 return True
 
             except ConnectionTimeout:
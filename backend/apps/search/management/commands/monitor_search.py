@@ -5,6 +5,7 @@ from django.core.management.base import BaseCommand
 from apps.search.services import SearchService
 from apps.resumes.models import Resume
 from apps.search.tasks import monitor_querymind_integration
+from apps.search.indices import FILE_INDEX_ALIAS, LEGACY_CV_INDEX
 from elasticsearch import Elasticsearch
 
 
@@ -40,15 +41,20 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.SUCCESS('✅ Elasticsearch: Connected'))
                 
                 # Index stats
-                if es.indices.exists(index='cv_documents'):
-                    stats = es.indices.stats(index='cv_documents')
-                    doc_count = stats['indices']['cv_documents']['total']['docs']['count']
-                    index_size = stats['indices']['cv_documents']['total']['store']['size_in_bytes']
+                if es.indices.exists(index=FILE_INDEX_ALIAS):
+                    stats = es.indices.stats(index=FILE_INDEX_ALIAS)
+                    doc_count = stats['_all']['total']['docs']['count']
+                    index_size = stats['_all']['total']['store']['size_in_bytes']
+                    cv_count = es.count(index=FILE_INDEX_ALIAS, body={'query': {'exists': {'field': 'resume_ids'}}})['count']
                     
-                    self.stdout.write(f'   📊 Documents: {doc_count}')
+                    self.stdout.write(f'   📊 Documents: {doc_count} ({cv_count} CVs)')
                     self.stdout.write(f'   💾 Index size: {index_size:,} bytes')
                 else:
-                    self.stdout.write(self.style.WARNING('⚠️  Index "cv_documents" does not exist'))
+                    self.stdout.write(self.style.WARNING(f'⚠️  Index "{FILE_INDEX_ALIAS}" does not exist'))
+                if es.indices.exists(index=LEGACY_CV_INDEX):
+                    self.stdout.write(self.style.WARNING(
+                        f'⚠️  Unused index "{LEGACY_CV_INDEX}" still exists; delete it after reindex_search --from-database'
+                    ))
             else:
                 self.stdout.write(self.style.ERROR('❌ Elasticsearch: Not connected'))
                 
@@ -154,7 +160,7 @@ class Command(BaseCommand):
                 self.stdout.write(f'   Most common skills:')
                 for skill in top_skills:
                     if skill['skill_keywords']:
-                        self.stdout.write(f'     - {skill["skill_keywords"][:50]}... ({skill["count"]} CVs)')
+                        self.stdout.write(f'     - {str(skill["skill_keywords"])[:50]}... ({skill["count"]} CVs)')
                         
             except Exception as e:
                 self.stdout.write(f'   Could not retrieve skill statistics: {e}')
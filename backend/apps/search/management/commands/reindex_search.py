@@ -0,0 +1,235 @@
+"""
+Management command to rebuild the search corpus without downtime
+Builds <alias>_v<N> beside the live index, verifies it and swaps the alias atomically
+"""
+import time
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from elasticsearch.helpers import scan
+from apps.resumes.models import Resume
+from apps.search.documents import CV_FIELDS
+from apps.search.file_documents import FileDocument
+from apps.search.file_search_service import FileSearchService
+from apps.search.indices import (
+    FILE_INDEX_ALIAS, LEGACY_CV_INDEX, build_index, bulk_load, finish_build, get_alias_indices,
+    iter_index_documents, list_index_versions, next_index_version, prune_index_versions,
+    swap_alias, versioned_index_name,
+)
+from apps.search.result_cache import bump_index_generation
+
+# Painless (update_by_query): remove resume_ids and every CV field from a document
+CLEAR_CV_FIELDS_SCRIPT = 'for (field in params.cv_fields) { ctx._source.remove(field); }'
+
+# --index choice -> (alias, document class)
+TARGETS = {
+    'files': (FILE_INDEX_ALIAS, FileDocument),
+}
+
+
+class Command(BaseCommand):
+    help = ('Reindex the search corpus into a new versioned index, verify it and '
+            'swap the read alias atomically (previous version kept for rollback)')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--index',
+            choices=list(TARGETS) + ['all'],
+            default='all',
+            help='Index to rebuild (default: all)',
+        )
+        parser.add_argument(
+            '--version',
+            type=int,
+            help='Version number of the new index (default: one above the highest existing)',
+        )
+        parser.add_argument(
+            '--from-database',
+            action='store_true',
+            help='After copying the live index, rewrite the CV fields of every Resume onto its '
+                 'file\'s document (extracting files not indexed yet); needed when a CV field '
+                 'changes, and to migrate from the separate cv_documents index',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Documents per scroll page and bulk request (default: 500)',
+        )
+        parser.add_argument(
+            '--keep',
+            type=int,
+            default=1,
+            help='Previous versions to keep for rollback (default: 1)',
+        )
+        parser.add_argument(
+            '--rollback',
+            action='store_true',
+            help='Point the alias back at the newest previous version instead of reindexing',
+        )
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='Show the versions of each index and which one is live',
+        )
+
+    def handle(self, *args, **options):
+        es = FileSearchService().es_client
+        if not es:
+            raise CommandError('Elasticsearch is not available')
+
+        names = list(TARGETS) if options['index'] == 'all' else [options['index']]
+        for name in names:
+            alias, document = TARGETS[name]
+            if options['list']:
+                self.list_versions(es, alias)
+            elif options['rollback']:
+                self.rollback(es, alias)
+            else:
+                self.reindex(es, alias, document, options)
+
+    def list_versions(self, es, alias):
+        live = get_alias_indices(es, alias)
+        self.stdout.write(f"{alias}:")
+        if es.indices.exists(index=LEGACY_CV_INDEX):
+            self.stdout.write(f"  {LEGACY_CV_INDEX} (former CV index, unused; delete after --from-database)")
+        if not live and es.indices.exists(index=alias):
+            self.stdout.write(f"  {alias} (legacy concrete index, live)")
+        for version in list_index_versions(es, alias):
+            index = versioned_index_name(alias, version)
+            count = es.count(index=index)['count']
+            marker = ' (live)' if index in live else ''
+            self.stdout.write(f"  {index:<24} {count:>9} docs{marker}")
+
+    def rollback(self, es, alias):
+        live = get_alias_indices(es, alias)
+        previous = [
+            versioned_index_name(alias, version) for version in list_index_versions(es, alias)
+            if versioned_index_name(alias, version) not in live
+        ]
+        if not previous:
+            raise CommandError(f"No previous version of {alias} to roll back to")
+
+        swap_alias(es, alias, previous[-1])
+        bump_index_generation(alias)
+        self.stdout.write(self.style.SUCCESS(f"{alias} rolled back to {previous[-1]} (was {', '.join(live)})"))
+
+    def reindex(self, es, alias, document, options):
+        batch_size = options['batch_size']
+        live = get_alias_indices(es, alias) or ([alias] if es.indices.exists(index=alias) else [])
+        from_database = options['from_database']
+        if not live and not from_database:
+            raise CommandError(f"{alias} does not exist; create it, or use --from-database")
+        source = live[0] if live else None
+
+        version = options['version'] or next_index_version(es, alias)
+        try:
+            target = build_index(es, document, alias, version)
+        except ValueError as e:
+            raise CommandError(str(e))
+        sources = [name for name in (source, 'the Resume table' if from_database else None) if name]
+        self.stdout.write(f"Building {target} from {' and '.join(sources)}...")
+
+        started_at = datetime.now()
+        started = time.perf_counter()
+        try:
+            written = 0
+            if source:
+                written = bulk_load(es, target, iter_index_documents(es, source, batch_size=batch_size), batch_size)
+                # Documents (re)indexed into the live index while the copy ran; anything
+                # written after this catch-up started is picked up again after the swap
+                caught_up_at = datetime.now()
+                written += bulk_load(es, target, iter_index_documents(
+                    es, source, {'range': {'indexed_date': {'gte': started_at.isoformat()}}}, batch_size
+                ), batch_size)
+            if from_database:
+                # Copied documents must be searchable for index_resume's stale-document cleanup
+                es.indices.refresh(index=target)
+                cv_doc_ids = self.apply_resumes(es, target)
+                written += len(cv_doc_ids)
+            else:
+                es.indices.refresh(index=source)
+                expected = es.count(index=source)['count']
+
+            finish_build(es, target)
+            if from_database:
+                # One document per CV file; CVs with identical files share one
+                expected = len(cv_doc_ids)
+                actual = es.count(index=target, body={'query': {'exists': {'field': 'resume_ids'}}})['count']
+            else:
+                actual = es.count(index=target)['count']
+        except Exception as e:
+            es.indices.delete(index=target, ignore=[404])
+            raise CommandError(f"Building {target} failed, live index untouched: {e}")
+
+        self.stdout.write(f"  {written} documents written in {time.perf_counter() - started:.1f}s")
+        if actual != expected:
+            es.indices.delete(index=target, ignore=[404])
+            raise CommandError(
+                f"{target} has {actual} documents, expected {expected}; deleted it, live index untouched. "
+                f"Rerun when indexing is quiet."
+            )
+
+        if source:
+            # Last catch-up before the swap, the only pass that creates documents: nothing
+            # can have been deleted through the alias from the new index yet
+            last_catch_up_from, caught_up_at = caught_up_at, datetime.now()
+            bulk_load(es, target, iter_index_documents(
+                es, source, {'range': {'indexed_date': {'gte': last_catch_up_from.isoformat()}}}, batch_size
+            ), batch_size)
+
+        swap_started = datetime.now()
+        previous = swap_alias(es, alias, target)
+        bump_index_generation(alias)
+
+        if source and source in previous:
+            # Updates that reached the old index after the last catch-up started. Only
+            # documents the new index has are rewritten (newer copy wins), so deletes
+            # made through the alias since the swap stick
+            bulk_load(es, target, iter_index_documents(
+                es, source, {'range': {'indexed_date': {'gte': caught_up_at.isoformat()}}}, batch_size
+            ), batch_size, newer_only=True)
+
+        deleted = prune_index_versions(es, alias, keep=options['keep'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{alias} -> {target} ({actual} documents, swapped at {swap_started:%H:%M:%S})"
+        ))
+        if previous:
+            self.stdout.write(f"  previous: {', '.join(previous)} (kept for --rollback)")
+        elif source == alias:
+            self.stdout.write(f"  legacy index {alias} was removed in the swap")
+        if deleted:
+            self.stdout.write(f"  deleted old versions: {', '.join(deleted)}")
+
+    def apply_resumes(self, es, target):
+        """
+        Rewrite the CV fields of `target` from the Resume table: clear those
+        copied from the live index, write every Resume's, and drop copied CV
+        documents left without a resume unless they were indexed as files.
+        Returns the ids of the CV documents.
+        """
+        cv_query = {'exists': {'field': 'resume_ids'}}
+        copied = {hit['_id'] for hit in scan(es, index=target, query={'query': cv_query, '_source': False})}
+        if copied:
+            es.update_by_query(index=target, conflicts='proceed', refresh=True, body={
+                'query': cv_query,
+                'script': {'source': CLEAR_CV_FIELDS_SCRIPT, 'params': {'cv_fields': CV_FIELDS}},
+            })
+
+        file_service = FileSearchService()
+        doc_ids = set()
+        for resume in Resume.objects.order_by('pk').iterator(chunk_size=500):
+            try:
+                doc_ids.add(file_service.index_resume(resume, index=target)['doc_id'])
+            except Exception as e:
+                self.stderr.write(f"  Skipping resume {resume.pk}: {e}")
+
+        orphans = sorted(copied - doc_ids)
+        if orphans:
+            es.indices.refresh(index=target)
+            es.delete_by_query(index=target, conflicts='proceed', body={
+                'query': {'bool': {
+                    'filter': [{'ids': {'values': orphans}}],
+                    'must_not': [{'term': {'indexed_as_file': True}}],
+                }}
+            })
+        return doc_ids
@@ -0,0 +1,72 @@
+"""
+Management command to report the storage and indexing cost of the search corpus
+Run it before and after migrating from the separate CV index to compare
+"""
+import statistics
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.resumes.models import Resume
+from apps.search.file_search_service import FileSearchService
+from apps.search.indices import FILE_INDEX_ALIAS, LEGACY_CV_INDEX
+
+
+class Command(BaseCommand):
+    help = 'Report document counts and store size of the search indices, and time CV indexing'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--time-sample',
+            type=int,
+            default=0,
+            help='Re-index this many CVs and report the time per CV (default: 0, no timing)',
+        )
+
+    def handle(self, *args, **options):
+        file_service = FileSearchService()
+        es = file_service.es_client
+        if not es:
+            raise CommandError('Elasticsearch is not available')
+
+        total_docs = total_bytes = 0
+        self.stdout.write('Search index storage:')
+        for index in (FILE_INDEX_ALIAS, LEGACY_CV_INDEX):
+            if not es.indices.exists(index=index):
+                self.stdout.write(f"  {index:<14} missing")
+                continue
+            stats = es.indices.stats(index=index, metric='docs,store')['_all']['primaries']
+            docs = stats['docs']['count']
+            size = stats['store']['size_in_bytes']
+            total_docs += docs
+            total_bytes += size
+            self.stdout.write(f"  {index:<14} {docs:>9} docs  {size / 1024 ** 2:10.1f} MB")
+        self.stdout.write(f"  {'total':<14} {total_docs:>9} docs  {total_bytes / 1024 ** 2:10.1f} MB")
+
+        if es.indices.exists(index=FILE_INDEX_ALIAS):
+            cv_docs = es.count(index=FILE_INDEX_ALIAS, body={'query': {'exists': {'field': 'resume_ids'}}})['count']
+            self.stdout.write(f"  CVs in {FILE_INDEX_ALIAS}: {cv_docs} documents for {Resume.objects.count()} resumes")
+
+        if options['time_sample']:
+            self.time_indexing(file_service, options['time_sample'])
+
+    def time_indexing(self, file_service, sample):
+        """Re-index `sample` CVs the way index_single_cv does and report the cost"""
+        timings = []
+        actions = {'updated': 0, 'created': 0}
+        for resume in Resume.objects.filter(is_processed=True).order_by('-timestamp')[:sample]:
+            try:
+                result = file_service.index_resume(resume)
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"  {resume.id}: {e}"))
+                continue
+            timings.append(result['took_ms'])
+            actions[result['action']] += 1
+
+        if not timings:
+            self.stdout.write(self.style.WARNING('No CVs indexed'))
+            return
+        self.stdout.write(
+            f"CV indexing ({len(timings)} CVs): median {statistics.median(timings):.1f} ms, "
+            f"mean {statistics.mean(timings):.1f} ms; {actions['updated']} reused an extracted "
+            f"document, {actions['created']} extracted the file"
+        )
@@ -0,0 +1,115 @@
+"""
+Cursor pagination for CV and file search
+Pages are read with search_after inside a point-in-time (PIT), so depth costs the
+same as the first page and is not limited by the index's max_result_window
+"""
+import base64
+import json
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from django.conf import settings
+from elasticsearch.exceptions import NotFoundError
+
+logger = logging.getLogger(__name__)
+
+# from/size pagination stops here (Elasticsearch index.max_result_window default)
+MAX_RESULT_WINDOW = 10000
+
+# Relevance order with the PIT's shard/doc tiebreaker, so equal scores page deterministically
+SCORE_SORT = [{'_score': {'order': 'desc'}}, {'_shard_doc': {'order': 'asc'}}]
+# Index order only: cheapest sort, used when every hit is read
+EXPORT_SORT = [{'_shard_doc': {'order': 'asc'}}]
+
+
+class InvalidCursorError(ValueError):
+    """Malformed or expired pagination cursor"""
+
+
+def _keep_alive() -> str:
+    return getattr(settings, 'SEARCH_PIT_KEEP_ALIVE', '2m')
+
+
+def encode_cursor(pit_id: str, search_after: List[Any]) -> str:
+    """Opaque cursor for the page after the hit with sort values `search_after`"""
+    data = json.dumps({'pit': pit_id, 'after': list(search_after)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, List[Any]]:
+    """(pit_id, search_after) from a cursor returned by encode_cursor"""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return data['pit'], data['after']
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError('Invalid cursor') from e
+
+
+def close_point_in_time(es_client, pit_id: str):
+    """Release a PIT early instead of waiting for its keep-alive to run out"""
+    try:
+        es_client.close_point_in_time(body={'id': pit_id})
+    except Exception as e:
+        logger.debug(f"Could not close point-in-time: {e}")
+
+
+def execute_cursor_page(search, es_client, index_name: str, cursor: Optional[str],
+                        page_size: int, sort: List[Dict] = None) -> Tuple[Any, Optional[str]]:
+    """
+    Execute one page of `search` with search_after.
+
+    A missing cursor opens a PIT on `index_name`; later pages reuse the PIT from
+    the cursor. The PIT is closed once the last page has been read.
+
+    Returns:
+        (response, next_cursor), next_cursor being None on the last page
+
+    Raises:
+        InvalidCursorError: the cursor is malformed or its PIT has expired
+    """
+    search_after = None
+    if cursor:
+        pit_id, search_after = decode_cursor(cursor)
+    else:
+        pit_id = es_client.open_point_in_time(index=index_name, keep_alive=_keep_alive())['id']
+
+    # A PIT search names no index; from must stay 0 with search_after
+    search = search.index().sort(*(sort or SCORE_SORT)).extra(
+        pit={'id': pit_id, 'keep_alive': _keep_alive()}, from_=0, size=page_size
+    )
+    if search_after:
+        search = search.extra(search_after=search_after)
+
+    try:
+        response = search.execute()
+    except NotFoundError as e:
+        if cursor:
+            raise InvalidCursorError('Cursor has expired; start again without a cursor') from e
+        raise
+
+    # Elasticsearch may hand back a new PIT id on each page
+    pit_id = getattr(response, 'pit_id', pit_id)
+    hits = response.hits
+    if len(hits) < page_size:
+        close_point_in_time(es_client, pit_id)
+        return response, None
+    return response, encode_cursor(pit_id, list(hits[-1].meta.sort))
+
+
+def iter_all_hits(search, es_client, index_name: str, batch_size: int = 1000) -> Iterator[Any]:
+    """
+    Every hit of `search`, read batch by batch in index order, holding one batch
+    in memory at a time
+    """
+    cursor = None
+    try:
+        while True:
+            response, cursor = execute_cursor_page(
+                search, es_client, index_name, cursor, batch_size, sort=EXPORT_SORT
+            )
+            yield from response.hits
+            if not cursor:
+                break
+    finally:
+        # Export abandoned part-way (client disconnected)
+        if cursor:
+            close_point_in_time(es_client, decode_cursor(cursor)[0])
@@ -0,0 +1,378 @@
+"""
+DTSearch-style boolean query parser
+Parses queries such as `(python OR django) AND "machine learning" NOT intern*`
+or `manager w/5 project` and compiles them to a single Elasticsearch query
+
+Grammar (operators are case-insensitive):
+    query     := or_expr
+    or_expr   := and_expr ("OR" and_expr)*
+    and_expr  := not_expr (["AND"] not_expr | "NOT" not_expr)*     adjacent terms are ANDed
+    not_expr  := "NOT" not_expr | near_expr
+    near_expr := primary (("W/n" | "PRE/n") primary)*              within n words (PRE: in order)
+    primary   := "(" or_expr ")" | [field ":"] (term | "phrase")
+A term may contain the wildcards * and ?.
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
+
+
+class QueryParseError(ValueError):
+    """Raised for queries that cannot be parsed; `position` is the offending character offset"""
+
+    def __init__(self, message: str, position: int = None):
+        super().__init__(message if position is None else f"{message} (at position {position})")
+        self.position = position
+
+
+# Query nodes (immutable, so parsed queries can be cached and shared)
+
+@dataclass(frozen=True)
+class Term:
+    text: str
+    field: Optional[str] = None
+
+    @property
+    def is_wildcard(self) -> bool:
+        return '*' in self.text or '?' in self.text
+
+
+@dataclass(frozen=True)
+class Phrase:
+    text: str
+    field: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class And:
+    children: Tuple['Node', ...]
+
+
+@dataclass(frozen=True)
+class Or:
+    children: Tuple['Node', ...]
+
+
+@dataclass(frozen=True)
+class Not:
+    child: 'Node'
+
+
+@dataclass(frozen=True)
+class Near:
+    children: Tuple['Node', ...]
+    distance: int
+    ordered: bool = False
+
+
+Node = Union[Term, Phrase, And, Or, Not, Near]
+
+
+_TOKEN_RE = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<lparen>\()
+  | (?P<rparen>\))
+  | (?P<phrase>"[^"]*"?)
+  | (?P<near>(?:w|pre)/\d+)(?=[\s()"]|$)
+  | (?P<word>[^\s()"]+)
+''', re.VERBOSE | re.IGNORECASE)
+
+_OPERATORS = {'AND', 'OR', 'NOT'}
+
+MAX_QUERY_LENGTH = 1000
+MAX_NEAR_DISTANCE = 100
+
+
+def _tokenize(query: str) -> List[Tuple[str, str, int]]:
+    """(kind, text, position) tokens; operators are upper-cased kinds"""
+    tokens = []
+    for match in _TOKEN_RE.finditer(query):
+        kind, text = match.lastgroup, match.group()
+        if kind == 'ws':
+            continue
+        if kind == 'phrase':
+            if len(text) < 2 or not text.endswith('"'):
+                raise QueryParseError('Unterminated phrase', match.start())
+            text = text[1:-1]
+        elif kind == 'word' and text.upper() in _OPERATORS:
+            kind = text.upper()
+        elif kind == 'near':
+            text = text.lower()
+        tokens.append((kind, text, match.start()))
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser over the token list"""
+
+    def __init__(self, query: str, fields: Dict[str, str]):
+        self.tokens = _tokenize(query)
+        self.index = 0
+        self.fields = fields
+
+    def peek(self) -> Optional[Tuple[str, str, int]]:
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+
+    def take(self) -> Tuple[str, str, int]:
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def parse(self) -> Node:
+        if not self.tokens:
+            raise QueryParseError('Empty query')
+        node = self.parse_or()
+        token = self.peek()
+        if token is not None:
+            raise QueryParseError(f"Unexpected '{token[1]}'", token[2])
+        return node
+
+    def parse_or(self) -> Node:
+        children = [self.parse_and()]
+        while self.peek() and self.peek()[0] == 'OR':
+            self.take()
+            children.append(self.parse_and())
+        return _combine(Or, children)
+
+    def parse_and(self) -> Node:
+        children = [self.parse_not()]
+        while True:
+            token = self.peek()
+            if token is None or token[0] in ('OR', 'rparen'):
+                break
+            if token[0] == 'AND':
+                self.take()
+                children.append(self.parse_not())
+            elif token[0] == 'NOT':
+                # "a NOT b" means a AND NOT b
+                self.take()
+                children.append(Not(self.parse_not()))
+            else:
+                children.append(self.parse_not())
+        return _combine(And, children)
+
+    def parse_not(self) -> Node:
+        token = self.peek()
+        if token is not None and token[0] == 'NOT':
+            self.take()
+            return Not(self.parse_not())
+        return self.parse_near()
+
+    def parse_near(self) -> Node:
+        node = self.parse_primary()
+        while self.peek() and self.peek()[0] == 'near':
+            _, text, position = self.take()
+            operator, distance = text.split('/')
+            distance = int(distance)
+            if distance > MAX_NEAR_DISTANCE:
+                raise QueryParseError(f"Proximity distance must be at most {MAX_NEAR_DISTANCE}", position)
+            right = self.parse_primary()
+            _check_proximity_operand(node, position)
+            _check_proximity_operand(right, position)
+            node = Near((node, right), distance, ordered=(operator == 'pre'))
+        return node
+
+    def parse_primary(self) -> Node:
+        token = self.peek()
+        if token is None:
+            raise QueryParseError('Query ends where a term was expected', self.tokens[-1][2])
+        kind, text, position = self.take()
+
+        if kind == 'lparen':
+            node = self.parse_or()
+            closing = self.peek()
+            if closing is None or closing[0] != 'rparen':
+                raise QueryParseError('Missing closing parenthesis', position)
+            self.take()
+            return node
+        if kind == 'phrase':
+            if not text.strip():
+                raise QueryParseError('Empty phrase', position)
+            return Phrase(text.strip())
+        if kind == 'word':
+            return self.parse_word(text, position)
+        raise QueryParseError(f"Unexpected '{text}'", position)
+
+    def parse_word(self, text: str, position: int) -> Node:
+        name, separator, value = text.partition(':')
+        # Only known field names are fields: "http://x" or "time:10" stay plain terms
+        if separator and name.lower() in self.fields:
+            field = self.fields[name.lower()]
+            if value:
+                return Term(value, field)
+            token = self.peek()
+            if token is not None and token[0] == 'phrase' and token[1].strip():
+                self.take()
+                return Phrase(token[1].strip(), field)
+            raise QueryParseError(f"Missing value for field '{name}'", position)
+        if text.strip('*?') == '':
+            raise QueryParseError('Wildcard needs at least one character', position)
+        return Term(text)
+
+
+def _combine(node_type, children: List[Node]) -> Node:
+    """Build an And/Or node, flattening nested nodes of the same type"""
+    flat = []
+    for child in children:
+        if isinstance(child, node_type):
+            flat.extend(child.children)
+        elif child not in flat:
+            flat.append(child)
+    return flat[0] if len(flat) == 1 else node_type(tuple(flat))
+
+
+def _check_proximity_operand(node: Node, position: int):
+    if isinstance(node, (And, Not)) or (isinstance(node, Or) and not all(
+            isinstance(child, (Term, Phrase, Or, Near)) for child in node.children)):
+        raise QueryParseError('Proximity operands must be terms, phrases or OR groups', position)
+
+
+@lru_cache(maxsize=2048)
+def _parse_cached(query: str, field_items: Tuple[Tuple[str, str], ...]) -> Node:
+    return _Parser(query, dict(field_items)).parse()
+
+
+def parse_boolean_query(query: str, fields: Optional[Dict[str, str]] = None) -> Node:
+    """
+    Parse a boolean query into a tree of Term/Phrase/And/Or/Not/Near nodes.
+
+    Args:
+        query: Query text
+        fields: Field names allowed before ':' mapped to index fields
+
+    Raises:
+        QueryParseError: If the query is malformed
+    """
+    query = (query or '').strip()
+    if len(query) > MAX_QUERY_LENGTH:
+        raise QueryParseError(f"Query is longer than {MAX_QUERY_LENGTH} characters")
+    return _parse_cached(query, tuple(sorted((fields or {}).items())))
+
+
+def query_operators(node: Node) -> List[str]:
+    """Operators used in a parsed query, e.g. ['AND', 'W/5']"""
+    found = []
+
+    def visit(current):
+        if isinstance(current, (And, Or)):
+            name = 'AND' if isinstance(current, And) else 'OR'
+            if name not in found:
+                found.append(name)
+            for child in current.children:
+                visit(child)
+        elif isinstance(current, Not):
+            if 'NOT' not in found:
+                found.append('NOT')
+            visit(current.child)
+        elif isinstance(current, Near):
+            name = f"{'PRE' if current.ordered else 'W'}/{current.distance}"
+            if name not in found:
+                found.append(name)
+            for child in current.children:
+                visit(child)
+        elif isinstance(current, Term) and current.is_wildcard and 'WILDCARD' not in found:
+            found.append('WILDCARD')
+        elif isinstance(current, Phrase) and 'PHRASE' not in found:
+            found.append('PHRASE')
+
+    visit(node)
+    return found
+
+
+# Compilation to Elasticsearch query DSL
+
+def _field_names(fields: List[str]) -> List[str]:
+    """'name^1.8' -> 'name'"""
+    return [field.split('^')[0] for field in fields]
+
+
+def _boost(field: str) -> float:
+    _, _, boost = field.partition('^')
+    return float(boost) if boost else 1.0
+
+
+def _should(queries: List[Dict]) -> Dict:
+    return queries[0] if len(queries) == 1 else {'bool': {'should': queries, 'minimum_should_match': 1}}
+
+
+def _compile_term(node: Term, fields: List[str]) -> Dict:
+    search_fields = [node.field] if node.field else fields
+    if node.is_wildcard:
+        pattern = node.text.lower()
+        return _should([
+            {'wildcard': {name: {'value': pattern, 'boost': _boost(field)}}}
+            for field, name in zip(search_fields, _field_names(search_fields))
+        ])
+    return {'multi_match': {'query': node.text, 'fields': search_fields, 'type': 'best_fields'}}
+
+
+def _compile_phrase(node: Phrase, fields: List[str]) -> Dict:
+    search_fields = [node.field] if node.field else fields
+    return {'multi_match': {'query': node.text, 'fields': search_fields, 'type': 'phrase'}}
+
+
+def _interval_source(node: Node) -> Dict:
+    """Intervals rule for one proximity operand"""
+    if isinstance(node, Term):
+        if node.is_wildcard:
+            return {'wildcard': {'pattern': node.text.lower()}}
+        return {'match': {'query': node.text}}
+    if isinstance(node, Phrase):
+        return {'match': {'query': node.text, 'max_gaps': 0, 'ordered': True}}
+    if isinstance(node, Or):
+        return {'any_of': {'intervals': [_interval_source(child) for child in node.children]}}
+    if isinstance(node, Near):
+        return {'all_of': {
+            'intervals': [_interval_source(child) for child in node.children],
+            'max_gaps': node.distance,
+            'ordered': node.ordered,
+        }}
+    raise QueryParseError('Proximity operands must be terms, phrases or OR groups')
+
+
+def _proximity_fields(node: Node) -> List[str]:
+    """Fields named inside a proximity expression"""
+    if isinstance(node, (Term, Phrase)):
+        return [node.field] if node.field else []
+    children = node.children if isinstance(node, (Or, Near)) else ()
+    return [field for child in children for field in _proximity_fields(child)]
+
+
+def _compile_near(node: Near, fields: List[str]) -> Dict:
+    named = set(_proximity_fields(node))
+    if len(named) > 1:
+        raise QueryParseError('All terms of a proximity search must use the same field')
+    search_fields = list(named) if named else fields
+    rule = _interval_source(node)
+    return _should([
+        {'intervals': {name: dict(rule, boost=_boost(field)) if _boost(field) != 1.0 else rule}}
+        for field, name in zip(search_fields, _field_names(search_fields))
+    ])
+
+
+def compile_query(node: Node, fields: List[str]) -> Dict:
+    """
+    Elasticsearch query for a parsed boolean query.
+
+    Args:
+        node: Output of parse_boolean_query
+        fields: Default fields, with optional ^boost (e.g. 'extracted_text^2.0')
+    """
+    if isinstance(node, Term):
+        return _compile_term(node, fields)
+    if isinstance(node, Phrase):
+        return _compile_phrase(node, fields)
+    if isinstance(node, Near):
+        return _compile_near(node, fields)
+    if isinstance(node, Not):
+        return {'bool': {'must': [{'match_all': {}}], 'must_not': [compile_query(node.child, fields)]}}
+    if isinstance(node, Or):
+        return {'bool': {'should': [compile_query(child, fields) for child in node.children], 'minimum_should_match': 1}}
+
+    must = [compile_query(child, fields) for child in node.children if not isinstance(child, Not)]
+    must_not = [compile_query(child.child, fields) for child in node.children if isinstance(child, Not)]
+    clauses = {'must': must or [{'match_all': {}}]}
+    if must_not:
+        clauses['must_not'] = must_not
+    return {'bool': clauses}
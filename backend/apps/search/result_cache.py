@@ -0,0 +1,152 @@
+"""
+Search result cache
+Keys are canonical (sorted parameters) and include a per-index generation
+counter that indexing bumps, so cached pages are invalidated on writes
+rather than by waiting for the TTL. Hot queries are served stale while a
+background thread recomputes them.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+STAT_NAMES = ('hits', 'stale_hits', 'misses')
+
+
+def _generation_key(index_name: str) -> str:
+    return f"search_generation:{index_name}"
+
+
+def get_index_generation(index_name: str) -> int:
+    """Current write generation of an index (0 until the first bump)"""
+    return cache.get(_generation_key(index_name), 0)
+
+
+def bump_index_generation(index_name: str) -> int:
+    """Record a write to an index; cached results for older generations stop being served as fresh"""
+    key = _generation_key(index_name)
+    cache.add(key, 0, None)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Evicted between add and incr
+        cache.set(key, 1, None)
+        return 1
+
+
+def _canonical(value):
+    """Parameters in a stable form: sorted keys, empty values dropped"""
+    if isinstance(value, dict):
+        return {key: _canonical(item) for key, item in sorted(value.items()) if item not in (None, '', [], {})}
+    if isinstance(value, (list, tuple, set)):
+        # Filter and facet lists are sets in meaning: ['b', 'a'] is the same search as ['a', 'b']
+        return sorted((_canonical(item) for item in value), key=str)
+    return value
+
+
+def canonical_cache_key(namespace: str, params: Dict[str, Any]) -> str:
+    """Hash of the canonical JSON form of the search parameters"""
+    data = json.dumps(_canonical(params), sort_keys=True, default=str, separators=(',', ':'))
+    return f"{namespace}:{hashlib.md5(data.encode()).hexdigest()}"
+
+
+class SearchResultCache:
+    """
+    Result cache for one search service.
+
+    Fresh entries live under `<namespace>:<hash>:<generation>` for `ttl`
+    seconds. The latest result of every query is also kept for `stale_ttl`
+    seconds; a query requested at least `hot_threshold` times within `ttl`
+    gets that stale result immediately while it is recomputed in the
+    background.
+    """
+
+    def __init__(self, namespace: str, index_name: str, ttl: int = None,
+                 stale_ttl: int = None, hot_threshold: int = None):
+        self.namespace = namespace
+        self.index_name = index_name
+        self.ttl = ttl or getattr(settings, 'SEARCH_CACHE_TTL', 300)
+        self.stale_ttl = stale_ttl or getattr(settings, 'SEARCH_CACHE_STALE_TTL', 3600)
+        self.hot_threshold = hot_threshold or getattr(settings, 'SEARCH_CACHE_HOT_THRESHOLD', 3)
+
+    def get_or_compute(self, params: Dict[str, Any], compute: Callable[[], Any]) -> Any:
+        """Cached result for `params`, calling `compute()` on a miss"""
+        base = canonical_cache_key(self.namespace, params)
+        generation = get_index_generation(self.index_name)
+        requests = self._count_request(base)
+
+        result = cache.get(f"{base}:{generation}")
+        if result is not None:
+            self._record('hits')
+            return result
+
+        stale = cache.get(f"{base}:latest")
+        if stale is not None and requests >= self.hot_threshold:
+            self._record('stale_hits')
+            self._refresh_in_background(base, compute)
+            return stale
+
+        self._record('misses')
+        result = compute()
+        self._store(base, generation, result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit, stale-hit and miss counts since the counters were created, with ratios"""
+        counts = {name: cache.get(f"{self.namespace}:stats:{name}", 0) for name in STAT_NAMES}
+        total = sum(counts.values())
+        counts.update({
+            'requests': total,
+            'hit_ratio': round(counts['hits'] / total, 3) if total else 0.0,
+            'served_from_cache_ratio': round((counts['hits'] + counts['stale_hits']) / total, 3) if total else 0.0,
+            'index_generation': get_index_generation(self.index_name),
+        })
+        return counts
+
+    def _store(self, base: str, generation: int, result: Any):
+        if not result:
+            return
+        cache.set(f"{base}:{generation}", result, self.ttl)
+        cache.set(f"{base}:latest", result, self.stale_ttl)
+
+    def _count_request(self, base: str) -> int:
+        # Requests for this query in the current `ttl` window
+        key = f"{base}:requests"
+        cache.add(key, 0, self.ttl)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            return 0
+
+    def _refresh_in_background(self, base: str, compute: Callable[[], Any]):
+        # One refresh per query at a time
+        lock = f"{base}:refreshing"
+        if not cache.add(lock, 1, 60):
+            return
+
+        def refresh():
+            try:
+                generation = get_index_generation(self.index_name)
+                started = time.perf_counter()
+                self._store(base, generation, compute())
+                logger.debug(f"Refreshed stale search result {base} in {time.perf_counter() - started:.3f}s")
+            except Exception as e:
+                logger.warning(f"Background refresh of {base} failed: {e}")
+            finally:
+                cache.delete(lock)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _record(self, name: str):
+        key = f"{self.namespace}:stats:{name}"
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            pass
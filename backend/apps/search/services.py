@@ -2,17 +2,41 @@
 Search Service for DTSearch-like functionality
 Handles all Elasticsearch operations and search logic
 """
-import hashlib
 import logging
 from typing import List, Dict, Any, Optional
-from django.core.cache import cache
 from django.conf import settings
 from elasticsearch import Elasticsearch
 from elasticsearch_dsl import Search, Q
-from .documents import CVDocument
+from .file_documents import FileDocument
+from .facets import CV_FACETS, add_facets, format_facets
+from .suggestions import suggestion_service, CV_SUGGESTION_KINDS
+from .query_parser import parse_boolean_query, compile_query
+from .result_cache import SearchResultCache
+from .indices import FILE_INDEX_ALIAS, create_versioned_index
+from .pagination import InvalidCursorError, execute_cursor_page, iter_all_hits
 
 logger = logging.getLogger(__name__)
 
+# Default fields for boolean search terms
+BOOLEAN_SEARCH_FIELDS = [
+    'content^2.0', 'name^1.8', 'skills^1.5',
+    'experience^1.3', 'education^1.0', 'filename^1.0',
+]
+
+# Names accepted before ':' in boolean queries -> index field
+BOOLEAN_FIELD_ALIASES = {
+    'content': 'content',
+    'name': 'name',
+    'skills': 'skills',
+    'skill': 'skills',
+    'experience': 'experience',
+    'education': 'education',
+    'filename': 'filename',
+    'email': 'email',
+    'location': 'location',
+    'employer': 'current_employer',
+}
+
 class SearchService:
     """
     DTSearch-like search service with advanced capabilities
@@ -24,7 +48,9 @@ class SearchService:
             self.es_client = Elasticsearch([
                 {'host': 'localhost', 'port': 9200}
             ])
-            self.index_name = 'cv_documents'
+            # CVs live in the file corpus, as the files that carry resume_ids
+            self.index_name = FILE_INDEX_ALIAS
+            self.result_cache = SearchResultCache('search_cache', self.index_name)
             logger.info("SearchService initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize SearchService: {e}")
@@ -49,9 +75,9 @@ class SearchService:
                 return False
                 
             if not self.es_client.indices.exists(index=self.index_name):
-                # Create index with proper mapping
-                CVDocument.init(index=self.index_name)
-                logger.info(f"Created Elasticsearch index: {self.index_name}")
+                # Create file_index_v<N> with the current mapping behind the alias
+                name = create_versioned_index(self.es_client, FileDocument, FILE_INDEX_ALIAS)
+                logger.info(f"Created Elasticsearch index: {name}")
                 return True
             else:
                 logger.info(f"Index {self.index_name} already exists")
@@ -61,7 +87,8 @@ class SearchService:
             return False
     
     def search_documents(self, query: str, filters: Optional[Dict] = None, 
-                        page: int = 1, page_size: int = 20) -> Dict[str, Any]:
+                        page: int = 1, page_size: int = 20,
+                        facets: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Main search function - DTSearch-like functionality
         
@@ -70,6 +97,7 @@ class SearchService:
             filters: Dictionary of filters (file_type, date_range, etc.)
             page: Page number for pagination
             page_size: Number of results per page
+            facets: Names from CV_FACETS to aggregate over all matches
             
         Returns:
             Dictionary with search results and metadata
@@ -77,100 +105,183 @@ class SearchService:
         if not self.es_client or not query.strip():
             return self._empty_result()
         
-        # Check cache first (5 minutes cache)
-        cache_key = self._generate_cache_key(query, filters, page, page_size)
-        cached_result = cache.get(cache_key)
-        if cached_result:
-            logger.info(f"Returning cached results for query: {query}")
-            return cached_result
-        
+        params = {'query': query, 'filters': filters, 'page': page, 'page_size': page_size, 'facets': facets}
         try:
-            # Build Elasticsearch search
-            search = Search(using=self.es_client, index=self.index_name)
-            
-            # Add query
-            if query:
-                search = self._build_query(search, query)
-            
-            # Add filters
-            if filters:
-                search = self._apply_filters(search, filters)
-            
-            # Add highlighting
-            search = self._add_highlighting(search)
-            
-            # Elasticsearch sorts by _score automatically
+            return self.result_cache.get_or_compute(
+                params, lambda: self._execute_search(query, filters, page, page_size, facets)
+            )
+        except Exception as e:
+            logger.error(f"Search failed for query '{query}': {e}")
+            return self._empty_result()
+    
+    def search_documents_cursor(self, query: str, filters: Optional[Dict] = None,
+                                cursor: Optional[str] = None, page_size: int = 20,
+                                facets: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Search with cursor pagination (search_after in a point-in-time), for
+        pages beyond the from/size window. Not cached: each cursor is used once.
+        
+        Args:
+            query: Search query string
+            filters: Dictionary of filters, as for search_documents
+            cursor: next_cursor of the previous page, or None for the first page
+            page_size: Number of results per page
+            facets: Names from CV_FACETS to aggregate over all matches
             
-            # Pagination
-            start = (page - 1) * page_size
-            search = search[start:start + page_size]
+        Returns:
+            Dictionary with search results, metadata and next_cursor (None on the last page)
             
-            # Execute search
-            response = search.execute()
+        Raises:
+            InvalidCursorError: the cursor is malformed or has expired
+        """
+        if not self.es_client or not query.strip():
+            return dict(self._empty_result(), next_cursor=None)
+        
+        try:
+            search = self._build_search(query, filters, facets)
+            response, next_cursor = execute_cursor_page(
+                search, self.es_client, self.index_name, cursor, page_size
+            )
             
-            # Format results
             results = self._format_results(response)
+            if facets:
+                results['facets'] = format_facets(response, facets)
+            results['next_cursor'] = next_cursor
+            return results
             
-            # Cache results for 5 minutes
-            cache.set(cache_key, results, 300)
+        except InvalidCursorError:
+            raise
+        except Exception as e:
+            logger.error(f"Cursor search failed for query '{query}': {e}")
+            return dict(self._empty_result(), next_cursor=None)
+    
+    def iter_matching_documents(self, query: str, filters: Optional[Dict] = None,
+                                fields: Optional[List[str]] = None, batch_size: int = 1000):
+        """Every document matching the query and filters (only `fields` of _source), for exports"""
+        search = self._cv_search()
+        if query.strip():
+            search = self._build_query(search, query)
+        if filters:
+            search = self._apply_filters(search, filters)
+        if fields:
+            search = search.source(includes=fields)
+        return iter_all_hits(search, self.es_client, self.index_name, batch_size)
+    
+    def _build_search(self, query: str, filters: Optional[Dict], facets: Optional[List[str]]) -> Search:
+        """Query, filters, highlighting and facets of a CV search, without pagination"""
+        # Build Elasticsearch search
+        search = self._cv_search()
+        
+        # Add query
+        if query:
+            search = self._build_query(search, query)
+        
+        # Add filters
+        if filters:
+            search = self._apply_filters(search, filters)
+        
+        # Add highlighting
+        search = self._add_highlighting(search)
+        
+        # Facet counts over all matches, in the same request
+        if facets:
+            search = add_facets(search, CV_FACETS, facets)
+        
+        return search
+    
+    def _execute_search(self, query: str, filters: Optional[Dict], page: int, page_size: int,
+                        facets: Optional[List[str]]) -> Dict[str, Any]:
+        """Run a search against Elasticsearch (uncached; errors propagate so they are not cached)"""
+        search = self._build_search(query, filters, facets)
+        
+        # Elasticsearch sorts by _score automatically
+        
+        # Pagination
+        start = (page - 1) * page_size
+        search = search[start:start + page_size]
+        
+        # Execute search
+        response = search.execute()
+        
+        # Format results
+        results = self._format_results(response)
+        if facets:
+            results['facets'] = format_facets(response, facets)
+        
+        logger.info(f"Search completed: {query} -> {results['total_hits']} results")
+        return results
+    
+    def get_facets(self, query: str, filters: Optional[Dict] = None,
+                   facets: Optional[List[str]] = None, size: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Facet counts without hits (size=0)
+        
+        Args:
+            query: Search query string (empty for the whole index)
+            filters: Dictionary of filters, as for search_documents
+            facets: Names from CV_FACETS (default: all)
+            size: Number of buckets per terms facet (default: the facet's own)
             
-            logger.info(f"Search completed: {query} -> {results['total_hits']} results")
-            return results
+        Returns:
+            Dictionary with facets, total_hits and took, or None if Elasticsearch failed
+        """
+        if not self.es_client:
+            return None
+        
+        facets = facets or list(CV_FACETS)
+        try:
+            search = self._cv_search()
+            if query.strip():
+                search = self._build_query(search, query)
+            if filters:
+                search = self._apply_filters(search, filters)
+            search = add_facets(search, CV_FACETS, facets, size=size)[:0]
             
+            response = search.execute()
+            return {
+                'facets': format_facets(response, facets),
+                'total_hits': response.hits.total.value if hasattr(response.hits.total, 'value') else 0,
+                'took': getattr(response, 'took', 0)
+            }
         except Exception as e:
-            logger.error(f"Search failed for query '{query}': {e}")
-            return self._empty_result()
+            logger.error(f"Facet query failed for '{query}': {e}")
+            return None
     
-    def boolean_search(self, query: str) -> Dict[str, Any]:
+    def boolean_search(self, query: str, filters: Optional[Dict] = None,
+                       page: int = 1, page_size: int = 20) -> Dict[str, Any]:
         """
-        Boolean search with AND, OR, NOT operators (DTSearch-style)
+        Boolean search (DTSearch-style): AND, OR, NOT, W/n and PRE/n proximity,
+        "quoted phrases", wildcards (* and ?), field:term and parentheses
         
         Args:
-            query: Boolean query string (e.g., "Python AND Django", "Manager OR Lead")
+            query: Boolean query string (e.g. "(Python OR Django) AND manag* NOT intern")
+            filters: Dictionary of filters, as for search_documents
+            page: Page number for pagination
+            page_size: Number of results per page
             
         Returns:
             Search results dictionary
+            
+        Raises:
+            QueryParseError: If the query is malformed
         """
+        es_query = compile_query(parse_boolean_query(query, BOOLEAN_FIELD_ALIASES), BOOLEAN_SEARCH_FIELDS)
         if not self.es_client:
             return self._empty_result()
         
         try:
-            search = Search(using=self.es_client, index=self.index_name)
+            search = self._cv_search()
+            search = search.query(Q(es_query))
             
-            # Parse boolean operators
-            if ' AND ' in query.upper():
-                terms = [term.strip() for term in query.upper().split(' AND ')]
-                bool_query = Q('bool', must=[
-                    Q('multi_match', 
-                      query=term, 
-                      fields=['file_content', 'name', 'skills', 'experience'])
-                    for term in terms
-                ])
-            elif ' OR ' in query.upper():
-                terms = [term.strip() for term in query.upper().split(' OR ')]
-                bool_query = Q('bool', should=[
-                    Q('multi_match', 
-                      query=term, 
-                      fields=['file_content', 'name', 'skills', 'experience'])
-                    for term in terms
-                ])
-            elif ' NOT ' in query.upper():
-                positive_term, negative_term = query.upper().split(' NOT ', 1)
-                bool_query = Q('bool', 
-                             must=[Q('multi_match', 
-                                   query=positive_term.strip(), 
-                                   fields=['file_content', 'name', 'skills', 'experience'])],
-                             must_not=[Q('multi_match', 
-                                       query=negative_term.strip(), 
-                                       fields=['file_content', 'name', 'skills', 'experience'])])
-            else:
-                # Fall back to regular search
-                return self.search_documents(query)
+            if filters:
+                search = self._apply_filters(search, filters)
             
-            search = search.query(bool_query)
             search = self._add_highlighting(search)
             # Elasticsearch sorts by _score automatically
             
+            start = (page - 1) * page_size
+            search = search[start:start + page_size]
+            
             response = search.execute()
             results = self._format_results(response)
             
@@ -183,7 +294,9 @@ class SearchService:
     
     def get_suggestions(self, partial_query: str, limit: int = 10) -> List[str]:
         """
-        Auto-complete suggestions for search
+        Auto-complete suggestions for search: the most common skills, expertise
+        areas, employers and locations starting with the partial query, from
+        the completion index built by rebuild_search_suggestions
         
         Args:
             partial_query: Partial search term
@@ -192,37 +305,19 @@ class SearchService:
         Returns:
             List of suggested search terms
         """
-        if not self.es_client or len(partial_query) < 2:
+        if len(partial_query) < 2:
             return []
         
-        try:
-            # Search for terms that start with the partial query
-            search = Search(using=self.es_client, index=self.index_name)
-            search = search.query(
-                'prefix', 
-                **{'skills.keyword': partial_query}
-            )
-            search = search[:limit]
-            
-            response = search.execute()
-            suggestions = []
-            
-            for hit in response:
-                if hasattr(hit, 'skills') and hit.skills:
-                    for skill in hit.skills.split(','):
-                        skill = skill.strip()
-                        if skill.lower().startswith(partial_query.lower()) and skill not in suggestions:
-                            suggestions.append(skill)
-                            if len(suggestions) >= limit:
-                                break
-                if len(suggestions) >= limit:
-                    break
-            
-            return suggestions
-            
-        except Exception as e:
-            logger.error(f"Suggestions failed for query '{partial_query}': {e}")
+        suggestions = suggestion_service.suggest(partial_query, CV_SUGGESTION_KINDS, limit)
+        if suggestions is None:
             return []
+        return [suggestion['value'] for suggestion in suggestions]
+    
+    def _cv_search(self) -> Search:
+        """Search over the CV documents of the corpus, without their full text"""
+        return Search(using=self.es_client, index=self.index_name).filter(
+            'exists', field='resume_ids'
+        ).source(excludes=['content'])
     
     def _build_query(self, search: Search, query: str) -> Search:
         """Build multi-match query with field boosting including file content"""
@@ -230,7 +325,7 @@ class SearchService:
             'multi_match',
             query=query,
             fields=[
-                'extracted_text^2.0',     # File content (highest priority - DTSearch-like)
+                'content^2.0',            # File content (highest priority - DTSearch-like)
                 'name^1.8',               # Person name
                 'skills^1.5',             # Skills
                 'experience^1.3',         # Experience
@@ -254,6 +349,13 @@ class SearchService:
         if filters.get('location'):
             search = search.filter('match', location=filters['location'])
         
+        # Exact facet values
+        if filters.get('sectors'):
+            search = search.filter('terms', sectors=filters['sectors'])
+        
+        if filters.get('expertise'):
+            search = search.filter('terms', expertise_areas=filters['expertise'])
+        
         # File-based filters
         if filters.get('file_type'):
             search = search.filter('term', file_type=filters['file_type'])
@@ -278,11 +380,12 @@ class SearchService:
     def _add_highlighting(self, search: Search) -> Search:
         """Add search result highlighting for file content and metadata"""
         return search.highlight(
-            'extracted_text',          # File content highlighting
+            'content',                 # File content highlighting
             'filename',                # Filename highlighting  
             'name',                    # Name highlighting
             'skills',                  # Skills highlighting
             'experience',              # Experience highlighting
+            type='unified',            # Uses the offsets stored for the content fields
             fragment_size=200,
             number_of_fragments=3,
             pre_tags=['<mark>'],
@@ -294,7 +397,10 @@ class SearchService:
         hits = []
         for hit in response:
             hit_data = {
-                'id': hit.meta.id,
+                # The last of resume_ids is the resume whose fields are on the document
+                'id': list(getattr(hit, 'resume_ids', None) or [hit.meta.id])[-1],
+                'resume_ids': list(getattr(hit, 'resume_ids', [])),   # Every CV with this exact file
+                'document_id': hit.meta.id,   # Content hash of the CV file in the corpus
                 'score': hit.meta.score,
                 'name': getattr(hit, 'name', ''),
                 'email': getattr(hit, 'email', ''),
@@ -311,7 +417,7 @@ class SearchService:
                 'file_size': getattr(hit, 'file_size', 0),
                 'file_size_mb': round(getattr(hit, 'file_size', 0) / 1048576, 2) if getattr(hit, 'file_size', 0) > 0 else 0,
                 'indexed_date': getattr(hit, 'indexed_date', ''),
-                'content_preview': getattr(hit, 'extracted_text', '')[:300] + '...' if len(getattr(hit, 'extracted_text', '')) > 300 else getattr(hit, 'extracted_text', ''),
+                'content_preview': getattr(hit, 'content_head', ''),
                 'highlights': {}
             }
             
@@ -328,12 +434,6 @@ class SearchService:
             'took': getattr(response, 'took', 0)
         }
     
-    def _generate_cache_key(self, query: str, filters: Optional[Dict], 
-                           page: int, page_size: int) -> str:
-        """Generate cache key for search results"""
-        key_data = f"{query}_{filters}_{page}_{page_size}"
-        return f"search_cache_{hashlib.md5(key_data.encode()).hexdigest()}"
-    
     def _empty_result(self) -> Dict[str, Any]:
         """Return empty search result"""
         return {
@@ -21,7 +21,7 @@ logger = logging.getLogger(__name__)
 def index_cv_on_save(sender, instance, created, **kwargs):
     """
     Automatically index CV when it's created or updated
-    This includes both resume database indexing and file content indexing
+    The CV fields and the file content go into the same corpus document
     
     Args:
         sender: Resume model class
@@ -34,30 +34,19 @@ def index_cv_on_save(sender, instance, created, **kwargs):
         print(f"🔥 SIGNAL FIRED: resume {instance.id}, created={created}, is_processed={instance.is_processed}, file_path={instance.file_path}")
         
         # Import here to avoid circular imports
-        from apps.search.tasks import index_single_cv, index_resume_file
+        from apps.search.tasks import index_single_cv
         
         # Only index if the CV is processed
         if instance.is_processed:
             if created:
                 print(f"📝 New CV created: {instance.id} - queuing for indexing")
                 # For eager execution, don't use countdown as it may cause issues
+                # One task writes both the file content and the CV fields
                 index_single_cv.apply_async(args=[instance.id])
-                
-                # Also index the file for file search
-                if instance.file_path:
-                    print(f"📁 New CV file: {instance.file_path} - queuing for file indexing")
-                    result = index_resume_file.apply_async(args=[instance.id])
-                    print(f"✅ File indexing task result: {result}")
             else:
                 print(f"🔄 CV updated: {instance.id} - queuing for reindexing")
                 # Reindex immediately for updates
                 index_single_cv.apply_async(args=[instance.id])
-                
-                # Also reindex the file
-                if instance.file_path:
-                    print(f"📁 CV file updated: {instance.file_path} - queuing for file reindexing")
-                    result = index_resume_file.apply_async(args=[instance.id])
-                    print(f"✅ File reindexing task result: {result}")
         else:
             print(f"⏳ CV {instance.id} not yet processed - skipping indexing")
             
@@ -69,7 +58,7 @@ def index_cv_on_save(sender, instance, created, **kwargs):
 def remove_cv_from_index(sender, instance, **kwargs):
     """
     Automatically remove CV from search index when deleted
-    This includes both resume database index and file index
+    This removes the CV's document from the corpus
     
     Args:
         sender: Resume model class
@@ -78,18 +67,13 @@ def remove_cv_from_index(sender, instance, **kwargs):
     """
     try:
         # Import here to avoid circular imports
-        from apps.search.tasks import delete_cv_from_index, delete_resume_file_from_index
+        from apps.search.tasks import delete_cv_from_index
         
         logger.info(f"CV deleted: {instance.id} - removing from search indexes")
         
-        # Remove from CV database index
+        # Removes the CV's document, file content included
         delete_cv_from_index.apply_async(args=[instance.id])
         
-        # Remove from file index if there was a file
-        if instance.file_path:
-            logger.info(f"CV file deleted: {instance.file_path} - removing from file index")
-            delete_resume_file_from_index.apply_async(args=[instance.file_path])
-        
     except Exception as e:
         logger.error(f"Failed to queue CV {instance.id} for deletion from indexes: {e}")
 
@@ -100,12 +84,11 @@ def index_on_processing_complete(sender, instance, created, **kwargs):
     """
     Index CV when processing status changes to completed
     This handles cases where CVs are uploaded but processing happens later
-    Includes both resume database indexing and file indexing
     """
     if not created and instance.is_processed:
         # Check if processing status just changed
         try:
-            from apps.search.tasks import index_single_cv, index_resume_file
+            from apps.search.tasks import index_single_cv
             
             # Get the previous state from database
             old_instance = Resume.objects.get(id=instance.id)
@@ -113,10 +96,5 @@ def index_on_processing_complete(sender, instance, created, **kwargs):
                 logger.info(f"CV processing completed: {instance.id} - queuing for indexing")
                 index_single_cv.apply_async(args=[instance.id], countdown=2)
                 
-                # Also index the file for file search
-                if instance.file_path:
-                    logger.info(f"CV file processing completed: {instance.file_path} - queuing for file indexing")
-                    index_resume_file.apply_async(args=[instance.id], countdown=4)
-                
         except Exception as e:
             logger.error(f"Error checking processing status for CV {instance.id}: {e}")
@@ -0,0 +1,190 @@
+"""
+Type-ahead suggestions for CV and file search
+A completion-suggester index holding one entry per distinct skill, expertise area,
+employer, location and filename, weighted by how many documents contain it
+"""
+import hashlib
+import logging
+import uuid
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from django.conf import settings
+from elasticsearch import Elasticsearch
+from elasticsearch.helpers import bulk
+from elasticsearch_dsl import Document, Keyword, Integer, Completion, analyzer
+from .indices import FILE_INDEX_ALIAS
+
+logger = logging.getLogger(__name__)
+
+SUGGESTION_INDEX = 'search_suggestions'
+
+# Suggestion kind -> (source index, keyword field whose distinct values are suggested);
+# CV fields exist only on the corpus documents of CV files
+SUGGESTION_SOURCES: Dict[str, Tuple[str, str]] = {
+    'skill': (FILE_INDEX_ALIAS, 'skill_keywords'),
+    'expertise': (FILE_INDEX_ALIAS, 'expertise_areas'),
+    'employer': (FILE_INDEX_ALIAS, 'current_employer.raw'),
+    'location': (FILE_INDEX_ALIAS, 'location.raw'),
+    'filename': (FILE_INDEX_ALIAS, 'filename.raw'),
+}
+CV_SUGGESTION_KINDS = ['skill', 'expertise', 'employer', 'location']
+FILE_SUGGESTION_KINDS = ['filename']
+
+MAX_VALUE_LENGTH = 200
+MAX_WEIGHT = 2 ** 31 - 1
+# Inputs per value: the whole value plus the text from its 2nd..Nth word, so "bank" finds "World Bank"
+MAX_WORD_SUFFIXES = 3
+
+# Whole value as one lowercased, accent-folded token: prefixes match from the start of an input
+suggest_analyzer = analyzer('suggest_analyzer', tokenizer='keyword', filter=['lowercase', 'asciifolding'])
+
+
+class SuggestionDocument(Document):
+    """One suggestable value"""
+    value = Keyword()
+    kind = Keyword()
+    doc_count = Integer()
+    build_id = Keyword()
+    suggest = Completion(
+        analyzer=suggest_analyzer,
+        contexts=[{'name': 'kind', 'type': 'category', 'path': 'kind'}]
+    )
+
+    class Index:
+        name = SUGGESTION_INDEX
+        settings = {
+            'number_of_shards': 1,
+            'number_of_replicas': 0
+        }
+
+
+def suggestion_inputs(value: str) -> List[str]:
+    """Completion inputs for a value"""
+    words = value.split()
+    return [value] + [' '.join(words[i:]) for i in range(1, min(len(words), MAX_WORD_SUFFIXES + 1))]
+
+
+class SuggestionService:
+    """Builds and queries the suggestion index"""
+
+    def __init__(self):
+        es_host = getattr(settings, 'ELASTICSEARCH_HOST', 'localhost')
+        es_port = getattr(settings, 'ELASTICSEARCH_PORT', 9200)
+        self.es_client = Elasticsearch([f'{es_host}:{es_port}'])
+
+    def suggest(self, prefix: str, kinds: List[str], limit: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """
+        Most frequent values of the given kinds starting with `prefix`
+        (or with one of their first words).
+
+        Returns:
+            List of dicts with value, kind and count, or None if the index is unavailable
+        """
+        try:
+            response = self.es_client.search(index=SUGGESTION_INDEX, body={
+                'size': 0,
+                '_source': ['value', 'kind', 'doc_count'],
+                'suggest': {
+                    'values': {
+                        'prefix': prefix,
+                        'completion': {
+                            'field': 'suggest',
+                            'size': limit,
+                            'skip_duplicates': True,
+                            'contexts': {'kind': kinds},
+                        }
+                    }
+                }
+            })
+        except Exception as e:
+            logger.warning(f"Suggestion lookup failed for '{prefix}': {e}")
+            return None
+
+        suggestions = []
+        seen = set()
+        for option in response['suggest']['values'][0]['options']:
+            source = option['_source']
+            # Several inputs of one value can match the same prefix
+            if (source['kind'], source['value']) in seen:
+                continue
+            seen.add((source['kind'], source['value']))
+            suggestions.append({'value': source['value'], 'kind': source['kind'], 'count': source['doc_count']})
+        return suggestions
+
+    def rebuild(self, kinds: Optional[List[str]] = None, page_size: int = 1000) -> Dict[str, int]:
+        """
+        Re-aggregate the distinct values of each kind from the CV and file
+        indices and replace that kind's suggestions.
+
+        Returns:
+            Number of suggestions written per kind
+        """
+        kinds = kinds or list(SUGGESTION_SOURCES)
+        SuggestionDocument.init(using=self.es_client)
+        build_id = uuid.uuid4().hex
+        counts = {kind: 0 for kind in kinds}
+
+        def actions():
+            for kind in kinds:
+                index, field = SUGGESTION_SOURCES[kind]
+                if not self.es_client.indices.exists(index=index):
+                    logger.warning(f"Skipping {kind} suggestions: index {index} does not exist")
+                    continue
+                for value, doc_count in self._iter_field_values(index, field, page_size):
+                    value = str(value).strip()
+                    if not value or len(value) > MAX_VALUE_LENGTH:
+                        continue
+                    counts[kind] += 1
+                    yield {
+                        '_index': SUGGESTION_INDEX,
+                        '_id': f"{kind}:{hashlib.md5(value.encode()).hexdigest()}",
+                        '_source': {
+                            'value': value,
+                            'kind': kind,
+                            'doc_count': doc_count,
+                            'build_id': build_id,
+                            'suggest': {'input': suggestion_inputs(value), 'weight': min(doc_count, MAX_WEIGHT)},
+                        }
+                    }
+
+        bulk(self.es_client, actions(), chunk_size=page_size)
+
+        # Values that no longer occur in any document were not rewritten by this build.
+        # Kinds whose source index was missing or yielded nothing keep their old
+        # suggestions rather than being wiped.
+        rebuilt = [kind for kind in kinds if counts[kind]]
+        skipped = [kind for kind in kinds if not counts[kind]]
+        if skipped:
+            logger.warning(f"Kept previous suggestions for {skipped}: no values were rebuilt")
+        if rebuilt:
+            self.es_client.delete_by_query(index=SUGGESTION_INDEX, refresh=True, body={
+                'query': {
+                    'bool': {
+                        'filter': [{'terms': {'kind': rebuilt}}],
+                        'must_not': [{'term': {'build_id': build_id}}],
+                    }
+                }
+            })
+        logger.info(f"Rebuilt search suggestions: {counts}")
+        return counts
+
+    def _iter_field_values(self, index: str, field: str, page_size: int) -> Iterator[Tuple[str, int]]:
+        """Every distinct value of a keyword field with its document count (composite aggregation pages)"""
+        after = None
+        while True:
+            composite = {'size': page_size, 'sources': [{'value': {'terms': {'field': field}}}]}
+            if after:
+                composite['after'] = after
+            response = self.es_client.search(index=index, body={
+                'size': 0,
+                'aggs': {'values': {'composite': composite}}
+            })
+            aggregation = response['aggregations']['values']
+            for bucket in aggregation['buckets']:
+                yield bucket['key']['value'], bucket['doc_count']
+            after = aggregation.get('after_key')
+            if not after or not aggregation['buckets']:
+                break
+
+
+# Global instance for easy import
+suggestion_service = SuggestionService()
@@ -3,15 +3,35 @@ Celery tasks for background CV indexing
 Automatically index new CVs when they're uploaded or detected by QueryMind
 """
 from celery import shared_task
+from celery.signals import worker_ready
 from django.db import transaction
 from apps.resumes.models import Resume
 from apps.search.services import SearchService
-from apps.search.documents import CVDocument
+from apps.search.indices import FILE_INDEX_ALIAS
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@worker_ready.connect
+def ensure_search_index(**kwargs):
+    """Create the search corpus index once when a worker starts, not on every indexing task"""
+    try:
+        from apps.search.file_search_service import FileSearchService
+        
+        file_service = FileSearchService()
+        if file_service.es_client:
+            file_service.create_file_index()
+    except Exception as e:
+        logger.warning(f"Could not verify/create search index at worker startup: {e}")
+
+
+def _reindex_resumes(resume_ids):
+    """Re-index resumes that shared a document with a CV that moved or was deleted"""
+    for other_id in resume_ids:
+        index_single_cv.apply_async(args=[other_id])
+
+
 @shared_task(bind=True, max_retries=3)
 def index_single_cv(self, resume_id):
     """
@@ -26,62 +46,24 @@ def index_single_cv(self, resume_id):
     try:
         resume = Resume.objects.get(id=resume_id)
         
-        # Create document
-        doc = CVDocument()
-        doc.meta.id = resume.id
-        
-        # Set fields using the same logic as our management command
-        doc.name = f"{resume.first_name or ''} {resume.last_name or ''}".strip()
-        doc.email = resume.email or ''
-        doc.phone = resume.phone_number or ''
-        doc.skills = resume.skill_keywords or ''
-        doc.experience = resume.expertise_details or ''
-        doc.education = ''  # No direct education field in this model
-        doc.summary = resume.expertise_areas or ''
-        doc.location = resume.location or ''
-        doc.current_employer = resume.current_employer or ''
-        doc.years_of_experience = resume.years_of_experience or 0
-        doc.sectors = resume.sectors or ''
-        doc.linkedin_profile = resume.linkedin_profile or ''
-        doc.languages_spoken = resume.languages_spoken or ''
-        doc.professional_certifications = resume.professional_certifications or ''
-        
-        # Try to extract file content
-        try:
-            if resume.file_path:
-                from pathlib import Path
-                from django.core.files.storage import default_storage
-                
-                # Get the full file path
-                if default_storage.exists(resume.file_path):
-                    if hasattr(default_storage, 'path'):
-                        # For local storage, get the actual file path
-                        file_path = Path(default_storage.path(resume.file_path))
-                    else:
-                        # For other storage backends, use the file_path as is
-                        file_path = Path(resume.file_path)
-                    
-                    if file_path.exists():
-                        doc.file_content = doc.extract_file_content(str(file_path))
-                    else:
-                        doc.file_content = ""
-                else:
-                    doc.file_content = ""
-            else:
-                doc.file_content = ""
-        except Exception as file_error:
-            logger.warning(f"Could not extract content from file for resume {resume_id}: {file_error}")
-            doc.file_content = ""
-        
-        # Save to Elasticsearch
-        doc.save()
+        # One corpus document per file: CV fields are added to the file's document,
+        # extracting the file only if its content hash is not indexed yet
+        from apps.search.file_search_service import FileSearchService
+        
+        file_service = FileSearchService()
+        if not file_service.es_client:
+            raise RuntimeError('Elasticsearch not available')
+        result = file_service.index_resume(resume)
+        _reindex_resumes(result['detached_from'])
         
         logger.info(f"Successfully indexed CV {resume_id}: {resume.first_name} {resume.last_name}")
         
         return {
             'status': 'success',
             'resume_id': str(resume_id),
-            'name': f"{resume.first_name} {resume.last_name}"
+            'name': f"{resume.first_name} {resume.last_name}",
+            'action': result['action'],
+            'took_ms': result['took_ms']
         }
         
     except Resume.DoesNotExist:
@@ -177,12 +159,11 @@ def delete_cv_from_index(resume_id):
         resume_id: UUID of the deleted resume
     """
     try:
-        from elasticsearch import Elasticsearch
-        
-        es = Elasticsearch([{'host': 'localhost', 'port': 9200}])
+        from apps.search.file_search_service import FileSearchService
         
-        # Delete from Elasticsearch
-        es.delete(index='cv_documents', id=str(resume_id), ignore=[404])
+        # Detach the CV from its document; the document goes unless it is also an indexed file
+        remaining = FileSearchService().delete_resume_from_index(resume_id)
+        _reindex_resumes(remaining)
         
         logger.info(f"Removed CV {resume_id} from search index")
         
@@ -211,7 +192,7 @@ def refresh_search_index():
         from elasticsearch import Elasticsearch
         
         es = Elasticsearch([{'host': 'localhost', 'port': 9200}])
-        es.indices.refresh(index='cv_documents')
+        es.indices.refresh(index=FILE_INDEX_ALIAS)
         
         logger.info("Search index refreshed")
         return {'status': 'success', 'action': 'index_refreshed'}
@@ -284,14 +265,10 @@ def index_resume_file(self, resume_id):
                 'reason': 'No file path'
             }
         
-        # Import file service
         from apps.search.file_search_service import FileSearchService
-        from django.core.files.storage import default_storage
-        import os
         
         file_service = FileSearchService()
         
-        # Ensure file index exists
         if not file_service.es_client:
             logger.error(f"Elasticsearch client not available for resume {resume_id}")
             return {
@@ -299,51 +276,18 @@ def index_resume_file(self, resume_id):
                 'resume_id': str(resume_id),
                 'error': 'Elasticsearch not available'
             }
+        # Same write as index_single_cv: the file's document carries the CV fields
+        result = file_service.index_resume(resume)
+        _reindex_resumes(result['detached_from'])
         
-        # Check if file index exists, create if it doesn't
-        try:
-            from apps.search.file_documents import FileDocument
-            if not FileDocument._index.exists(using=file_service.es_client):
-                logger.info("File index doesn't exist, creating it...")
-                file_service.create_file_index()
-        except Exception as index_error:
-            logger.warning(f"Could not verify/create file index: {index_error}")
-        
-        # Get the actual file path
-        if default_storage.exists(resume.file_path):
-            if hasattr(default_storage, 'path'):
-                actual_file_path = default_storage.path(resume.file_path)
-            else:
-                actual_file_path = resume.file_path
-            
-            # Determine base directory (media uploads directory)
-            base_directory = os.path.dirname(actual_file_path)
-            
-            # Index the file
-            success = file_service.index_file(actual_file_path, base_directory)
-            
-            if success:
-                logger.info(f"Successfully indexed resume file: {resume.original_filename} (ID: {resume_id})")
-                return {
-                    'status': 'success',
-                    'resume_id': str(resume_id),
-                    'filename': resume.original_filename,
-                    'file_path': resume.file_path
-                }
-            else:
-                logger.error(f"Failed to index resume file: {resume.file_path}")
-                return {
-                    'status': 'error',
-                    'resume_id': str(resume_id),
-                    'error': 'File indexing failed'
-                }
-        else:
-            logger.error(f"Resume file does not exist: {resume.file_path}")
-            return {
-                'status': 'error',
-                'resume_id': str(resume_id),
-                'error': 'File does not exist'
-            }
+        logger.info(f"Successfully indexed resume file: {resume.original_filename} (ID: {resume_id})")
+        return {
+            'status': 'success',
+            'resume_id': str(resume_id),
+            'filename': resume.original_filename,
+            'file_path': resume.file_path,
+            'action': result['action']
+        }
             
     except Resume.DoesNotExist:
         logger.error(f"Resume {resume_id} does not exist")
@@ -410,3 +354,26 @@ def delete_resume_file_from_index(self, file_path):
             'file_path': file_path,
             'error': str(e)
         }
+
+
+@shared_task
+def rebuild_search_suggestions(kinds=None):
+    """
+    Rebuild the type-ahead suggestion index from the CV and file indices.
+    Scheduled hourly via CELERY_BEAT_SCHEDULE.
+    
+    Args:
+        kinds: Suggestion kinds to rebuild (default: all)
+        
+    Returns:
+        dict: Number of suggestions written per kind
+    """
+    try:
+        from apps.search.suggestions import suggestion_service
+        
+        counts = suggestion_service.rebuild(kinds)
+        return {'status': 'success', 'suggestions': counts}
+        
+    except Exception as e:
+        logger.error(f"Failed to rebuild search suggestions: {e}")
+        return {'status': 'error', 'error': str(e)}
@@ -1,3 +1,159 @@
-from django.test import TestCase
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from .pagination import InvalidCursorError, decode_cursor, encode_cursor
+from .query_parser import (
+    And, Near, Not, Or, Phrase, QueryParseError, Term,
+    compile_query, parse_boolean_query, query_operators, _parse_cached,
+)
+
+FIELDS = {'name': 'name', 'skills': 'skills', 'content': 'extracted_text'}
+
+# Query -> expected parse tree
+BOOLEAN_QUERY_CORPUS = [
+    ('python', Term('python')),
+    ('python developer', And((Term('python'), Term('developer')))),
+    ('Python AND Django', And((Term('Python'), Term('Django')))),
+    ('Manager OR Lead', Or((Term('Manager'), Term('Lead')))),
+    ('Java NOT JavaScript', And((Term('Java'), Not(Term('JavaScript'))))),
+    ('NOT intern', Not(Term('intern'))),
+    ('python and django or flask', Or((And((Term('python'), Term('django'))), Term('flask')))),
+    ('python AND (django OR flask)', And((Term('python'), Or((Term('django'), Term('flask')))))),
+    ('(a OR b) AND (c OR d)', And((Or((Term('a'), Term('b'))), Or((Term('c'), Term('d')))))),
+    ('a AND (b AND c)', And((Term('a'), Term('b'), Term('c')))),
+    ('"machine learning"', Phrase('machine learning')),
+    ('"machine learning" AND python', And((Phrase('machine learning'), Term('python')))),
+    ('develop*', Term('develop*')),
+    ('colo?r', Term('colo?r')),
+    ('skills:python', Term('python', 'skills')),
+    ('name:"john smith"', Phrase('john smith', 'name')),
+    ('content:budget* NOT skills:excel', And((Term('budget*', 'extracted_text'), Not(Term('excel', 'skills'))))),
+    ('manager w/5 project', Near((Term('manager'), Term('project')), 5)),
+    ('manager W/5 project', Near((Term('manager'), Term('project')), 5)),
+    ('senior pre/2 engineer', Near((Term('senior'), Term('engineer')), 2, ordered=True)),
+    ('(python OR java) w/3 developer', Near((Or((Term('python'), Term('java'))), Term('developer')), 3)),
+    ('"project manager" w/10 budget', Near((Phrase('project manager'), Term('budget')), 10)),
+    ('http://example.com', Term('http://example.com')),
+    ('time:10', Term('time:10')),
+    ('python OR python', Term('python')),
+]
+
+INVALID_QUERIES = [
+    '',
+    '"unterminated',
+    '(python OR django',
+    'python AND',
+    'OR python',
+    'python )',
+    '***',
+    '""',
+    'skills:',
+    'a w/5 (b AND c)',
+    'a w/500 b',
+]
+
+
+class BooleanQueryParserTests(SimpleTestCase):
+
+    def test_corpus_parses_to_expected_trees(self):
+        for query, expected in BOOLEAN_QUERY_CORPUS:
+            with self.subTest(query=query):
+                self.assertEqual(parse_boolean_query(query, FIELDS), expected)
+
+    def test_invalid_queries_raise(self):
+        for query in INVALID_QUERIES:
+            with self.subTest(query=query):
+                with self.assertRaises(QueryParseError):
+                    parse_boolean_query(query, FIELDS)
+
+    def test_error_reports_position(self):
+        with self.assertRaises(QueryParseError) as context:
+            parse_boolean_query('python )', FIELDS)
+        self.assertEqual(context.exception.position, 7)
+
+    def test_unknown_field_is_a_plain_term(self):
+        self.assertEqual(parse_boolean_query('salary:100k', FIELDS), Term('salary:100k'))
+
+    def test_query_operators(self):
+        parsed = parse_boolean_query('(a OR b) AND "c d" NOT e* w/3 f', FIELDS)
+        self.assertEqual(query_operators(parsed), ['AND', 'OR', 'PHRASE', 'NOT', 'W/3', 'WILDCARD'])
+
+
+class BooleanQueryCompilerTests(SimpleTestCase):
+    fields = ['extracted_text^2.0', 'name^1.8']
+
+    def compile(self, query):
+        return compile_query(parse_boolean_query(query, FIELDS), self.fields)
+
+    def test_term(self):
+        self.assertEqual(self.compile('python'), {
+            'multi_match': {'query': 'python', 'fields': self.fields, 'type': 'best_fields'}
+        })
+
+    def test_and_not_share_one_bool(self):
+        query = self.compile('python django NOT flask')
+        self.assertEqual(len(query['bool']['must']), 2)
+        self.assertEqual(query['bool']['must_not'][0]['multi_match']['query'], 'flask')
+
+    def test_pure_negation_matches_everything_else(self):
+        self.assertEqual(self.compile('NOT intern')['bool']['must'], [{'match_all': {}}])
+
+    def test_or(self):
+        query = self.compile('manager OR lead')
+        self.assertEqual(query['bool']['minimum_should_match'], 1)
+        self.assertEqual(len(query['bool']['should']), 2)
+
+    def test_phrase_on_field(self):
+        self.assertEqual(self.compile('name:"john smith"'), {
+            'multi_match': {'query': 'john smith', 'fields': ['name'], 'type': 'phrase'}
+        })
+
+    def test_wildcard_is_lowercased_per_field(self):
+        query = self.compile('Develop*')
+        self.assertEqual(query['bool']['should'][0], {'wildcard': {'extracted_text': {'value': 'develop*', 'boost': 2.0}}})
+        self.assertEqual(query['bool']['should'][1], {'wildcard': {'name': {'value': 'develop*', 'boost': 1.8}}})
+
+    def test_proximity_compiles_to_intervals(self):
+        query = self.compile('(python OR java) pre/3 developer')
+        rule = query['bool']['should'][0]['intervals']['extracted_text']
+        self.assertEqual(rule['all_of']['max_gaps'], 3)
+        self.assertTrue(rule['all_of']['ordered'])
+        self.assertIn('any_of', rule['all_of']['intervals'][0])
+
+    def test_proximity_on_one_field(self):
+        query = self.compile('content:budget w/5 content:forecast')
+        self.assertEqual(list(query['intervals']), ['extracted_text'])
+
+    def test_proximity_across_fields_is_rejected(self):
+        with self.assertRaises(QueryParseError):
+            self.compile('name:john w/2 skills:python')
+
+
+class BooleanQueryCacheTests(SimpleTestCase):
+
+    def test_corpus_compiles_with_a_cold_cache(self):
+        _parse_cached.cache_clear()
+        for query, _ in BOOLEAN_QUERY_CORPUS:
+            self.assertIsInstance(compile_query(parse_boolean_query(query, FIELDS), ['extracted_text^2.0', 'name^1.8']), dict)
+
+    def test_repeated_queries_hit_the_parse_cache(self):
+        _parse_cached.cache_clear()
+        parse_boolean_query('python AND (django OR flask)', FIELDS)
+        parse_boolean_query('python AND (django OR flask)', FIELDS)
+        self.assertEqual(_parse_cached.cache_info().hits, 1)
+
+
+class CursorTests(SimpleTestCase):
+
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor('pit-id==', [12.5, 'abc', 42])
+        self.assertEqual(decode_cursor(cursor), ('pit-id==', [12.5, 'abc', 42]))
+
+    def test_cursor_is_url_safe(self):
+        cursor = encode_cursor('a+b/c' * 20, [1.0, 2])
+        self.assertNotRegex(cursor, r'[+/]')
+
+    def test_invalid_cursor_raises(self):
+        for cursor in ['not-a-cursor', encode_cursor('pit', [])[:-4] + '!!!!', 'e30=']:
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(InvalidCursorError):
+                    decode_cursor(cursor)
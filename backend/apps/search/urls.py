@@ -11,6 +11,8 @@ app_name = 'search'
 file_urlpatterns = [
     path('search', file_views.search_files_only, name='file_search_only'),
     path('suggestions', file_views.file_suggestions, name='file_suggestions'),
+    path('facets', file_views.file_facets, name='file_facets'),
+    path('export', file_views.export_files, name='export_files'),
     path('index/directory', file_views.index_directory, name='index_directory'),
     path('index/file', file_views.index_single_file, name='index_single_file'),
     path('index/delete', file_views.delete_file_from_index, name='delete_file_from_index'),
@@ -30,6 +32,10 @@ urlpatterns = [
     path('boolean', views.boolean_search, name='boolean_search_no_slash'),  # Support URL without trailing slash
     path('suggest/', views.search_suggestions, name='search_suggestions'),
     path('suggest', views.search_suggestions, name='search_suggestions_no_slash'),  # Support URL without trailing slash
+    path('facets/', views.search_facets, name='search_facets'),
+    path('facets', views.search_facets, name='search_facets_no_slash'),  # Support URL without trailing slash
+    path('export/', views.export_cvs, name='export_cvs'),
+    path('export', views.export_cvs, name='export_cvs_no_slash'),  # Support URL without trailing slash
     path('database-files/', views.file_search, name='file_search'),  # Database-linked file search (renamed to avoid conflict)
     path('database-files', views.file_search, name='file_search_no_slash'),  # Support URL without trailing slash
     
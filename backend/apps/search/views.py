@@ -6,22 +6,75 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.conf import settings
+import json
 import logging
 
-from .services import search_service, SearchService
+from .services import search_service, BOOLEAN_FIELD_ALIASES
+from .query_parser import parse_boolean_query, query_operators, QueryParseError
+from .facets import CV_FACETS, parse_facet_names
+from .pagination import InvalidCursorError, MAX_RESULT_WINDOW
+from .indices import get_alias_indices
+
+# CV fields written per line by the NDJSON export (full text stays in the index)
+CV_EXPORT_FIELDS = [
+    'name', 'email', 'phone', 'location', 'current_employer', 'years_of_experience',
+    'skill_keywords', 'expertise_areas', 'sectors', 'filename', 'file_path', 'file_type',
+    'file_size', 'indexed_date', 'resume_ids',
+]
 
 logger = logging.getLogger(__name__)
 
+def _get_cv_filters(params) -> dict:
+    """CV search filters from query parameters"""
+    filters = {}
+    
+    if params.get('file_type'):
+        filters['file_type'] = params.get('file_type')
+    
+    if params.get('skills'):
+        skills = [s.strip() for s in params.get('skills').split(',') if s.strip()]
+        if skills:
+            filters['skills'] = skills
+    
+    for name in ('sectors', 'expertise'):
+        values = [v.strip() for v in params.get(name, '').split(',') if v.strip()]
+        if values:
+            filters[name] = values
+    
+    if params.get('location'):
+        filters['location'] = params.get('location')
+    
+    if params.get('years_of_experience'):
+        try:
+            filters['years_of_experience'] = int(params.get('years_of_experience'))
+        except ValueError:
+            pass
+    
+    if params.get('date_from'):
+        filters['date_from'] = params.get('date_from')
+    
+    if params.get('date_to'):
+        filters['date_to'] = params.get('date_to')
+    
+    if params.get('min_file_size'):
+        try:
+            filters['min_file_size'] = int(params.get('min_file_size'))
+        except ValueError:
+            pass
+    
+    return filters
+
 @api_view(['GET'])
 def search_cvs(request):
     """
     Main search endpoint - DTSearch-like functionality
     
     GET /api/search/?q=python+developer&skills=python,django&page=1&size=20
+    GET /api/search/?q=python+developer&cursor=  (then &cursor=<next_cursor> for each following page)
     """
     try:
         # Get query parameters
@@ -29,28 +82,8 @@ def search_cvs(request):
         page = int(request.GET.get('page', 1))
         page_size = min(int(request.GET.get('size', 20)), 100)  # Max 100 per page
         
-        # Get filters
-        filters = {}
-        
-        if request.GET.get('file_type'):
-            filters['file_type'] = request.GET.get('file_type')
-        
-        if request.GET.get('skills'):
-            skills = [s.strip() for s in request.GET.get('skills').split(',') if s.strip()]
-            if skills:
-                filters['skills'] = skills
-        
-        if request.GET.get('date_from'):
-            filters['date_from'] = request.GET.get('date_from')
-        
-        if request.GET.get('date_to'):
-            filters['date_to'] = request.GET.get('date_to')
-        
-        if request.GET.get('min_file_size'):
-            try:
-                filters['min_file_size'] = int(request.GET.get('min_file_size'))
-            except ValueError:
-                pass
+        filters = _get_cv_filters(request.GET)
+        facets = parse_facet_names(request.GET.get('facets'), CV_FACETS)
         
         # Perform search
         if not query:
@@ -59,20 +92,50 @@ def search_cvs(request):
                 'example': '/api/search/?q=python+developer'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        results = search_service.search_documents(
-            query=query,
-            filters=filters,
-            page=page,
-            page_size=page_size
-        )
-        
-        # Add pagination info
-        results['pagination'] = {
-            'current_page': page,
-            'page_size': page_size,
-            'has_next': len(results['hits']) == page_size,
-            'has_previous': page > 1
-        }
+        # Cursor pagination: any depth, constant cost per page
+        if 'cursor' in request.GET:
+            try:
+                results = search_service.search_documents_cursor(
+                    query=query,
+                    filters=filters,
+                    cursor=request.GET.get('cursor') or None,
+                    page_size=page_size,
+                    facets=facets
+                )
+            except InvalidCursorError as e:
+                return Response({
+                    'error': 'Invalid cursor',
+                    'detail': str(e)
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            next_cursor = results.pop('next_cursor')
+            results['pagination'] = {
+                'page_size': page_size,
+                'next_cursor': next_cursor,
+                'has_next': next_cursor is not None
+            }
+        else:
+            if page * page_size > MAX_RESULT_WINDOW:
+                return Response({
+                    'error': f'Page is beyond the first {MAX_RESULT_WINDOW} results',
+                    'detail': 'Use cursor pagination (cursor=) for deeper pages'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            results = search_service.search_documents(
+                query=query,
+                filters=filters,
+                page=page,
+                page_size=page_size,
+                facets=facets
+            )
+            
+            # Add pagination info
+            results['pagination'] = {
+                'current_page': page,
+                'page_size': page_size,
+                'has_next': len(results['hits']) == page_size,
+                'has_previous': page > 1
+            }
         
         # Add search metadata
         results['search_info'] = {
@@ -90,6 +153,80 @@ def search_cvs(request):
             'detail': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['GET'])
+def export_cvs(request):
+    """
+    Stream every CV matching a query as NDJSON (one JSON object per line),
+    reading the index in batches so memory stays constant
+    
+    GET /api/search/export/?q=python&skills=django   (q=* or no q exports all CVs)
+    """
+    if not search_service.es_client:
+        return Response({
+            'error': 'Search service unavailable'
+        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    
+    query = request.GET.get('q', '').strip()
+    filters = _get_cv_filters(request.GET)
+    hits = search_service.iter_matching_documents(
+        '' if query == '*' else query, filters, fields=CV_EXPORT_FIELDS
+    )
+    
+    def lines():
+        try:
+            for hit in hits:
+                row = hit.to_dict()
+                # id is the resume, as in search results; document_id the file's content hash
+                resume_ids = row.get('resume_ids') or [hit.meta.id]
+                yield json.dumps(dict(row, id=resume_ids[-1], document_id=hit.meta.id), default=str) + '\n'
+        except Exception as e:
+            # Headers are already sent; end the stream with an error line
+            logger.error(f"CV export failed for query '{query}': {e}")
+            yield json.dumps({'error': 'Export failed', 'detail': str(e)}) + '\n'
+    
+    response = StreamingHttpResponse(lines(), content_type='application/x-ndjson')
+    response['Content-Disposition'] = 'attachment; filename="cv_search_export.ndjson"'
+    return response
+
+@api_view(['GET'])
+def search_facets(request):
+    """
+    Facet counts for CV search, without hits
+    
+    GET /api/search/facets/?q=python&facets=skills,location,experience
+    GET /api/search/facets/?facets=all  (whole index)
+    """
+    try:
+        query = request.GET.get('q', '').strip()
+        facets = parse_facet_names(request.GET.get('facets', 'all'), CV_FACETS)
+        if not facets:
+            return Response({
+                'error': 'No known facets requested',
+                'available_facets': list(CV_FACETS)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        filters = _get_cv_filters(request.GET)
+        results = search_service.get_facets(query, filters, facets)
+        if results is None:
+            return Response({
+                'error': 'Facets unavailable',
+                'detail': 'Check Elasticsearch connection'
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        
+        results['search_info'] = {
+            'query': query,
+            'filters_applied': filters,
+            'search_time_ms': results.get('took', 0)
+        }
+        return Response(results, status=status.HTTP_200_OK)
+        
+    except Exception as e:
+        logger.error(f"Facets API error: {e}")
+        return Response({
+            'error': 'Facets failed',
+            'detail': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 @api_view(['GET'])
 def boolean_search(request):
     """
@@ -98,6 +235,8 @@ def boolean_search(request):
     GET /api/search/boolean/?q=Python+AND+Django
     GET /api/search/boolean/?q=Manager+OR+Lead
     GET /api/search/boolean/?q=Java+NOT+JavaScript
+    GET /api/search/boolean/?q=(Python+OR+Django)+AND+"machine+learning"&page=2
+    GET /api/search/boolean/?q=manager+w/5+project
     """
     try:
         query = request.GET.get('q', '').strip()
@@ -112,25 +251,36 @@ def boolean_search(request):
                 ]
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        results = search_service.boolean_search(query)
+        page = int(request.GET.get('page', 1))
+        page_size = min(int(request.GET.get('size', 20)), 100)  # Max 100 per page
+        filters = _get_cv_filters(request.GET)
+        
+        try:
+            parsed = parse_boolean_query(query, BOOLEAN_FIELD_ALIASES)
+            results = search_service.boolean_search(query, filters=filters, page=page, page_size=page_size)
+        except QueryParseError as e:
+            return Response({
+                'error': 'Invalid boolean query',
+                'detail': str(e),
+                'position': e.position
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        results['pagination'] = {
+            'current_page': page,
+            'page_size': page_size,
+            'has_next': page * page_size < results.get('total_hits', 0),
+            'has_previous': page > 1
+        }
         
         # Add search metadata
         results['search_info'] = {
             'query': query,
             'search_type': 'boolean',
-            'operators_detected': [],
+            'operators_detected': query_operators(parsed),
+            'filters_applied': filters,
             'search_time_ms': results.get('took', 0)
         }
         
-        # Detect operators used
-        query_upper = query.upper()
-        if ' AND ' in query_upper:
-            results['search_info']['operators_detected'].append('AND')
-        if ' OR ' in query_upper:
-            results['search_info']['operators_detected'].append('OR')
-        if ' NOT ' in query_upper:
-            results['search_info']['operators_detected'].append('NOT')
-        
         return Response(results, status=status.HTTP_200_OK)
         
     except Exception as e:
@@ -194,11 +344,15 @@ def search_status(request):
             try:
                 # Get index stats
                 stats = search_service.es_client.indices.stats(index=search_service.index_name)
+                status_info['index_versions'] = get_alias_indices(search_service.es_client, search_service.index_name)
                 status_info['document_count'] = stats['_all']['total']['docs']['count']
                 status_info['index_size'] = stats['_all']['total']['store']['size_in_bytes']
             except:
                 status_info['document_count'] = 'Unknown'
                 status_info['index_size'] = 'Unknown'
+            
+            # Cache hit ratio and current index generation
+            status_info['result_cache'] = search_service.result_cache.stats()
         
         http_status = status.HTTP_200_OK if es_connected else status.HTTP_503_SERVICE_UNAVAILABLE
         
@@ -295,11 +449,32 @@ def file_search(request):
         
         # Get pagination parameters
         page = int(request.GET.get('page', 1))
-        size = int(request.GET.get('size', 20))
+        size = min(int(request.GET.get('size', 20)), 100)
+        params = request.GET if request.method == 'GET' else request.data
         
         # Perform search with file focus
-        search_service = SearchService()
-        results = search_service.search_documents(query, filters, page, size)
+        if 'cursor' in params:
+            try:
+                results = search_service.search_documents_cursor(
+                    query, filters, cursor=params.get('cursor') or None, page_size=size
+                )
+            except InvalidCursorError as e:
+                return Response({
+                    'error': 'Invalid cursor',
+                    'details': str(e)
+                }, status=status.HTTP_400_BAD_REQUEST)
+            results['pagination'] = {
+                'page_size': size,
+                'next_cursor': results.pop('next_cursor'),
+            }
+            results['pagination']['has_next'] = results['pagination']['next_cursor'] is not None
+        elif page * size > MAX_RESULT_WINDOW:
+            return Response({
+                'error': f'Page is beyond the first {MAX_RESULT_WINDOW} results',
+                'details': 'Use cursor pagination (cursor=) for deeper pages'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            results = search_service.search_documents(query, filters, page, size)
         
         # Add file-specific metadata to response
         results['search_info'] = {
@@ -342,13 +517,28 @@ def search_help(request):
                     'file_type': 'File type filter (pdf, doc, docx, txt)',
                     'date_from': 'Date filter from (YYYY-MM-DD)',
                     'date_to': 'Date filter to (YYYY-MM-DD)',
-                    'page': 'Page number (default: 1)',
-                    'size': 'Results per page (default: 20, max: 100)'
+                    'facets': f"Comma-separated facets to count over all matches ({', '.join(CV_FACETS)} or all)",
+                    'page': f'Page number (default: 1; page x size up to {MAX_RESULT_WINDOW})',
+                    'size': 'Results per page (default: 20, max: 100)',
+                    'cursor': 'Cursor pagination: empty for the first page, then pagination.next_cursor (replaces page)'
                 },
                 'examples': [
                     '/api/search/?q=python+developer',
                     '/api/search/?q=machine+learning&skills=python,tensorflow',
-                    '/api/search/?q=senior&file_type=pdf&page=2'
+                    '/api/search/?q=senior&file_type=pdf&page=2',
+                    '/api/search/?q=engineer&cursor='
+                ]
+            },
+            'export': {
+                'url': '/api/search/export/',
+                'method': 'GET',
+                'description': 'Every matching CV streamed as NDJSON (same filters as main search)',
+                'parameters': {
+                    'q': 'Search query (optional; * or empty exports all CVs)'
+                },
+                'examples': [
+                    '/api/search/export/?q=python&skills=django',
+                    '/api/search/export/?sectors=Banking'
                 ]
             },
             'boolean_search': {
@@ -356,12 +546,30 @@ def search_help(request):
                 'method': 'GET',
                 'description': 'Boolean search with AND, OR, NOT operators',
                 'parameters': {
-                    'q': 'Boolean query (required)'
+                    'q': 'Boolean query (required): AND, OR, NOT, W/n, PRE/n, "phrases", wildcards, field:term, parentheses',
+                    'page': 'Page number (default: 1)',
+                    'size': 'Results per page (default: 20, max: 100)'
                 },
                 'examples': [
                     '/api/search/boolean/?q=Python+AND+Django',
                     '/api/search/boolean/?q=Manager+OR+Lead',
-                    '/api/search/boolean/?q=Java+NOT+JavaScript'
+                    '/api/search/boolean/?q=Java+NOT+JavaScript',
+                    '/api/search/boolean/?q=(Python+OR+Django)+AND+"machine+learning"',
+                    '/api/search/boolean/?q=manager+w/5+project',
+                    '/api/search/boolean/?q=skills:develop*+NOT+name:"john+smith"'
+                ]
+            },
+            'facets': {
+                'url': '/api/search/facets/',
+                'method': 'GET',
+                'description': 'Facet counts without hits (same filters as main search)',
+                'parameters': {
+                    'q': 'Search query (optional; whole index when empty)',
+                    'facets': f"Comma-separated facets ({', '.join(CV_FACETS)} or all; default: all)"
+                },
+                'examples': [
+                    '/api/search/facets/?q=engineer&facets=skills,experience',
+                    '/api/search/facets/?facets=location'
                 ]
             },
             'suggestions': {
@@ -13,8 +13,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'resume_parser.settings')
 django.setup()
 
 from apps.resumes.models import Resume
-from apps.search.documents import CVDocument
-from elasticsearch_dsl import connections
+from apps.search.file_search_service import FileSearchService
 import logging
 
 # Set up logging
@@ -35,11 +34,11 @@ def index_cvs_manually():
         return
     
     # Create index if it doesn't exist
-    try:
-        CVDocument._index.create()
-        logger.info("Index created successfully")
-    except Exception as e:
-        logger.info(f"Index might already exist: {e}")
+    file_service = FileSearchService()
+    if not file_service.es_client:
+        logger.error("Elasticsearch is not available")
+        return
+    file_service.create_file_index()
     
     # Index documents in batches
     batch_size = 10
@@ -52,37 +51,10 @@ def index_cvs_manually():
         
         for resume in batch:
             try:
-                # Create document
-                doc = CVDocument()
-                doc.meta.id = resume.id
-                
-                # Set fields
-                doc.name = resume.name or ""
-                doc.email = resume.email or ""
-                doc.phone = resume.phone or ""
-                doc.skills = resume.skills or ""
-                doc.experience = resume.experience or ""
-                doc.education = resume.education or ""
-                doc.summary = resume.summary or ""
-                
-                # Try to extract file content
-                try:
-                    if resume.cv_file and hasattr(resume.cv_file, 'path'):
-                        file_path = Path(resume.cv_file.path)
-                        if file_path.exists():
-                            doc.file_content = doc.extract_file_content(str(file_path))
-                        else:
-                            doc.file_content = ""
-                    else:
-                        doc.file_content = ""
-                except Exception as file_error:
-                    logger.warning(f"Could not extract content from file for resume {resume.id}: {file_error}")
-                    doc.file_content = ""
-                
-                # Save document
-                doc.save()
+                # CV fields go onto the document of the CV's file, extracted once per content hash
+                result = file_service.index_resume(resume)
                 indexed_count += 1
-                logger.info(f"Indexed CV {resume.id}: {resume.name}")
+                logger.info(f"Indexed CV {resume.id}: {resume.first_name} {resume.last_name} ({result['action']})")
                 
             except Exception as e:
                 error_count += 1
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Startup cost report for the backend entry points.
+
+Boots `manage.py check`, the Celery worker app and the WSGI application in
+fresh interpreters and reports wall-clock startup time and peak RSS for each.
+Every target is measured twice:
+
+  lazy  - the current code, where unstructured partitioners load on first use
+  eager - the same boot with every unstructured partitioner imported up front,
+          which is what each process paid before the imports were made lazy
+
+Usage:
+    python measure_startup.py [--runs 3] [--json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+EAGER_PRELOAD = """
+import unstructured.partition.pdf
+import unstructured.partition.docx
+import unstructured.partition.doc
+import unstructured.partition.text
+import unstructured.partition.rtf
+"""
+
+TARGETS = {
+    'manage.py check': """
+from django.core.management import execute_from_command_line
+execute_from_command_line(['manage.py', 'check'])
+""",
+    'celery worker': """
+from resume_parser.celery import app
+app.loader.import_default_modules()
+""",
+    'wsgi application': """
+from resume_parser.wsgi import application
+""",
+}
+
+REPORT_SNIPPET = """
+import json, sys
+try:
+    import resource
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    rss_mb = usage / (1024 * 1024) if sys.platform == 'darwin' else usage / 1024
+except ImportError:
+    # No resource module on Windows; report timings only
+    rss_mb = None
+sys.stderr.write('STARTUP_REPORT ' + json.dumps({'rss_mb': rss_mb}) + '\\n')
+"""
+
+
+def run_target(code, eager):
+    """Run one boot in a fresh interpreter and return (seconds, rss_mb)"""
+    script = "import os\nos.environ.setdefault('DJANGO_SETTINGS_MODULE', 'resume_parser.settings')\n"
+    if eager:
+        script += EAGER_PRELOAD
+    script += "import django\ndjango.setup()\n" + code + REPORT_SNIPPET
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-c', script],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'boot failed')
+
+    rss_mb = None
+    for line in result.stderr.splitlines():
+        if line.startswith('STARTUP_REPORT '):
+            rss_mb = json.loads(line[len('STARTUP_REPORT '):])['rss_mb']
+    return elapsed, rss_mb
+
+
+def measure(runs):
+    """Measure every target in both modes, keeping the median of each"""
+    report = []
+    for name, code in TARGETS.items():
+        row = {'target': name}
+        for mode in ('eager', 'lazy'):
+            timings, rss_values = [], []
+            try:
+                for _ in range(runs):
+                    elapsed, rss_mb = run_target(code, eager=(mode == 'eager'))
+                    timings.append(elapsed)
+                    if rss_mb is not None:
+                        rss_values.append(rss_mb)
+                row[mode] = {
+                    'seconds': round(statistics.median(timings), 3),
+                    'rss_mb': round(statistics.median(rss_values), 1) if rss_values else None,
+                }
+            except Exception as e:
+                row[mode] = {'error': str(e)}
+        report.append(row)
+    return report
+
+
+def print_table(report):
+    """Print the report as a before/after table"""
+    header = f"{'target':<20} {'before s':>10} {'after s':>10} {'before MB':>10} {'after MB':>10}"
+    print(header)
+    print('-' * len(header))
+    for row in report:
+        before, after = row['eager'], row['lazy']
+        if 'error' in before or 'error' in after:
+            print(f"{row['target']:<20} error: {before.get('error') or after.get('error')}")
+            continue
+        print(
+            f"{row['target']:<20} {before['seconds']:>10} {after['seconds']:>10} "
+            f"{before['rss_mb'] or '-':>10} {after['rss_mb'] or '-':>10}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=3, help='Boots per target and mode (median is reported)')
+    parser.add_argument('--json', action='store_true', help='Print the raw report as JSON')
+    args = parser.parse_args()
+
+    report = measure(args.runs)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_table(report)
+
+
+if __name__ == '__main__':
+    main()
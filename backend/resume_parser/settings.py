@@ -31,6 +31,7 @@ DJANGO_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
 
 THIRD_PARTY_APPS = [
@@ -62,6 +63,10 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Debug profile: count Resume JSON column decodes per request (X-JSON-Decodes header)
+if DEBUG:
+    MIDDLEWARE.append('apps.core.middleware.JSONDecodeProfileMiddleware')
+
 # Disable automatic slash appending for API endpoints
 APPEND_SLASH = False
 
@@ -215,6 +220,11 @@ SPECTACULAR_SETTINGS = {
 # File Upload Settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = int(os.getenv('MAX_UPLOAD_SIZE', 10485760))  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = FILE_UPLOAD_MAX_MEMORY_SIZE
+# Hash uploads while they are received so exact re-uploads are rejected without re-reading them
+FILE_UPLOAD_HANDLERS = [
+    'apps.resumes.upload_handlers.HashingMemoryFileUploadHandler',
+    'apps.resumes.upload_handlers.HashingTemporaryFileUploadHandler',
+]
 ALLOWED_FILE_TYPES = os.getenv('ALLOWED_FILE_TYPES', 'pdf,docx,txt').split(',')
 
 # AI Configuration
@@ -225,6 +235,35 @@ GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-2.0-flash')
 AI_PROVIDER = os.getenv('AI_PROVIDER', 'openai')  # 'openai' or 'gemini' or 'both'
 MCP_SERVER_PORT = int(os.getenv('MCP_SERVER_PORT', 3001))
 
+# Text Extraction
+# Minimum check_extraction_quality score (0-100) a fast extractor must reach
+# before Unstructured/OCR fallbacks are skipped
+EXTRACTION_QUALITY_THRESHOLD = int(os.getenv('EXTRACTION_QUALITY_THRESHOLD', 60))
+
+# DOC to DOCX conversion (warm LibreOffice pool)
+LIBREOFFICE_PATH = os.getenv('LIBREOFFICE_PATH', '')  # Skips the executable lookup when set
+DOC_CONVERTER_POOL_SIZE = int(os.getenv('DOC_CONVERTER_POOL_SIZE', 2))
+DOC_CONVERSION_TIMEOUT = int(os.getenv('DOC_CONVERSION_TIMEOUT', 60))
+DOC_CONVERSION_CACHE_DIR = os.getenv('DOC_CONVERSION_CACHE_DIR', str(MEDIA_ROOT / 'conversion_cache'))
+DOC_CONVERSION_CACHE_MAX_MB = int(os.getenv('DOC_CONVERSION_CACHE_MAX_MB', 1024))  # Least recently used files are evicted beyond this (0 disables)
+
+# Extraction worker pool (parsers run in subprocesses with time and memory limits)
+EXTRACTION_POOL_ENABLED = os.getenv('EXTRACTION_POOL_ENABLED', 'True').lower() == 'true'
+EXTRACTION_POOL_WORKERS = int(os.getenv('EXTRACTION_POOL_WORKERS', 2))
+EXTRACTION_TIMEOUT = int(os.getenv('EXTRACTION_TIMEOUT', 120))  # seconds per job
+EXTRACTION_MAX_MEMORY_MB = int(os.getenv('EXTRACTION_MAX_MEMORY_MB', 1536))  # RSS limit per worker (needs psutil or /proc; 0 disables)
+EXTRACTION_MAX_JOBS_PER_WORKER = int(os.getenv('EXTRACTION_MAX_JOBS_PER_WORKER', 50))
+
+# Near-duplicate detection (MinHash/LSH over resume text)
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv('NEAR_DUPLICATE_THRESHOLD', 0.85))  # Estimated Jaccard similarity
+# Reuse the existing resume's parsed data instead of calling the AI for near-duplicates
+REUSE_NEAR_DUPLICATE_PARSE = os.getenv('REUSE_NEAR_DUPLICATE_PARSE', 'False').lower() == 'true'
+
+# Resume list search: tsvector/GIN full-text search on PostgreSQL (icontains on other databases)
+RESUME_FULL_TEXT_SEARCH = os.getenv('RESUME_FULL_TEXT_SEARCH', 'True').lower() == 'true'
+# With ?count=estimated, result sets the planner expects to be at least this large skip COUNT(*)
+RESUME_ESTIMATED_COUNT_THRESHOLD = int(os.getenv('RESUME_ESTIMATED_COUNT_THRESHOLD', 10000))
+
 # Celery Configuration (for background tasks)
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
@@ -238,6 +277,20 @@ CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_ALWAYS_EAGER = os.getenv('CELERY_TASK_ALWAYS_EAGER', 'True').lower() == 'true'
 CELERY_TASK_EAGER_PROPAGATES = True
 
+# Periodic tasks (run with `celery -A resume_parser beat`)
+CELERY_BEAT_SCHEDULE = {
+    # Stored freshness scores decay by one point per day of age
+    'refresh-freshness-scores': {
+        'task': 'apps.resumes.tasks.refresh_freshness_scores',
+        'schedule': 24 * 60 * 60,
+    },
+    # Type-ahead suggestions are aggregated from the search indices
+    'rebuild-search-suggestions': {
+        'task': 'apps.search.tasks.rebuild_search_suggestions',
+        'schedule': 60 * 60,
+    },
+}
+
 # Logging
 LOGGING = {
     'version': 1,
@@ -274,4 +327,21 @@ ELASTICSEARCH_INDEX_SETTINGS = {
             }
         }
     }
-}
\ No newline at end of file
+}
+
+# Seconds file searches reuse index statistics (total files, per-extension counts) before refreshing them
+FILE_INDEX_STATS_TTL = int(os.getenv('FILE_INDEX_STATS_TTL', 60))
+
+# Search result cache: seconds a result stays fresh, seconds the last result of a query is kept for
+# stale-while-revalidate, and requests within the fresh TTL that make a query "hot"
+SEARCH_CACHE_TTL = int(os.getenv('SEARCH_CACHE_TTL', 300))
+SEARCH_CACHE_STALE_TTL = int(os.getenv('SEARCH_CACHE_STALE_TTL', 3600))
+SEARCH_CACHE_HOT_THRESHOLD = int(os.getenv('SEARCH_CACHE_HOT_THRESHOLD', 3))
+
+# How long Elasticsearch keeps a point-in-time open between cursor pages (search_after pagination)
+SEARCH_PIT_KEEP_ALIVE = os.getenv('SEARCH_PIT_KEEP_ALIVE', '2m')
+
+# Primary shards for the CV and file indices (one shard comfortably holds tens of GB; more only add per-search overhead)
+SEARCH_INDEX_SHARDS = int(os.getenv('SEARCH_INDEX_SHARDS', 1))
+# Replicas per shard: 0 on a single-node cluster, 1 or more in production for failover and read throughput
+SEARCH_INDEX_REPLICAS = int(os.getenv('SEARCH_INDEX_REPLICAS', 0))
@@ -1,6 +1,6 @@
 'use client'
 
-import React, { useState, useEffect } from 'react'
+import React, { useState, useEffect, useRef } from 'react'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
 import { Button } from '@/components/ui/button'
 import { Input } from '@/components/ui/input'
@@ -16,7 +16,7 @@ import { EnhancedFileViewer } from '@/components/EnhancedFileViewer'
 import { Breadcrumb } from '@/components/Breadcrumb'
 import { PageHeader } from '@/components/PageHeader'
 import { useResumes } from '@/hooks/useResumes'
-import { Search, Upload, Users, Activity, Zap, File, ChevronLeft, ChevronRight } from 'lucide-react'
+import { Search, Upload, Users, Activity, Zap, File, ChevronDown } from 'lucide-react'
 import type { SelectedFilters } from '@/types/filters'
 import { Dialog, DialogContent, DialogHeader, DialogTitle } from '@/components/ui/dialog'
 import { Separator } from '@/components/ui/separator'
@@ -40,7 +40,9 @@ export default function Dashboard() {
     resumes, 
     stats, 
     loading, 
+    loadingMore,
     pagination,
+    loadMore,
     uploadResume, 
     batchUploadResumes, 
     getFilterOptions,
@@ -97,8 +99,8 @@ export default function Dashboard() {
           : [...currentValues, value]
       }
       
-      // Trigger backend search with new filters (reset to page 1)
-      fetchResumes(searchTerm, newFilters, 1)
+      // Trigger backend search with new filters (back to the first page)
+      fetchResumes(searchTerm, newFilters)
       
       return newFilters
     })
@@ -121,30 +123,25 @@ export default function Dashboard() {
 
   const handleSearchChange = (term: string) => {
     setSearchTerm(term)
-    // Trigger backend search with current filters (reset to page 1)
-    fetchResumes(term, selectedFilters, 1)
+    // Trigger backend search with current filters (back to the first page)
+    fetchResumes(term, selectedFilters)
   }
 
   const availableFilters = getFilterOptions()
 
-  // Pagination handlers
-  const handlePageChange = (newPage: number) => {
-    if (newPage >= 1 && newPage <= pagination.totalPages) {
-      fetchResumes(searchTerm, selectedFilters, newPage)
-    }
-  }
-
-  const handlePreviousPage = () => {
-    if (pagination.currentPage > 1) {
-      handlePageChange(pagination.currentPage - 1)
-    }
-  }
-
-  const handleNextPage = () => {
-    if (pagination.currentPage < pagination.totalPages) {
-      handlePageChange(pagination.currentPage + 1)
-    }
-  }
+  // Infinite scroll: load the next cursor page when the end of the list comes into view
+  const loadMoreRef = useRef<HTMLDivElement | null>(null)
+  useEffect(() => {
+    const sentinel = loadMoreRef.current
+    if (!sentinel || !pagination.hasMore) return
+    const observer = new IntersectionObserver((entries) => {
+      if (entries[0].isIntersecting) {
+        loadMore()
+      }
+    }, { rootMargin: '200px' })
+    observer.observe(sentinel)
+    return () => observer.disconnect()
+  }, [pagination.hasMore, loadMore])
 
   // Don't fetch initial data - only fetch when there's a search or filter
   // useEffect(() => {
@@ -215,17 +212,9 @@ export default function Dashboard() {
                     <CardTitle>Resume Database</CardTitle>
                     <CardDescription>
                       {hasActiveSearch
-                        ? (() => {
-                            const totalResults = pagination.count || 0;
-                            const currentPage = pagination.currentPage || 1;
-                            const pageSize = pagination.pageSize || 10;
-                            const startResult = totalResults > 0 ? (currentPage - 1) * pageSize + 1 : 0;
-                            const endResult = Math.min(currentPage * pageSize, totalResults);
-                            
-                            return totalResults > 0 
-                              ? `Showing ${startResult} to ${endResult} of ${totalResults} results`
-                              : 'No results found';
-                          })()
+                        ? (pagination.loaded > 0
+                            ? `Showing ${pagination.loaded}${pagination.hasMore ? '+' : ''} results`
+                            : 'No results found')
                         : 'Enter search terms or apply filters to find resumes'
                       }
                     </CardDescription>
@@ -257,64 +246,19 @@ export default function Dashboard() {
                           ))}
                         </div>
                         
-                        {/* Pagination Controls */}
-                        {pagination.totalPages > 1 && (
-                          <div className="flex items-center justify-between mt-8 pt-6 border-t">
-                            <div className="text-sm text-muted-foreground">
-                              Showing {((pagination.currentPage - 1) * pagination.pageSize) + 1} to {Math.min(pagination.currentPage * pagination.pageSize, pagination.count)} of {pagination.count} results
-                            </div>
-                            
-                            <div className="flex items-center space-x-2">
-                              <Button
-                                variant="outline"
-                                size="sm"
-                                onClick={handlePreviousPage}
-                                disabled={pagination.currentPage === 1}
-                                className="flex items-center gap-1"
-                              >
-                                <ChevronLeft className="h-4 w-4" />
-                                Previous
-                              </Button>
-                              
-                              <div className="flex items-center space-x-1">
-                                {/* Page numbers */}
-                                {Array.from({ length: Math.min(5, pagination.totalPages) }, (_, i) => {
-                                  let pageNum;
-                                  if (pagination.totalPages <= 5) {
-                                    pageNum = i + 1;
-                                  } else if (pagination.currentPage <= 3) {
-                                    pageNum = i + 1;
-                                  } else if (pagination.currentPage >= pagination.totalPages - 2) {
-                                    pageNum = pagination.totalPages - 4 + i;
-                                  } else {
-                                    pageNum = pagination.currentPage - 2 + i;
-                                  }
-                                  
-                                  return (
-                                    <Button
-                                      key={pageNum}
-                                      variant={pageNum === pagination.currentPage ? "default" : "outline"}
-                                      size="sm"
-                                      onClick={() => handlePageChange(pageNum)}
-                                      className="w-8 h-8 p-0"
-                                    >
-                                      {pageNum}
-                                    </Button>
-                                  );
-                                })}
-                              </div>
-                              
-                              <Button
-                                variant="outline"
-                                size="sm"
-                                onClick={handleNextPage}
-                                disabled={pagination.currentPage === pagination.totalPages}
-                                className="flex items-center gap-1"
-                              >
-                                Next
-                                <ChevronRight className="h-4 w-4" />
-                              </Button>
-                            </div>
+                        {/* Infinite scroll: the next cursor page loads when this comes into view */}
+                        {pagination.hasMore && (
+                          <div ref={loadMoreRef} className="flex justify-center mt-8 pt-6 border-t">
+                            <Button
+                              variant="outline"
+                              size="sm"
+                              onClick={loadMore}
+                              disabled={loadingMore}
+                              className="flex items-center gap-1"
+                            >
+                              {loadingMore ? 'Loading...' : 'Load more'}
+                              <ChevronDown className="h-4 w-4" />
+                            </Button>
                           </div>
                         )}
                       </>
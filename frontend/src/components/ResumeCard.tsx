@@ -78,6 +78,19 @@ export function ResumeCard({ resume, autoOpenDetails = false, onCloseDetails }:
   const [selectedCountry, setSelectedCountry] = useState('')
   const [countryExperiences, setCountryExperiences] = useState<any[]>([])
 
+  // List pages only carry the card's fields; the details dialog shows the full record
+  const [fullResume, setFullResume] = useState<Resume | null>(null)
+  const detailResume = fullResume?.id === resume.id ? fullResume : resume
+
+  useEffect(() => {
+    if (!isDetailsOpen || fullResume?.id === resume.id) return
+    const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api'
+    fetch(`${API_URL}/resumes/${resume.id}/`)
+      .then(response => response.ok ? response.json() : null)
+      .then(data => { if (data) setFullResume(data) })
+      .catch(error => console.error('Failed to load resume details:', error))
+  }, [isDetailsOpen, fullResume, resume.id])
+
   // Debug log
   console.log('ResumeCard rendered:', resume.full_name, 'autoOpenDetails:', autoOpenDetails)
   
@@ -1052,9 +1065,9 @@ export function ResumeCard({ resume, autoOpenDetails = false, onCloseDetails }:
           <DialogHeader>
             <DialogTitle className="flex items-center gap-2">
               <Avatar className="h-8 w-8">
-                <AvatarFallback>{getInitials(resume.full_name)}</AvatarFallback>
+                <AvatarFallback>{getInitials(detailResume.full_name)}</AvatarFallback>
               </Avatar>
-              {resume.full_name || 'Unknown Name'}
+              {detailResume.full_name || 'Unknown Name'}
             </DialogTitle>
             <DialogDescription>
               Complete resume details and information
@@ -1071,31 +1084,31 @@ export function ResumeCard({ resume, autoOpenDetails = false, onCloseDetails }:
               <div className="grid grid-cols-2 gap-4 text-sm">
                 <div>
                   <span className="font-medium">Email:</span>
-                  <p className="text-muted-foreground">{resume.email || 'Not provided'}</p>
+                  <p className="text-muted-foreground">{detailResume.email || 'Not provided'}</p>
                 </div>
                 <div>
                   <span className="font-medium">Phone:</span>
-                  <p className="text-muted-foreground">{resume.phone_number || 'Not provided'}</p>
+                  <p className="text-muted-foreground">{detailResume.phone_number || 'Not provided'}</p>
                 </div>
                 <div>
                   <span className="font-medium">Location:</span>
-                  <p className="text-muted-foreground">{resume.location || 'Not provided'}</p>
+                  <p className="text-muted-foreground">{detailResume.location || 'Not provided'}</p>
                 </div>
                 <div>
                   <span className="font-medium">Age:</span>
-                  <p className="text-muted-foreground">{resume.age ? `${resume.age} years old` : 'Not provided'}</p>
+                  <p className="text-muted-foreground">{detailResume.age ? `${detailResume.age} years old` : 'Not provided'}</p>
                 </div>
                 <div>
                   <span className="font-medium">Total Experience:</span>
                   <p className="text-muted-foreground">
-                    {resume.experience_display}
+                    {detailResume.experience_display}
                   </p>
                 </div>
-                {resume.date_of_birth && (
+                {detailResume.date_of_birth && (
                   <div>
                     <span className="font-medium">Date of Birth:</span>
                     <p className="text-muted-foreground">
-                      {new Date(resume.date_of_birth).toLocaleDateString()}
+                      {new Date(detailResume.date_of_birth).toLocaleDateString()}
                     </p>
                   </div>
                 )}
@@ -1103,16 +1116,16 @@ export function ResumeCard({ resume, autoOpenDetails = false, onCloseDetails }:
             </div>
 
             {/* Online Presence */}
-            {(resume.linkedin_profile || resume.website_portfolio) && (
+            {(detailResume.linkedin_profile || detailResume.website_portfolio) && (
               <div>
                 <h3 className="text-lg font-semibold mb-3 flex items-center gap-2">
                   <ExternalLink className="h-5 w-5" />
                   Online Presence
                 </h3>
                 <div className="flex flex-wrap gap-2">
-                  {resume.linkedin_profile && (
+                  {detailResume.linkedin_profile && (
                     <a 
-                      href={normalizeUrl(resume.linkedin_profile) || '#'}
+                      href={normalizeUrl(detailResume.linkedin_profile) || '#'}
                       target="_blank"  
                       rel="noopener noreferrer"
                       className="flex items-center gap-1 text-sm text-blue-600 hover:text-blue-800"
@@ -1121,9 +1134,9 @@ export function ResumeCard({ resume, autoOpenDetails = false, onCloseDetails }:
                       LinkedIn
                     </a>
                   )}
-                  {resume.website_portfolio && (
+                  {detailResume.website_portfolio && (
                     <a 
-                      href={normalizeUrl(resume.website_portfolio) || '#'}
+                      href={normalizeUrl(detailResume.website_portfolio) || '#'}
                       target="_blank"
                       rel="noopener noreferrer"
                       className="flex items-center gap-1 text-sm text-green-600 hover:text-green-800"
@@ -1145,46 +1158,46 @@ export function ResumeCard({ resume, autoOpenDetails = false, onCloseDetails }:
               <div className="grid grid-cols-2 gap-4 text-sm">
                 <div>
                   <span className="font-medium">Current Employer:</span>
-                  <p className="text-muted-foreground">{resume.current_employer || 'Not provided'}</p>
+                  <p className="text-muted-foreground">{detailResume.current_employer || 'Not provided'}</p>
                 </div>
                 <div>
                   <span className="font-medium">Experience Level:</span>
-                  <p className="text-muted-foreground">{resume.experience_level}</p>
+                  <p className="text-muted-foreground">{detailResume.experience_level}</p>
                 </div>
-                {resume.availability && (
+                {detailResume.availability && (
                   <div>
                     <span className="font-medium">Availability:</span>
-                    <p className="text-muted-foreground">{resume.availability}</p>
+                    <p className="text-muted-foreground">{detailResume.availability}</p>
                   </div>
                 )}
-                {resume.preferred_contract_type && (
+                {detailResume.preferred_contract_type && (
                   <div>
                     <span className="font-medium">Contract Type:</span>
-                    <p className="text-muted-foreground">{resume.preferred_contract_type}</p>
+                    <p className="text-muted-foreground">{detailResume.preferred_contract_type}</p>
                   </div>
                 )}
-                {resume.preferred_work_arrangement && (
+                {detailResume.preferred_work_arrangement && (
                   <div>
                     <span className="font-medium">Work Arrangement:</span>
-                    <p className="text-muted-foreground">{resume.preferred_work_arrangement}</p>
+                    <p className="text-muted-foreground">{detailResume.preferred_work_arrangement}</p>
                   </div>
                 )}
               </div>
             </div>
 
             {/* Skills and Expertise */}
-            {(Array.isArray(resume.skill_keywords) && resume.skill_keywords.length > 0 || resume.expertise_areas?.length > 0 || resume.sectors?.length > 0) && (
+            {(Array.isArray(detailResume.skill_keywords) && detailResume.skill_keywords.length > 0 || detailResume.expertise_areas?.length > 0 || detailResume.sectors?.length > 0) && (
               <div>
                 <h3 className="text-lg font-semibold mb-3 flex items-center gap-2">
                   <Award className="h-5 w-5" />
                   Skills & Expertise
                 </h3>
-                {resume.expertise_areas?.length > 0 && (
+                {detailResume.expertise_areas?.length > 0 && (
                   <div className="mb-3">
                     <span className="font-medium text-sm">Expertise Areas:</span>
                     <div className="space-y-1 mt-2">
-                      {resume.expertise_areas.map((area, index) => {
-                        const details = resume.expertise_details?.[area];
+                      {detailResume.expertise_areas.map((area, index) => {
+                        const details = detailResume.expertise_details?.[area];
                         const hasWorkExp = details?.work_experience && details.work_experience !== "No information found";
                         const hasProjects = details?.projects && details.projects !== "No information found";
                         const hasOtherInfo = details?.other_related_info && details.other_related_info !== "No information found";
@@ -1226,11 +1239,11 @@ export function ResumeCard({ resume, autoOpenDetails = false, onCloseDetails }:
                     </div>
                   </div>
                 )}
-                {resume.sectors?.length > 0 && (
+                {detailResume.sectors?.length > 0 && (
                   <div className="mb-3">
                     <span className="font-medium text-sm">Industry Sectors:</span>
                     <div className="flex flex-wrap gap-1 mt-1">
-                      {resume.sectors.map((sector, index) => (
+                      {detailResume.sectors.map((sector, index) => (
                         <Badge key={index} variant="secondary" className="text-xs">
                           {sector}
                         </Badge>
@@ -1238,11 +1251,11 @@ export function ResumeCard({ resume, autoOpenDetails = false, onCloseDetails }:
                     </div>
                   </div>
                 )}
-                {Array.isArray(resume.skill_keywords) && resume.skill_keywords.length > 0 && (
+                {Array.isArray(detailResume.skill_keywords) && detailResume.skill_keywords.length > 0 && (
                   <div>
                     <span className="font-medium text-sm">Skills:</span>
                     <div className="flex flex-wrap gap-1 mt-1">
-                      {resume.skill_keywords.map((skill, index) => (
+                      {detailResume.skill_keywords.map((skill, index) => (
                         <Badge key={index} variant="outline" className="text-xs">
                           {skill}
                         </Badge>
@@ -1254,17 +1267,17 @@ export function ResumeCard({ resume, autoOpenDetails = false, onCloseDetails }:
             )}
 
             {/* Country-wise Experience */}
-            <CountryExperienceView resume={resume} onShowCountryExperience={showCountryExperience} />
+            <CountryExperienceView resume={detailResume} onShowCountryExperience={showCountryExperience} />
 
             {/* Languages */}
-            {resume.languages_spoken && resume.languages_spoken.length > 0 && (
+            {detailResume.languages_spoken && detailResume.languages_spoken.length > 0 && (
               <div>
                 <h3 className="text-lg font-semibold mb-3 flex items-center gap-2">
                   <Languages className="h-5 w-5" />
                   Languages
                 </h3>
                 <div className="flex flex-wrap gap-2">
-                  {resume.languages_spoken.map((lang, index) => (
+                  {detailResume.languages_spoken.map((lang, index) => (
                     <Badge key={index} variant="secondary" className="text-sm">
                       {typeof lang === 'string' ? lang : lang.language}
                       {typeof lang === 'object' && lang.proficiency && ` (${lang.proficiency})`}
@@ -1275,14 +1288,14 @@ export function ResumeCard({ resume, autoOpenDetails = false, onCloseDetails }:
             )}
 
             {/* Certifications */}
-            {resume.professional_certifications && resume.professional_certifications.length > 0 && (
+            {detailResume.professional_certifications && detailResume.professional_certifications.length > 0 && (
               <div>
                 <h3 className="text-lg font-semibold mb-3 flex items-center gap-2">
                   <Award className="h-5 w-5" />
                   Professional Certifications
                 </h3>
                 <div className="space-y-1">
-                  {resume.professional_certifications.map((cert, index) => (
+                  {detailResume.professional_certifications.map((cert, index) => (
                     <div key={index} className="flex items-center gap-2 text-sm">
                       <Award className="h-3 w-3 text-yellow-600" />
                       <span>{cert}</span>
@@ -1293,14 +1306,14 @@ export function ResumeCard({ resume, autoOpenDetails = false, onCloseDetails }:
             )}
 
             {/* Professional Associations */}
-            {resume.professional_associations && resume.professional_associations.length > 0 && (
+            {detailResume.professional_associations && detailResume.professional_associations.length > 0 && (
               <div>
                 <h3 className="text-lg font-semibold mb-3 flex items-center gap-2">
                   <Users className="h-5 w-5" />
                   Professional Associations
                 </h3>
                 <div className="space-y-1">
-                  {resume.professional_associations.map((association, index) => (
+                  {detailResume.professional_associations.map((association, index) => (
                     <div key={index} className="flex items-center gap-2 text-sm">
                       <Users className="h-3 w-3 text-blue-600" />
                       <span>{association}</span>
@@ -1311,14 +1324,14 @@ export function ResumeCard({ resume, autoOpenDetails = false, onCloseDetails }:
             )}
 
             {/* Publications */}
-            {resume.publications && resume.publications.length > 0 && (
+            {detailResume.publications && detailResume.publications.length > 0 && (
               <div>
                 <h3 className="text-lg font-semibold mb-3 flex items-center gap-2">
                   <FileText className="h-5 w-5" />
                   Publications
                 </h3>
                 <div className="space-y-2">
-                  {resume.publications.map((pub, index) => (
+                  {detailResume.publications.map((pub, index) => (
                     <div key={index} className="p-2 border rounded bg-muted/50 text-sm italic">
                       {pub}
                     </div>
@@ -1328,27 +1341,27 @@ export function ResumeCard({ resume, autoOpenDetails = false, onCloseDetails }:
             )}
 
             {/* References */}
-            {resume.references && resume.references.trim() && (
+            {detailResume.references && detailResume.references.trim() && (
               <div>
                 <h3 className="text-lg font-semibold mb-3 flex items-center gap-2">
                   <Users className="h-5 w-5" />
                   References
                 </h3>
                 <div className="p-3 border rounded bg-muted/30 text-sm whitespace-pre-wrap">
-                  {resume.references}
+                  {detailResume.references}
                 </div>
               </div>
             )}
 
             {/* Notes */}
-            {resume.notes && resume.notes.trim() && (
+            {detailResume.notes && detailResume.notes.trim() && (
               <div>
                 <h3 className="text-lg font-semibold mb-3 flex items-center gap-2">
                   <StickyNote className="h-5 w-5" />
                   Additional Notes
                 </h3>
                 <div className="p-3 border rounded bg-yellow-50 text-sm whitespace-pre-wrap">
-                  {resume.notes}
+                  {detailResume.notes}
                 </div>
               </div>
             )}
@@ -1359,20 +1372,20 @@ export function ResumeCard({ resume, autoOpenDetails = false, onCloseDetails }:
               <div className="grid grid-cols-2 gap-4 text-sm">
                 <div>
                   <span className="font-medium">Filename:</span>
-                  <p className="text-muted-foreground">{resume.original_filename}</p>
+                  <p className="text-muted-foreground">{detailResume.original_filename}</p>
                 </div>
                 <div>
                   <span className="font-medium">File Type:</span>
-                  <p className="text-muted-foreground">{resume.file_type?.toUpperCase()}</p>
+                  <p className="text-muted-foreground">{detailResume.file_type?.toUpperCase()}</p>
                 </div>
                 <div>
                   <span className="font-medium">Status:</span>
-                  <p className="text-muted-foreground capitalize">{resume.processing_status}</p>
+                  <p className="text-muted-foreground capitalize">{detailResume.processing_status}</p>
                 </div>
                 <div>
                   <span className="font-medium">Uploaded:</span>
                   <p className="text-muted-foreground">
-                    {new Date(resume.timestamp).toLocaleDateString()}
+                    {new Date(detailResume.timestamp).toLocaleDateString()}
                   </p>
                 </div>
               </div>
@@ -1384,7 +1397,7 @@ export function ResumeCard({ resume, autoOpenDetails = false, onCloseDetails }:
                 <Download className="h-4 w-4 mr-2" />
                 Download Resume
               </Button>
-              {resume.processing_status === 'failed' && (
+              {detailResume.processing_status === 'failed' && (
                 <Button onClick={handleReparse} variant="secondary">
                   <ExternalLink className="h-4 w-4 mr-2" />
                   Reparse
@@ -1,23 +1,48 @@
 'use client'
 
-import { useState, useEffect, useCallback } from 'react'
+import { useState, useEffect, useCallback, useRef } from 'react'
 import { Resume, ResumeStats } from '@/types/resume'
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api'
 
+// Fields a ResumeCard renders; its details dialog loads the full record when opened
+export const RESUME_CARD_FIELDS = [
+  'id', 'timestamp', 'full_name', 'email', 'phone_number', 'location', 'age',
+  'current_employer', 'years_of_experience', 'total_experience_months', 'experience_level',
+  'experience_display', 'expertise_areas', 'expertise_details', 'skill_keywords', 'sectors',
+  'processing_status', 'file_path', 'file_type', 'original_filename',
+]
+
+// One page of the resume list, without failed parses, and the link to the next page
+async function fetchResumePage(url: string) {
+  const response = await fetch(url)
+  if (!response.ok) {
+    throw new Error(`HTTP ${response.status}: Failed to fetch resumes`)
+  }
+  const data = await response.json()
+  const results = data.results || data
+  const validResumes = (Array.isArray(results) ? results : []).filter((resume: Resume) => 
+    resume.processing_status !== 'failed'
+  )
+  return { resumes: validResumes as Resume[], next: (data.next ?? null) as string | null }
+}
+
 export function useResumes() {
   const [resumes, setResumes] = useState<Resume[]>([])
   const [stats, setStats] = useState<ResumeStats | null>(null)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
+  // Keyset (cursor) pagination: each page follows the previous response's `next`
+  // link, so deep pages cost the same as the first and no COUNT(*) is run
   const [pagination, setPagination] = useState({
-    count: 0,
     next: null as string | null,
-    previous: null as string | null,
-    currentPage: 1,
-    totalPages: 1,
+    hasMore: false,
+    loaded: 0,
     pageSize: 10
   })
+  const [loadingMore, setLoadingMore] = useState(false)
+  // Bumped on every new search so a late "load more" reply is not appended to it
+  const requestId = useRef(0)
   const [filterOptions, setFilterOptions] = useState<{
     expertise: string[]
     locations: string[]
@@ -32,8 +57,9 @@ export function useResumes() {
     experienceLevels: []
   })
 
-  // Fetch resumes from API with search and filter support
-  const fetchResumes = useCallback(async (searchTerm?: string, filters?: any, page: number = 1, pageSize: number = 10) => {
+  // Fetch the first page of resumes from API with search and filter support
+  const fetchResumes = useCallback(async (searchTerm?: string, filters?: any, pageSize: number = 10) => {
+    const id = ++requestId.current
     try {
       setLoading(true)
       
@@ -41,8 +67,9 @@ export function useResumes() {
       const params = new URLSearchParams()
       
       // Add pagination parameters
-      params.append('page', page.toString())
+      params.append('pagination', 'cursor')
       params.append('page_size', pageSize.toString())
+      params.append('fields', RESUME_CARD_FIELDS.join(','))
       
       if (searchTerm?.trim()) {
         params.append('search', searchTerm.trim())
@@ -71,53 +98,50 @@ export function useResumes() {
         })
       }
       
-      const queryString = params.toString()
-      const url = `${API_URL}/resumes/${queryString ? `?${queryString}` : ''}`
-      
-      const response = await fetch(url)
-      if (!response.ok) {
-        throw new Error(`HTTP ${response.status}: Failed to fetch resumes`)
-      }
-      const data = await response.json()
-      
-      // Handle paginated response
-      const results = data.results || data
-      const validResumes = (Array.isArray(results) ? results : []).filter((resume: Resume) => 
-        resume.processing_status !== 'failed'
-      )
+      const page = await fetchResumePage(`${API_URL}/resumes/?${params.toString()}`)
+      if (id !== requestId.current) return
       
-      setResumes(validResumes)
-      
-      // Update pagination info
-      if (data.count !== undefined) {
-        setPagination({
-          count: data.count,
-          next: data.next,
-          previous: data.previous,
-          currentPage: page,
-          totalPages: Math.ceil(data.count / pageSize),
-          pageSize: pageSize
-        })
-      } else {
-        // Fallback for non-paginated response
-        setPagination({
-          count: validResumes.length,
-          next: null,
-          previous: null,
-          currentPage: 1,
-          totalPages: 1,
-          pageSize: validResumes.length
-        })
-      }
+      setResumes(page.resumes)
+      setPagination({
+        next: page.next,
+        hasMore: page.next !== null,
+        loaded: page.resumes.length,
+        pageSize: pageSize
+      })
       setError(null)
     } catch (err) {
+      if (id !== requestId.current) return
       setError(err instanceof Error ? err.message : 'An error occurred')
       setResumes([])
+      setPagination(prev => ({ ...prev, next: null, hasMore: false, loaded: 0 }))
     } finally {
-      setLoading(false)
+      if (id === requestId.current) setLoading(false)
     }
   }, [])
 
+  // Append the next page of the current search (infinite scroll)
+  const loadMore = useCallback(async () => {
+    if (!pagination.next || loadingMore) return
+    const id = requestId.current
+    try {
+      setLoadingMore(true)
+      const page = await fetchResumePage(pagination.next)
+      if (id !== requestId.current) return
+      setResumes(prev => [...prev, ...page.resumes])
+      setPagination(prev => ({
+        ...prev,
+        next: page.next,
+        hasMore: page.next !== null,
+        loaded: prev.loaded + page.resumes.length
+      }))
+    } catch (err) {
+      if (id !== requestId.current) return
+      setError(err instanceof Error ? err.message : 'An error occurred')
+    } finally {
+      setLoadingMore(false)
+    }
+  }, [pagination.next, loadingMore])
+
   // Fetch statistics
   const fetchStats = useCallback(async () => {
     try {
@@ -256,8 +280,10 @@ export function useResumes() {
     resumes,
     stats,
     loading,
+    loadingMore,
     error,
     pagination,
+    loadMore,
     uploadResume,
     batchUploadResumes,
     getFilterOptions,